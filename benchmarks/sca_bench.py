@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+'''
+Supportconfig Analysis library benchmarks
+
+Times the library readers and helpers against synthetic supportconfig archives of increasing scale and reports
+their throughput and peak memory
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'libraries', 'python'))
+
+import Core
+import SUSE
+import HAE
+import MPIO
+import suse_core2 as core
+import sca_synth
+
+def bench_get_section(archive_path):
+    content = {}
+    Core.getSection('rpm.txt', 'rpm -qa --last', content)
+    return len(content)
+
+def bench_get_file_section(archive_path):
+    return len(core.get_file_section(os.path.join(archive_path, 'rpm.txt'), 'rpm -qa --last'))
+
+def bench_get_section_messages(archive_path):
+    content = {}
+    Core.getSection('messages.txt', '/var/log/messages', content)
+    return len(content)
+
+def bench_get_file_section_messages(archive_path):
+    return len(core.get_file_section(os.path.join(archive_path, 'messages.txt'), '/var/log/messages'))
+
+def bench_get_rpm_info(archive_path):
+    # the last package is the worst case for the name scan
+    return len(SUSE.getRpmInfo(sca_synth.package_name(bench_get_rpm_info.packages - 1)))
+
+def bench_get_file_systems(archive_path):
+    return len(SUSE.getFileSystems())
+
+def bench_get_network_interfaces(archive_path):
+    return len(SUSE.getNetworkInterfaces())
+
+def bench_get_node_info(archive_path):
+    return len(HAE.getNodeInfo())
+
+def bench_get_managed_devices(archive_path):
+    return len(MPIO.getManagedDevices())
+
+# name: (function, files it reads)
+BENCHMARKS = {
+    'Core.getSection': (bench_get_section, ('rpm.txt',)),
+    'suse_core2.get_file_section': (bench_get_file_section, ('rpm.txt',)),
+    'Core.getSection[messages]': (bench_get_section_messages, ('messages.txt',)),
+    'suse_core2.get_file_section[messages]': (bench_get_file_section_messages, ('messages.txt',)),
+    'SUSE.getRpmInfo': (bench_get_rpm_info, ('rpm.txt',)),
+    'SUSE.getFileSystems': (bench_get_file_systems, ('fs-diskio.txt', 'basic-health-check.txt', 'memory.txt')),
+    'SUSE.getNetworkInterfaces': (bench_get_network_interfaces, ('network.txt',)),
+    'HAE.getNodeInfo': (bench_get_node_info, ('ha.txt',)),
+    'MPIO.getManagedDevices': (bench_get_managed_devices, ('mpio.txt',)),
+}
+
+def prepare_archive(work_dir, scale, seed=0):
+    '''
+    Returns the path and sizes of the synthetic archive for scale, generating it the first time
+    '''
+    archive_path = os.path.join(work_dir, 'scc_synth_{}_{}'.format(scale, seed))
+    marker = os.path.join(archive_path, '.synth.json')
+    if os.path.exists(marker):
+        with open(marker) as marker_file:
+            sizes = json.load(marker_file)
+        if sizes == sca_synth.SCALES[scale]:
+            return archive_path, sizes
+    sizes = sca_synth.generate_archive(archive_path, scale, seed)
+    with open(marker, 'w') as marker_file:
+        json.dump(sizes, marker_file)
+    return archive_path, sizes
+
+def run_once(function, archive_path):
+    # a private cache makes every run parse the archive from scratch
+    with Core.analysisContext(archive_path, {}):
+        start = time.perf_counter()
+        items = function(archive_path)
+        return time.perf_counter() - start, items
+
+def run_benchmark(name, archive_path, repeat=3):
+    '''
+    Runs one benchmark repeat times for timing and once more under tracemalloc for the peak memory
+
+    Returns:    Dictionary with keys benchmark, items, bytes, best, median, throughput (MiB/s) and peak (MiB)
+    '''
+    function, files = BENCHMARKS[name]
+    size = sum(os.path.getsize(os.path.join(archive_path, file_name)) for file_name in files if os.path.exists(os.path.join(archive_path, file_name)))
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        elapsed, items = run_once(function, archive_path)
+        timings.append(elapsed)
+    tracemalloc.start()
+    try:
+        run_once(function, archive_path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    best = min(timings)
+    return {
+        'benchmark': name,
+        'items': items,
+        'bytes': size,
+        'best': best,
+        'median': statistics.median(timings),
+        'throughput': size / 1048576.0 / best if best > 0 else 0.0,
+        'peak': peak / 1048576.0,
+    }
+
+def run_suite(scales, names, work_dir, repeat=3, seed=0):
+    '''
+    Runs the named benchmarks on the archive of every scale
+
+    Returns:    Generator of run_benchmark dictionaries with an added scale key
+    '''
+    for scale in scales:
+        archive_path, sizes = prepare_archive(work_dir, scale, seed)
+        bench_get_rpm_info.packages = sizes['packages']
+        for name in names:
+            report = run_benchmark(name, archive_path, repeat)
+            report['scale'] = scale
+            yield report
+        Core.clearArchiveCache(archive_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the SCA library readers on synthetic supportconfig archives')
+    parser.add_argument('-s', '--scale', action='append', choices=sorted(sca_synth.SCALES), help='Archive scale, may be repeated (default: small and medium)')
+    parser.add_argument('-b', '--benchmark', action='append', choices=list(BENCHMARKS), help='Benchmark to run, may be repeated (default: all)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Timed runs per benchmark')
+    parser.add_argument('-w', '--work-dir', default='/var/tmp/sca-bench', help='Where the synthetic archives are kept between runs')
+    parser.add_argument('-j', '--json', help='Also write the reports to this file as JSON')
+    options = parser.parse_args(argv)
+    scales = options.scale or ['small', 'medium']
+    names = options.benchmark or list(BENCHMARKS)
+    reports = []
+    print('{:<8} {:<38} {:>9} {:>10} {:>10} {:>10} {:>10}'.format('Scale', 'Benchmark', 'Items', 'Best s', 'Median s', 'MiB/s', 'Peak MiB'))
+    for report in run_suite(scales, names, options.work_dir, options.repeat):
+        reports.append(report)
+        print('{scale:<8} {benchmark:<38} {items:>9} {best:>10.4f} {median:>10.4f} {throughput:>10.1f} {peak:>10.1f}'.format(**report))
+        sys.stdout.flush()
+    if options.json:
+        with open(options.json, 'w') as output:
+            json.dump(reports, output, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/python3
+'''
+Supportconfig Analysis trace replay benchmark
+
+Replays the library calls recorded by sca_runner.py --trace against the recorded archives, a captured archive
+or a synthetic one, with different reader backends, and compares their results and timings
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import re
+import sys
+import json
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'libraries', 'python'))
+
+import Core
+import suse_core2 as core
+import sca_trace
+import sca_bench
+import sca_synth
+
+class ScanBackend():
+    '''
+    The readers as they are, with empty archive caches for every call, so every call parses the files it needs
+    '''
+    name = 'scan'
+
+    def __init__(self):
+        self.caches = {}
+        self._originals = []
+
+    def patch(self, module, name, function):
+        self._originals.append((module, name, getattr(module, name)))
+        setattr(module, name, function)
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+
+    def reset(self):
+        '''
+        Drops everything cached so the next replay starts cold
+        '''
+        self.caches = {}
+        Core.clearArchiveCache()
+        core.clear_archive_cache()
+
+    def context(self, archive_path):
+        core.clear_archive_cache()
+        return Core.analysisContext(archive_path, {})
+
+    def close(self):
+        self.reset()
+
+class CacheBackend(ScanBackend):
+    '''
+    The readers as they are, with one archive cache shared by every call of the archive like sca_runner.py does
+    '''
+    name = 'cache'
+
+    def context(self, archive_path):
+        return Core.analysisContext(archive_path, self.caches.setdefault(archive_path, {}))
+
+def patch_section_readers(backend, section_lines):
+    '''
+    Replaces the section readers with ones answered by section_lines for the duration of the backend install.
+    section_lines(file_open, section, exact) returns the lines of the first section of file_open with content
+    whose name matches the section regex, or equals section if exact, as getRegExSection would return them, or
+    None if there is none. The readers without a comment filter and files outside the archive keep using the
+    stock readers.
+    '''
+    get_file_section = core.get_file_section
+
+    def get_section(FILE_OPEN, SECTION, CONTENT):
+        lines = section_lines(FILE_OPEN, SECTION, False)
+        for LINE in lines or []:
+            CONTENT[len(CONTENT)] = LINE
+        return lines is not None
+
+    def get_regex_section(FILE_OPEN, SECTION, CONTENT):
+        lines = section_lines(FILE_OPEN, SECTION, False)
+        CONTENT.extend(lines or [])
+        return lines is not None
+
+    def get_exact_section(FILE_OPEN, SECTION, CONTENT):
+        lines = section_lines(FILE_OPEN, SECTION, True)
+        CONTENT.extend(lines or [])
+        return lines is not None
+
+    def get_file_section_core2(_file, _section, include_commented_lines=False):
+        directory, file_open = os.path.split(_file)
+        if include_commented_lines or directory.rstrip('/') != Core.getContext().path.rstrip('/'):
+            return get_file_section(_file, _section, include_commented_lines)
+        return section_lines(file_open, _section, False) or []
+
+    backend.patch(Core, 'getSection', get_section)
+    backend.patch(Core, 'getRegExSection', get_regex_section)
+    backend.patch(Core, 'getExactSection', get_exact_section)
+    backend.patch(core, 'get_file_section', get_file_section_core2)
+
+class IndexBackend(CacheBackend):
+    '''
+    Reads sections from the byte offsets of Core.getFileSectionIndex instead of scanning the file up to them
+    '''
+    name = 'index'
+
+    def install(self):
+        patch_section_readers(self, self.section_lines)
+
+    def section_lines(self, file_open, section, exact):
+        section_tag = None if exact else re.compile(section)
+        for file_section in Core.getFileSectionIndex(file_open):
+            if file_section.hasContent and (file_section.name == section if exact else section_tag.search(file_section.name)):
+                return [line for _, _, line in Core.readSectionLines(file_open, file_section)]
+        return None
+
+SQLITE_SCHEMA = '''
+CREATE TABLE files (file TEXT PRIMARY KEY);
+CREATE TABLE sections (file TEXT NOT NULL, ordinal INTEGER NOT NULL, name TEXT, content TEXT, PRIMARY KEY (file, ordinal));
+CREATE INDEX sections_name ON sections (file, name);
+'''
+
+def regexp(pattern, value):
+    return value is not None and re.search(pattern, value) is not None
+
+class SQLiteBackend(CacheBackend):
+    '''
+    Loads every section with content of a file into a SQLite database per archive the first time the file is
+    read, and answers the section readers with queries
+    '''
+    name = 'sqlite'
+
+    def __init__(self, work_dir=None):
+        super().__init__()
+        self.work_dir = work_dir
+        self.directory = None
+        self.connections = {}
+
+    def connection(self):
+        archive_path = Core.getContext().path
+        connection = self.connections.get(archive_path)
+        if connection is None:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix='sca-replay-', dir=self.work_dir)
+            connection = sqlite3.connect(os.path.join(self.directory, '{}.db'.format(len(self.connections))))
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SQLITE_SCHEMA)
+            if sys.version_info >= (3, 8):
+                connection.create_function('regexp', 2, regexp, deterministic=True)
+            else:
+                connection.create_function('regexp', 2, regexp)
+            self.connections[archive_path] = connection
+        return connection
+
+    def load_file(self, connection, file_open):
+        if connection.execute('SELECT 1 FROM files WHERE file = ?', (file_open,)).fetchone():
+            return
+        rows = ((file_open, ordinal, name, '\n'.join(content)) for ordinal, (name, content) in enumerate(Core.iterSections(file_open)) if content)
+        with connection:
+            connection.executemany('INSERT INTO sections (file, ordinal, name, content) VALUES (?, ?, ?, ?)', rows)
+            connection.execute('INSERT INTO files (file) VALUES (?)', (file_open,))
+
+    def install(self):
+        patch_section_readers(self, self.section_lines)
+
+    def section_lines(self, file_open, section, exact):
+        connection = self.connection()
+        self.load_file(connection, file_open)
+        if exact:
+            row = connection.execute('SELECT content FROM sections WHERE file = ? AND name = ? ORDER BY ordinal LIMIT 1', (file_open, section)).fetchone()
+        else:
+            row = connection.execute('SELECT content FROM sections WHERE file = ? AND name REGEXP ? ORDER BY ordinal LIMIT 1', (file_open, section)).fetchone()
+        return row[0].split('\n') if row else None
+
+    def reset(self):
+        super().reset()
+        for connection in self.connections.values():
+            connection.close()
+        self.connections = {}
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+BACKENDS = {backend.name: backend for backend in (ScanBackend, CacheBackend, IndexBackend, SQLiteBackend)}
+
+def replay(traces, backend, archive_path=None, repeat=1):
+    '''
+    Replays every call of traces in recorded order with backend, repeat times, each time from cold caches. Calls
+    run against archive_path, or the archive they were recorded on if None. The output the library prints while
+    replaying is discarded.
+
+    Returns:    List with an entry per call, None for calls that cannot be replayed and otherwise a (seconds,
+                digest, error) tuple with the fastest seconds of the repeats
+    '''
+    results = None
+    backend.install()
+    try:
+        for _ in range(repeat):
+            backend.reset()
+            run = []
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for trace in traces:
+                    path = archive_path or trace['archive_path']
+                    for call in trace['calls']:
+                        if 'unsupported' in call:
+                            run.append(None)
+                            continue
+                        with backend.context(path):
+                            run.append(sca_trace.replay_call(call, path))
+            if results is None:
+                results = run
+            else:
+                results = [None if first is None else (min(first[0], again[0]),) + first[1:] for first, again in zip(results, run)]
+    finally:
+        backend.uninstall()
+        backend.reset()
+    return results
+
+def expected_results(traces, archive_path=None, reference=None):
+    '''
+    Returns the (digest, error) every call should give, the recorded one for calls replayed against the archive
+    they were recorded on and otherwise the reference backend result
+    '''
+    expected = []
+    index = 0
+    for trace in traces:
+        recorded = archive_path is None or os.path.abspath(archive_path) == trace['archive_path']
+        for call in trace['calls']:
+            if recorded:
+                # a generator still open when the trace was written has no result to compare
+                expected.append(None if call['digest'] is None and call['error'] is None else (call['digest'], call['error']))
+            elif reference is not None and reference[index] is not None:
+                expected.append(reference[index][1:])
+            else:
+                expected.append(None)
+            index += 1
+    return expected
+
+def compare(traces, names, results, archive_path=None):
+    '''
+    Returns a report dictionary with the totals, the seconds per function and the calls that gave another result
+    than expected for every backend in names
+    '''
+    calls = [(trace, call) for trace in traces for call in trace['calls']]
+    expected = expected_results(traces, archive_path, results[names[0]])
+    report = {'calls': len(calls), 'recorded': sum(call['seconds'] for _, call in calls), 'backends': [], 'functions': {}, 'mismatches': []}
+    for name in names:
+        seconds = 0.0
+        skipped = 0
+        mismatches = 0
+        for index, ((trace, call), result) in enumerate(zip(calls, results[name])):
+            if result is None:
+                skipped += 1
+                continue
+            seconds += result[0]
+            function = report['functions'].setdefault(call['function'], {'calls': 0})
+            function[name] = function.get(name, 0.0) + result[0]
+            if name == names[0]:
+                function['calls'] += 1
+            if expected[index] is not None and result[1:] != tuple(expected[index]):
+                mismatches += 1
+                report['mismatches'].append({'backend': name, 'archive_id': trace['archive_id'], 'pattern_id': trace['pattern_id'],
+                    'call': index, 'function': call['function'], 'expected': list(expected[index]), 'result': list(result[1:])})
+        report['backends'].append({'backend': name, 'seconds': seconds, 'skipped': skipped, 'mismatches': mismatches})
+    reference = report['backends'][0]['seconds']
+    for backend in report['backends']:
+        backend['speedup'] = reference / backend['seconds'] if backend['seconds'] > 0 else 0.0
+    return report
+
+def format_report(report, names, limit=20):
+    lines = ['{} calls, {:.4f} s when recorded'.format(report['calls'], report['recorded']), '']
+    lines.append('{:<10} {:>10} {:>8} {:>8} {:>11}'.format('Backend', 'Seconds', 'Speedup', 'Skipped', 'Mismatches'))
+    for backend in report['backends']:
+        lines.append('{backend:<10} {seconds:>10.4f} {speedup:>8.2f} {skipped:>8} {mismatches:>11}'.format(**backend))
+    lines.append('')
+    lines.append('{:<44} {:>6}'.format('Function', 'Calls') + ''.join(' {:>10}'.format(name + ' s') for name in names))
+    functions = sorted(report['functions'].items(), key=lambda item: item[1].get(names[0], 0.0), reverse=True)
+    for function, seconds in functions[:limit]:
+        lines.append('{:<44} {:>6}'.format(function, seconds['calls']) + ''.join(' {:>10.4f}'.format(seconds.get(name, 0.0)) for name in names))
+    if report['mismatches']:
+        lines.append('')
+        lines.append('Mismatches')
+        for mismatch in report['mismatches'][:limit]:
+            lines.append('{backend} {archive_id} {pattern_id} call {call} {function}: expected {expected}, got {result}'.format(**mismatch))
+    return '\n'.join(lines) + '\n'
+
+def slower_than_baseline(report, baseline, tolerance):
+    '''
+    Returns the backends whose total seconds grew by more than tolerance times since the baseline report
+    '''
+    before = {backend['backend']: backend['seconds'] for backend in baseline['backends']}
+    return [backend['backend'] for backend in report['backends'] if before.get(backend['backend']) and backend['seconds'] > before[backend['backend']] * tolerance]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replays recorded SCA library calls with different reader backends and compares results and timings')
+    parser.add_argument('traces', nargs='+', help='Trace files written by sca_runner.py --trace')
+    parser.add_argument('-p', '--archive', help='Replay against this extracted archive instead of the recorded ones')
+    parser.add_argument('-s', '--scale', choices=sorted(sca_synth.SCALES), help='Replay against a synthetic archive of this scale')
+    parser.add_argument('-b', '--backend', action='append', choices=list(BACKENDS), help='Backend to replay with, may be repeated, the first is the reference (default: all)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Replays per backend, the fastest counts')
+    parser.add_argument('-w', '--work-dir', default='/var/tmp/sca-bench', help='Where the synthetic archives and backend databases are kept')
+    parser.add_argument('-j', '--json', help='Also write the report to this file as JSON')
+    parser.add_argument('-c', '--baseline', help='JSON report of an earlier replay, fail if a backend got slower than it')
+    parser.add_argument('-t', '--tolerance', type=float, default=1.25, help='Slowdown against the baseline that fails (default: 1.25)')
+    options = parser.parse_args(argv)
+    traces = [trace for source in options.traces for trace in sca_trace.read_traces(source)]
+    archive_path = options.archive
+    if options.scale:
+        archive_path, _ = sca_bench.prepare_archive(options.work_dir, options.scale)
+    names = options.backend or list(BACKENDS)
+    os.makedirs(options.work_dir, exist_ok=True)
+    results = {}
+    for name in names:
+        backend = BACKENDS[name](options.work_dir) if name == 'sqlite' else BACKENDS[name]()
+        try:
+            results[name] = replay(traces, backend, archive_path, options.repeat)
+        finally:
+            backend.close()
+    report = compare(traces, names, results, archive_path)
+    sys.stdout.write(format_report(report, names))
+    if options.json:
+        with open(options.json, 'w') as output:
+            json.dump(report, output, indent=1)
+    status = 0
+    if report['mismatches']:
+        status = 1
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            slower = slower_than_baseline(report, json.load(baseline_file), options.tolerance)
+        for name in slower:
+            sys.stderr.write('{} is more than {:.2f}x slower than the baseline\n'.format(name, options.tolerance))
+        if slower:
+            status = 1
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
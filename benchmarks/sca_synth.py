@@ -0,0 +1,271 @@
+#!/usr/bin/python3
+'''
+Synthetic supportconfig generator
+
+Writes extracted supportconfig trees with realistic file layouts at a configurable scale, so the libraries can be
+benchmarked without sharing customer archives
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import sys
+import random
+import argparse
+
+COMMAND = '#==[ Command ]======================================#\n'
+CONFIG = '#==[ Configuration File ]===========================#\n'
+LOG = '#==[ Log File ]====================================#\n'
+
+SCALES = {
+    'small': {'packages': 1000, 'interfaces': 16, 'paths': 256, 'cib_nodes': 2, 'cib_resources': 20, 'filesystems': 10, 'messages_mb': 8},
+    'medium': {'packages': 10000, 'interfaces': 1000, 'paths': 5000, 'cib_nodes': 16, 'cib_resources': 500, 'filesystems': 200, 'messages_mb': 256},
+    'large': {'packages': 10000, 'interfaces': 1000, 'paths': 5000, 'cib_nodes': 32, 'cib_resources': 5000, 'filesystems': 1000, 'messages_mb': 2048},
+}
+
+PATHS_PER_MAP = 4
+REFERENCE_DATE = 'Fri Jan  2 10:00:00 CET 2026'
+MONTH_DAYS = (('Dec', 31), ('Jan', 2))
+LOG_MESSAGES = (
+    'systemd[1]: Started Session {0} of user root.',
+    'sshd[{0}]: Accepted publickey for root from 10.0.{1}.{2} port {0} ssh2',
+    'kernel: [{0}.{1}] sd {1}:0:0:{2}: [sd{3}] Synchronizing SCSI cache',
+    'kernel: [{0}.{1}] device-mapper: multipath: 254:{2}: Failing path 8:{1}.',
+    'multipathd[{0}]: mpath{2}: remaining active paths: {1}',
+    'pacemaker-controld[{0}]:  notice: Result of monitor operation for ip{2} on node{1}: ok',
+    'chronyd[{0}]: Selected source 10.0.{1}.{2}',
+    'kernel: [{0}.{1}] eth{2}: Link is Up - 10Gbps/Full - flow control off',
+)
+
+def write_sections(path, file_name, sections):
+    '''
+    Writes a supportconfig file from (header, name, lines) tuples, where lines is any iterable of strings
+    '''
+    with open(os.path.join(path, file_name), 'w') as output:
+        for header, name, lines in sections:
+            output.write(header)
+            output.write('# {}\n'.format(name))
+            for line in lines:
+                output.write(line)
+                output.write('\n')
+            output.write('\n')
+
+def package_name(index):
+    return 'synthpkg-{:05d}'.format(index)
+
+def write_basic_environment(path, hostname):
+    write_sections(path, 'basic-environment.txt', [
+        (COMMAND, '/bin/date', [REFERENCE_DATE]),
+        (COMMAND, '/bin/uname -a', ['Linux {} 5.14.21-150500.55.39-default #1 SMP PREEMPT_DYNAMIC Tue Dec 5 10:15:18 UTC 2023 (2e4092e) x86_64 x86_64 x86_64 GNU/Linux'.format(hostname)]),
+        (CONFIG, '/etc/os-release', ['NAME="SLES"', 'VERSION="15-SP5"', 'VERSION_ID="15.5"', 'PRETTY_NAME="SUSE Linux Enterprise Server 15 SP5"', 'ID="sles"']),
+    ])
+
+def write_rpm(path, rng, packages):
+    distribution = 'SUSE Linux Enterprise 15'
+    header = '{:<35} {:<35} {}'.format('NAME', 'DISTRIBUTION', 'VERSION')
+    rows = ['{:<35} {:<35} {}.{}.{}-150500.{}.1'.format(package_name(i), distribution, rng.randint(0, 9), rng.randint(0, 30), rng.randint(0, 99), rng.randint(1, 60)) for i in range(packages)]
+    last = ['{:<60} Tue Dec {:2d} 10:{:02d}:18 2025'.format(package_name(i), 1 + i % 28, i % 60) for i in range(packages)]
+    write_sections(path, 'rpm.txt', [
+        (COMMAND, "/bin/rpm -qa --queryformat \"%-35{NAME} %-35{DISTRIBUTION} %{VERSION}-%{RELEASE}\\n\"", [header] + rows),
+        (COMMAND, '/bin/rpm -qa --last', last),
+    ])
+
+def write_network(path, rng, interfaces):
+    names = ['lo'] + ['eth{}'.format(i) for i in range(interfaces - 1)]
+    ip_addr = []
+    for number, name in enumerate(names, 1):
+        mac = '52:54:00:{:02x}:{:02x}:{:02x}'.format(number >> 16 & 255, number >> 8 & 255, number & 255)
+        if name == 'lo':
+            ip_addr.append('{}: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN group default qlen 1000'.format(number))
+            ip_addr.append('    link/loopback 00:00:00:00:00:00 brd 00:00:00:00:00:00')
+            ip_addr.append('    inet 127.0.0.1/8 scope host lo')
+            continue
+        state = 'UP' if rng.random() < 0.9 else 'DOWN'
+        ip_addr.append('{}: {}: <BROADCAST,MULTICAST,{}LOWER_UP> mtu {} qdisc mq state {} group default qlen 1000'.format(number, name, 'UP,' if state == 'UP' else '', rng.choice((1500, 9000)), state))
+        ip_addr.append('    link/ether {} brd ff:ff:ff:ff:ff:ff'.format(mac))
+        ip_addr.append('    inet 10.{}.{}.{}/16 brd 10.{}.255.255 scope global {}'.format(number >> 16 & 255, number >> 8 & 255, number & 255, number >> 16 & 255, name))
+        ip_addr.append('    inet6 fe80::5054:ff:fe{:02x}:{:02x}{:02x}/64 scope link'.format(number >> 16 & 255, number >> 8 & 255, number & 255))
+    sections = [(COMMAND, '/sbin/ip addr', ip_addr)]
+    for name in names[1:]:
+        features = ['Features for {}:'.format(name)]
+        for feature in ('rx-checksumming', 'tx-checksumming', 'scatter-gather', 'tcp-segmentation-offload', 'generic-receive-offload', 'large-receive-offload'):
+            features.append('{}: {}'.format(feature, rng.choice(('on', 'off', 'off [fixed]'))))
+        sections.append((COMMAND, '/sbin/ethtool -k {}'.format(name), features))
+    for name in names[1:]:
+        sections.append((CONFIG, '/etc/sysconfig/network/ifcfg-{}'.format(name), ["STARTMODE='auto'", "BOOTPROTO='{}'".format(rng.choice(('static', 'dhcp'))), "MTU=''"]))
+    write_sections(path, 'network.txt', sections)
+
+def write_mpio(path, rng, paths):
+    maps = max(1, paths // PATHS_PER_MAP)
+    topology = []
+    links = ['/dev/disk/by-id:', 'total 0']
+    udev = []
+    disk = 0
+    def sd_name(number):
+        name = ''
+        number += 1
+        while number:
+            number, remainder = divmod(number - 1, 26)
+            name = chr(97 + remainder) + name
+        return 'sd' + name
+    for index in range(maps):
+        wwid = '3600601609e0037{:017x}'.format(index)
+        alias = 'mpath{}'.format(index)
+        topology.append('{} ({}) dm-{} DGC,VRAID'.format(alias, wwid, index))
+        topology.append("size={}G features='1 queue_if_no_path' hwhandler='1 alua' wp=rw".format(rng.choice((10, 100, 500, 1024))))
+        for group, status in ((0, 'active'), (1, 'enabled')):
+            topology.append("{}-+- policy='service-time 0' prio={} status={}".format('|' if group == 0 else '`', 50 - group * 40, status))
+            for member in range(PATHS_PER_MAP // 2):
+                device = sd_name(disk)
+                prefix = '| ' if group == 0 else '  '
+                branch = '|-' if member < PATHS_PER_MAP // 2 - 1 else '`-'
+                topology.append('{}{} {}:0:{}:{} {} {}:{} active ready running'.format(prefix, branch, 1 + member, group, index, device, 8 + disk // 16, disk % 16 * 16))
+                disk += 1
+        links.append('lrwxrwxrwx 1 root root 10 2025-12-01 10:00 dm-name-{} -> ../../dm-{}'.format(alias, index))
+        links.append('lrwxrwxrwx 1 root root 10 2025-12-01 10:00 scsi-{} -> ../../dm-{}'.format(wwid, index))
+        udev.extend(['P: /devices/virtual/block/dm-{}'.format(index), 'N: dm-{}'.format(index), 'S: disk/by-id/dm-name-{}'.format(alias), 'E: DEVNAME=/dev/dm-{}'.format(index), 'E: DM_NAME={}'.format(alias), 'E: DM_UUID=mpath-{}'.format(wwid), ''])
+    write_sections(path, 'mpio.txt', [
+        (COMMAND, '/sbin/multipath -ll', topology),
+        (COMMAND, '/bin/ls -lR --time-style=long-iso /dev/disk/', links),
+        (COMMAND, '/usr/bin/udevadm info -e', udev),
+    ])
+
+def write_ha(path, rng, nodes, resources):
+    cib = ['<cib crm_feature_set="3.16.2" validate-with="pacemaker-3.9" epoch="{}" num_updates="0" admin_epoch="0" have-quorum="1" dc-uuid="1">'.format(rng.randint(10, 9999)),
+        '  <configuration>', '    <crm_config>', '      <cluster_property_set id="cib-bootstrap-options">',
+        '        <nvpair id="cib-bootstrap-options-stonith-enabled" name="stonith-enabled" value="true"/>',
+        '        <nvpair id="cib-bootstrap-options-cluster-name" name="cluster-name" value="synthetic"/>',
+        '      </cluster_property_set>', '    </crm_config>', '    <nodes>']
+    for node in range(1, nodes + 1):
+        cib.append('      <node id="{0}" uname="node{0}"/>'.format(node))
+    cib.extend(['    </nodes>', '    <resources>', '      <primitive id="stonith-sbd" class="stonith" type="external/sbd"/>'])
+    for resource in range(resources):
+        cib.append('      <group id="g{}">'.format(resource))
+        cib.append('        <primitive id="ip{0}" class="ocf" provider="heartbeat" type="IPaddr2">'.format(resource))
+        cib.append('          <instance_attributes id="ip{0}-ia"><nvpair id="ip{0}-ip" name="ip" value="10.1.{1}.{2}"/></instance_attributes>'.format(resource, resource >> 8 & 255, resource & 255))
+        cib.append('          <operations><op id="ip{0}-monitor" name="monitor" interval="10s" timeout="20s"/></operations>'.format(resource))
+        cib.append('        </primitive>')
+        cib.append('      </group>')
+    cib.extend(['    </resources>', '    <constraints>'])
+    for resource in range(resources):
+        cib.append('      <rsc_location id="loc{0}" rsc="g{0}" node="node{1}" score="100"/>'.format(resource, 1 + resource % nodes))
+    cib.extend(['    </constraints>', '  </configuration>', '  <status>'])
+    for node in range(1, nodes + 1):
+        cib.append('    <node_state id="{0}" uname="node{0}" in_ccm="true" crmd="online" join="member" expected="member">'.format(node))
+        cib.append('      <lrm id="{}"><lrm_resources>'.format(node))
+        for resource in range(node - 1, resources, nodes):
+            cib.append('        <lrm_resource id="ip{0}" type="IPaddr2" class="ocf" provider="heartbeat"><lrm_rsc_op id="ip{0}_last_0" operation="start" rc-code="0"/></lrm_resource>'.format(resource))
+        cib.append('      </lrm_resources></lrm>')
+        cib.append('    </node_state>')
+    cib.extend(['  </status>', '</cib>'])
+    corosync = ['totem {', '\tversion: 2', '\tcluster_name: synthetic', '\ttransport: knet', '}', 'nodelist {']
+    for node in range(1, nodes + 1):
+        corosync.extend(['\tnode {', '\t\tring0_addr: 10.2.0.{}'.format(node), '\t\tnodeid: {}'.format(node), '\t}'])
+    corosync.extend(['}', 'quorum {', '\tprovider: corosync_votequorum', '}'])
+    write_sections(path, 'ha.txt', [
+        (CONFIG, '/etc/corosync/corosync.conf', corosync),
+        (COMMAND, '/usr/sbin/cibadmin -Q', cib),
+        (CONFIG, '/etc/sysconfig/sbd', ['SBD_DEVICE="/dev/disk/by-id/dm-name-mpath0"', 'SBD_OPTS="-W"']),
+        (COMMAND, '/usr/sbin/sbd -d /dev/disk/by-id/dm-name-mpath0 dump', ['Header version     : 2.1', 'Number of slots    : 255', 'Sector size        : 512', 'Timeout (watchdog) : 5', 'Timeout (msgwait)  : 10']),
+    ])
+
+def write_filesystems(path, rng, filesystems):
+    mounts = ['/dev/sda2 on / type btrfs (rw,relatime,space_cache,subvolid=256)']
+    fstab = ['/dev/sda2 / btrfs defaults 0 0', '/dev/sda1 swap swap defaults 0 0']
+    df = ['Filesystem      Size  Used Avail Use% Mounted on', '/dev/sda2        40G   20G   20G  50% /']
+    for index in range(filesystems):
+        device = '/dev/mapper/vg{}-lv{}'.format(index // 100, index)
+        mount_point = '/srv/data{}'.format(index)
+        fs_type = rng.choice(('xfs', 'ext4', 'btrfs'))
+        fstab.append('{} {} {} defaults 0 2'.format(device, mount_point, fs_type))
+        if rng.random() < 0.95:
+            mounts.append('{} on {} type {} (rw,relatime)'.format(device, mount_point, fs_type))
+            used = rng.randint(1, 99)
+            df.append('{}'.format(device))
+            df.append('                 100G  {}G  {}G  {}% {}'.format(used, 100 - used, used, mount_point))
+    write_sections(path, 'fs-diskio.txt', [(COMMAND, '/bin/mount', mounts), (CONFIG, '/etc/fstab', fstab)])
+    write_sections(path, 'basic-health-check.txt', [(COMMAND, '/bin/df -h', df)])
+    write_sections(path, 'memory.txt', [(COMMAND, '/usr/bin/free -k', ['              total        used        free', 'Mem:        16000000    8000000    8000000', 'Swap:       2097148      0    2097148'])])
+
+def write_messages(path, rng, hostname, size):
+    '''
+    Writes about size bytes of syslog lines to the /var/log/messages section, in time order up to REFERENCE_DATE
+    '''
+    with open(os.path.join(path, 'messages.txt'), 'w') as output:
+        output.write(LOG)
+        output.write('# /var/log/messages\n')
+        written = 0
+        seconds = 0
+        total_seconds = sum(days for _, days in MONTH_DAYS) * 86400
+        while written < size:
+            chunk = []
+            for _ in range(4096):
+                seconds = min(seconds + rng.randint(0, 3), total_seconds - 1)
+                day, second = divmod(seconds, 86400)
+                month, month_day = MONTH_DAYS[0][0], day + 1
+                if day >= MONTH_DAYS[0][1]:
+                    month, month_day = MONTH_DAYS[1][0], day - MONTH_DAYS[0][1] + 1
+                message = rng.choice(LOG_MESSAGES).format(rng.randint(100, 99999), rng.randint(0, 255), rng.randint(0, 63), chr(97 + rng.randint(0, 25)))
+                chunk.append('{} {:2d} {:02d}:{:02d}:{:02d} {} {}\n'.format(month, month_day, second // 3600, second // 60 % 60, second % 60, hostname, message))
+            data = ''.join(chunk)
+            output.write(data)
+            written += len(data)
+        output.write('\n')
+
+def generate_archive(path, scale='small', seed=0, **overrides):
+    '''
+    Writes a synthetic extracted supportconfig archive to path
+
+    Args:        path (String) - The archive directory, created if missing
+                scale (String) - A SCALES key giving the default sizes
+                seed (Int) - Random seed, the same seed and sizes write the same archive
+                overrides - Any SCALES size key to replace its scale default
+    Returns:    Dictionary of the sizes used
+    '''
+    sizes = dict(SCALES[scale])
+    sizes.update((key, value) for key, value in overrides.items() if value is not None)
+    rng = random.Random(seed)
+    hostname = 'synth-{}-{}'.format(scale, seed)
+    os.makedirs(path, exist_ok=True)
+    write_basic_environment(path, hostname)
+    write_rpm(path, rng, sizes['packages'])
+    write_network(path, rng, sizes['interfaces'])
+    write_mpio(path, rng, sizes['paths'])
+    write_ha(path, rng, sizes['cib_nodes'], sizes['cib_resources'])
+    write_filesystems(path, rng, sizes['filesystems'])
+    write_messages(path, rng, hostname, int(sizes['messages_mb'] * 1024 * 1024))
+    return sizes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Writes a synthetic extracted supportconfig archive')
+    parser.add_argument('path', help='Archive directory to write')
+    parser.add_argument('-s', '--scale', choices=sorted(SCALES), default='small', help='Default sizes')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    for key in SCALES['small']:
+        parser.add_argument('--' + key.replace('_', '-'), dest=key, type=float if key == 'messages_mb' else int, help='Override the scale {}'.format(key))
+    options = vars(parser.parse_args(argv))
+    path = options.pop('path')
+    sizes = generate_archive(path, options.pop('scale'), options.pop('seed'), **options)
+    print('{}: {}'.format(path, ', '.join('{}={}'.format(key, value) for key, value in sorted(sizes.items()))))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,15 +23,31 @@ Core library of functions for creating and processing python patterns
 #    David Hamner (ke7oxh@gmail.com)
 #    Jason Record (jrecord@suse.com)
 #
-#  Modified: 2025 May 08
+#  Modified: 2026 Oct 19
 #
 ##############################################################################
 
 import sys
 import os
 import re
+import types
+import datetime
+import contextlib
+import bisect
+import heapq
+import time
+import json
+import inspect
+import functools
+import logging
+import logging.handlers
+import threading
+import collections
 from distutils.version import LooseVersion
-path = ''
+try:
+	import contextvars
+except ImportError: # Python 3.6
+	contextvars = None
 
 STATUS_TEMPORARY = -2
 STATUS_PARTIAL = -1
@@ -55,18 +71,144 @@ IGNORE = STATUS_IGNORE
 PASS = 0
 EXIT = 5
 
-META_CLASS = ""
-META_CATEGORY = ""
-META_COMPONENT = ""
-PATTERN_ID = ""
-PRIMARY_LINK = ""
-OVERALL = STATUS_TEMPORARY
-TMP = OVERALL
-OVERALL_INFO = ""
-OTHER_LINKS = ""
+TMP = STATUS_TEMPORARY
 #META_LINK_<TAG>=
 #META_LINK_<TAG>=
 
+class AnalysisContext(object):
+	"""
+	The state of one pattern run against one archive: the extracted archive path, the pattern result and the
+	registered log signatures. The legacy Core.path, Core.OVERALL, Core.META_CLASS and the other result globals
+	read and write the current context, so existing patterns and libraries keep working unchanged. Each thread
+	or task that analyses its own archive runs inside its own context, see analysisContext.
+
+	Variables
+	---------
+	path = (String) The extracted supportconfig archive path
+	cache = (Dictionary) getArchiveCache objects, or None to share the process cache of path
+	metaClass, metaCategory, metaComponent, patternId, primaryLink, otherLinks = (String) Pattern metadata
+	overall = (Int) The pattern result status
+	overallInfo = (String) The pattern result message
+	logSignatures = (Dictionary) Log signatures registered with addLogSignature
+	started = (Float) time.perf_counter() when init was called, None before init and after the result was printed
+	"""
+	__slots__ = ('path', 'cache', 'metaClass', 'metaCategory', 'metaComponent', 'patternId', 'primaryLink', 'overall', 'overallInfo', 'otherLinks', 'logSignatures', 'started')
+
+	def __init__(self, ARCHIVE_PATH='', CACHE=None):
+		self.path = ARCHIVE_PATH
+		self.cache = CACHE
+		self.metaClass = ""
+		self.metaCategory = ""
+		self.metaComponent = ""
+		self.patternId = ""
+		self.primaryLink = ""
+		self.overall = STATUS_TEMPORARY
+		self.overallInfo = ""
+		self.otherLinks = ""
+		self.logSignatures = {}
+		self.started = None
+
+class ThreadContextVar(object):
+	"""
+	The get, set and reset interface of contextvars.ContextVar for Python 3.6, which has no contextvars module.
+	The value is kept per thread, so threads still get private analysis contexts but coroutines of one thread
+	share them.
+	"""
+	def __init__(self, NAME, **DEFAULT):
+		self.name = NAME
+		self.default = DEFAULT
+		self.local = threading.local()
+
+	def get(self, *DEFAULT):
+		if hasattr(self.local, 'value'):
+			return self.local.value
+		if DEFAULT:
+			return DEFAULT[0]
+		if 'default' in self.default:
+			return self.default['default']
+		raise LookupError(self.name)
+
+	def set(self, VALUE):
+		TOKEN = (hasattr(self.local, 'value'), getattr(self.local, 'value', None))
+		self.local.value = VALUE
+		return TOKEN
+
+	def reset(self, TOKEN):
+		(HAD_VALUE, VALUE) = TOKEN
+		if HAD_VALUE:
+			self.local.value = VALUE
+		elif hasattr(self.local, 'value'):
+			del self.local.value
+
+if contextvars is not None:
+	ContextVar = contextvars.ContextVar
+else:
+	ContextVar = ThreadContextVar
+
+DEFAULT_CONTEXT = AnalysisContext()
+CURRENT_CONTEXT = ContextVar('Core.AnalysisContext')
+
+def getContext():
+	"""
+	Returns the AnalysisContext of the running pattern. Code outside of analysisContext shares the default
+	context, which is what single pattern processes use.
+	"""
+	return CURRENT_CONTEXT.get(DEFAULT_CONTEXT)
+
+@contextlib.contextmanager
+def analysisContext(ARCHIVE_PATH='', CACHE=None):
+	"""
+	Runs the enclosed code in a new AnalysisContext for ARCHIVE_PATH. Core.path, the pattern result and
+	the log signatures of the enclosed code are private to it, so threads can analyse different archives at the
+	same time. Parsed files are still shared with other contexts of the same archive unless CACHE is given.
+
+	Args:		ARCHIVE_PATH (String) - The extracted supportconfig archive path
+				CACHE (Dictionary) - A private getArchiveCache dictionary, or None to share parsed files
+	Returns:	AnalysisContext instance
+	Example:
+
+	with Core.analysisContext("/var/log/scc_node1_240101_1200") as CONTEXT:
+		if( HAE.haeEnabled() ):
+			Core.updateStatus(Core.WARN, "HAE cluster enabled")
+		RESULT = (CONTEXT.overall, CONTEXT.overallInfo)
+	"""
+	CONTEXT = AnalysisContext(ARCHIVE_PATH, CACHE)
+	TOKEN = CURRENT_CONTEXT.set(CONTEXT)
+	try:
+		yield CONTEXT
+	finally:
+		CURRENT_CONTEXT.reset(TOKEN)
+
+LEGACY_GLOBALS = {
+	'path': 'path',
+	'META_CLASS': 'metaClass',
+	'META_CATEGORY': 'metaCategory',
+	'META_COMPONENT': 'metaComponent',
+	'PATTERN_ID': 'patternId',
+	'PRIMARY_LINK': 'primaryLink',
+	'OVERALL': 'overall',
+	'OVERALL_INFO': 'overallInfo',
+	'OTHER_LINKS': 'otherLinks',
+}
+
+def contextProperty(ATTRIBUTE):
+	def getValue(MODULE):
+		return getattr(getContext(), ATTRIBUTE)
+	def setValue(MODULE, VALUE):
+		setattr(getContext(), ATTRIBUTE, VALUE)
+	return property(getValue, setValue)
+
+class CoreModule(types.ModuleType):
+	"""
+	The Core module type. It maps the legacy module globals in LEGACY_GLOBALS to the current AnalysisContext.
+	"""
+	pass
+
+for LEGACY_NAME in LEGACY_GLOBALS:
+	setattr(CoreModule, LEGACY_NAME, contextProperty(LEGACY_GLOBALS[LEGACY_NAME]))
+del LEGACY_NAME
+sys.modules[__name__].__class__ = CoreModule
+
 def init(CLASS, CATEGORY, COMPONENT, ID, LINK, OVER_ALL, INFO, LINKS):
 	"""
 	Initialize the pattern metadata variables and process the startup options.
@@ -83,23 +225,16 @@ def init(CLASS, CATEGORY, COMPONENT, ID, LINK, OVER_ALL, INFO, LINKS):
 				LINKS = OTHER_LINKS
 	Returns:	Updates global variables
 	"""
-	global META_CLASS
-	global META_CATEGORY
-	global META_COMPONENT
-	global PATTERN_ID
-	global PRIMARY_LINK
-	global OVERALL
-	global OVERALL_INFO
-	global OTHER_LINKS
-
-	META_CLASS = CLASS
-	META_CATEGORY = CATEGORY
-	META_COMPONENT = COMPONENT
-	PATTERN_ID = ID
-	PRIMARY_LINK = LINK
-	OVERALL = OVER_ALL
-	OVERALL_INFO = INFO
-	OTHER_LINKS = LINKS
+	CONTEXT = getContext()
+	CONTEXT.metaClass = CLASS
+	CONTEXT.metaCategory = CATEGORY
+	CONTEXT.metaComponent = COMPONENT
+	CONTEXT.patternId = ID
+	CONTEXT.primaryLink = LINK
+	CONTEXT.overall = OVER_ALL
+	CONTEXT.overallInfo = INFO
+	CONTEXT.otherLinks = LINKS
+	CONTEXT.started = time.perf_counter()
 	processOptions()
 
 
@@ -113,15 +248,13 @@ def printPatternResults():
 	Args:		None
 	Returns:	Pattern result string to stdout
 	"""
-	global META_CLASS
-	global META_CATEGORY
-	global META_COMPONENT
-	global PATTERN_ID
-	global PRIMARY_LINK
-	global OVERALL
-	global OVERALL_INFO
-	global OTHER_LINKS
-	print("META_CLASS" + "=" + META_CLASS + "|" + "META_CATEGORY" + "=" + META_CATEGORY + "|" + "META_COMPONENT" + "=" + META_COMPONENT + "|" + "PATTERN_ID" + "=" + PATTERN_ID + "|"  + "PRIMARY_LINK" + "=" + PRIMARY_LINK + "|" + "OVERALL" + "=" + str(OVERALL) + "|"  + "OVERALL_INFO" + "=" + OVERALL_INFO + "|" + OTHER_LINKS)
+	CONTEXT = getContext()
+	if CONTEXT.started is not None:
+		ELAPSED = time.perf_counter() - CONTEXT.started
+		CONTEXT.started = None
+		if( ELAPSED >= SLOW_CALLS.patternThreshold ):
+			logSlowCall('pattern', CONTEXT.patternId, ELAPSED, (CONTEXT.path,))
+	print("META_CLASS" + "=" + CONTEXT.metaClass + "|" + "META_CATEGORY" + "=" + CONTEXT.metaCategory + "|" + "META_COMPONENT" + "=" + CONTEXT.metaComponent + "|" + "PATTERN_ID" + "=" + CONTEXT.patternId + "|"  + "PRIMARY_LINK" + "=" + CONTEXT.primaryLink + "|" + "OVERALL" + "=" + str(CONTEXT.overall) + "|"  + "OVERALL_INFO" + "=" + CONTEXT.overallInfo + "|" + CONTEXT.otherLinks)
 
 def updateStatus(overAll, overAllInfo):
 	"""
@@ -149,13 +282,11 @@ def updateStatus(overAll, overAllInfo):
 	Core.updateStatus(Core.CRIT, "Another critical condition found, but ignored because critical is already set")
 	Core.updateStatus(Core.SUCC, "A successful condition found, but ignored because the severity is already at critical")
 	"""
-	global OVERALL_INFO
-	global OVERALL
-	global EXIT
-	if(OVERALL < overAll):
-		OVERALL = overAll
-		OVERALL_INFO = overAllInfo
-	if(OVERALL >= EXIT):
+	CONTEXT = getContext()
+	if(CONTEXT.overall < overAll):
+		CONTEXT.overall = overAll
+		CONTEXT.overallInfo = overAllInfo
+	if(CONTEXT.overall >= EXIT):
 		printPatternResults()
 		sys.exit()
 
@@ -183,10 +314,9 @@ def setStatus(overAll, overAllInfo):
 	Core.updateStatus(Core.CRIT, "Another critical condition found, but ignored because critical is already set")
 	Core.setStatus(Core.SUCC, "A successful condition found, and manually set to override the previous critical condition")
 	"""
-	global OVERALL_INFO
-	global OVERALL
-	OVERALL = overAll
-	OVERALL_INFO = overAllInfo
+	CONTEXT = getContext()
+	CONTEXT.overall = overAll
+	CONTEXT.overallInfo = overAllInfo
 
 
 def processOptions():
@@ -200,16 +330,16 @@ def processOptions():
 	Example:	None
 	"""
 	#find path
-	global path
+	CONTEXT = getContext()
 	foundPath = False
-	path = "error: no path"
+	CONTEXT.path = "error: no path"
 	for i in sys.argv:
 		if foundPath == True:
-			path = i
+			CONTEXT.path = i
 			break
 		if i == "-p":
 			foundPath = True
-	return path
+	return CONTEXT.path
 
 
 def loadFullFile(FILE_OPEN, CONTENT):
@@ -232,7 +362,7 @@ def loadFullFile(FILE_OPEN, CONTENT):
 	else:
 		Core.updateStatus(Core.ERROR, "ERROR: Empty file - " + FILE_OPEN)
 	"""
-	global path
+	path = getContext().path
 	RESULT = False
 
 	try:
@@ -267,7 +397,7 @@ def listSections(FILE_OPEN, CONTENT):
 				return True
 	return False
 	"""
-	global path
+	path = getContext().path
 	inSection = False
 	RESULT = False
 	I = 0
@@ -292,7 +422,7 @@ def listSections(FILE_OPEN, CONTENT):
 	return RESULT
 
 def isFileActive(FILE_OPEN):
-	global path
+	path = getContext().path
 	MIN_FILE_SIZE_BYTES=500 #most inactive files are less than this, but it's not exact
 
 	try:
@@ -335,7 +465,7 @@ def getSection(FILE_OPEN, SECTION, CONTENT):
 	FoundSection = False
 	SectionName = ''
 	i = 0
-	global path
+	path = getContext().path
 	try:
 		FILE = open(path + "/" + FILE_OPEN, "rt", errors='ignore')
 	except Exception as error:
@@ -392,7 +522,7 @@ def getRegExSection(FILE_OPEN, SECTION, CONTENT):
 	"""
 	FoundSection = False
 	SectionName = ''
-	global path
+	path = getContext().path
 	try:
 		FILE = open(path + "/" + FILE_OPEN, "rt", errors='ignore')
 	except Exception as error:
@@ -448,7 +578,7 @@ def getRegExSectionRaw(FILE_OPEN, SECTION, CONTENT):
 	"""
 	FoundSection = False
 	SectionName = ''
-	global path
+	path = getContext().path
 	try:
 		FILE = open(path + "/" + FILE_OPEN, "rt", errors='ignore')
 	except Exception as error:
@@ -499,7 +629,7 @@ def getExactSection(FILE_OPEN, SECTION, CONTENT):
 	"""
 	FoundSection = False
 	SectionName = ''
-	global path
+	path = getContext().path
 	try:
 		FILE = open(path + "/" + FILE_OPEN, "rt", errors='ignore')
 	except Exception as error:
@@ -530,6 +660,915 @@ def getExactSection(FILE_OPEN, SECTION, CONTENT):
 	FILE.close()
 	return FoundSection
 
+def iterSections(FILE_OPEN, INCLUDE_COMMENTS=False):
+	"""
+	Walks FILE_OPEN once and yields every section in file order as a (SECTION_NAME, CONTENT) tuple. CONTENT is
+	the list of section lines using the same rules as getRegExSection, or getRegExSectionRaw when INCLUDE_COMMENTS
+	is True. Use it to build indexes of many sections of the same file without rescanning the file per section.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename to open
+				INCLUDE_COMMENTS (Boolean) - Include commented lines in CONTENT
+	Returns:	Generator of (String, List) tuples
+	Example:
+
+	SERVICES = {}
+	for SECTION_NAME, CONTENT in Core.iterSections("systemd.txt"):
+		if "systemctl show '" in SECTION_NAME:
+			SERVICES[SECTION_NAME.split("'")[1]] = CONTENT
+	"""
+	SectionName = ''
+	SectionContent = []
+	path = getContext().path
+	try:
+		FILE = open(path + "/" + FILE_OPEN, "rt", errors='ignore')
+	except Exception as error:
+		updateStatus(ERROR, "ERROR: Cannot open " + FILE_OPEN + ": " + str(error))
+	CommentedLine = re.compile(r"^#|^\s+#")
+	try:
+		for line in FILE:
+			line = line.strip("\n")
+			if line.startswith('#==['):
+				if SectionName:
+					yield (SectionName, SectionContent)
+				SectionName = ''
+				SectionContent = []
+			elif ( SectionName == '' ):
+				SectionName = re.sub(r'^#', '', line).strip()
+			elif( len(line) > 0 ):
+				if( INCLUDE_COMMENTS or not CommentedLine.search(line) ):
+					SectionContent.append(line)
+		if SectionName:
+			yield (SectionName, SectionContent)
+	finally:
+		FILE.close()
+
+def getRegExSections(FILE_OPEN, SECTIONS, CONTENT):
+	"""
+	Extracts the first section of a supportconfig file matching each regex in SECTIONS with a single pass over
+	the file. Each CONTENT key is a SECTION and the value is the list of its section lines, the same as
+	getRegExSection would return for it. SECTIONS that are not found are not added to CONTENT.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename to open
+				SECTIONS (List) - The section regex identifiers in the file
+				CONTENT (Dictionary) - Section contents line-by-line for each section found
+	Returns:	True or False
+					True - All the specified sections were found
+					False - At least one section was not found
+	Example:
+
+	CONTENT = {}
+	if Core.getRegExSections("fs-diskio.txt", ["/bin/mount", "/etc/fstab"], CONTENT):
+		for LINE in CONTENT["/etc/fstab"]:
+			if " nfs " in LINE:
+				Core.updateStatus(Core.WARN, "Found NFS mounts in /etc/fstab")
+	"""
+	SECTION_TAGS = {}
+	for SECTION in SECTIONS:
+		SECTION_TAGS[SECTION] = re.compile(SECTION)
+	for SECTION_NAME, SECTION_CONTENT in iterSections(FILE_OPEN):
+		if not SECTION_CONTENT:
+			continue
+		for SECTION in list(SECTION_TAGS.keys()):
+			if SECTION_TAGS[SECTION].search(SECTION_NAME):
+				CONTENT[SECTION] = SECTION_CONTENT
+				del SECTION_TAGS[SECTION]
+		if not SECTION_TAGS:
+			break
+	return ( len(SECTION_TAGS) == 0 )
+
+ARCHIVE_CACHE = {}
+
+def getArchiveCache(KEY, LOADER):
+	"""
+	Returns the object cached under KEY for the current supportconfig archive, or the AnalysisContext cache if it
+	has its own. LOADER is called without
+	arguments the first time KEY is requested for the archive and its return value is kept until
+	clearArchiveCache is called. Helpers use it to parse a supportconfig file once per archive instead of
+	once per call.
+
+	Args:		KEY (String) - A unique name for the cached object, usually Module.ObjectName
+				LOADER (Function) - Builds the object when it is not cached yet
+	Returns:	The cached object
+	Example:
+
+	def loadPackages():
+		CONTENT = []
+		Core.getRegExSection("rpm.txt", "rpm -qa --last", CONTENT)
+		return CONTENT
+
+	PACKAGES = Core.getArchiveCache("MyPattern.Packages", loadPackages)
+	"""
+	CONTEXT = getContext()
+	CACHE = CONTEXT.cache
+	if CACHE is None:
+		CACHE = ARCHIVE_CACHE.setdefault(CONTEXT.path, {})
+	if KEY not in CACHE:
+		# contexts of one archive may load the same KEY at the same time, all of them get the first object stored
+		CACHE.setdefault(KEY, LOADER())
+	return CACHE[KEY]
+
+def clearArchiveCache(ARCHIVE_PATH=None):
+	"""
+	Discards the objects cached by getArchiveCache for ARCHIVE_PATH, or for all archives if ARCHIVE_PATH is None.
+
+	Args:		ARCHIVE_PATH (String) - The extracted archive path or None
+	Returns:	None
+	"""
+	if ARCHIVE_PATH is None:
+		ARCHIVE_CACHE.clear()
+	else:
+		ARCHIVE_CACHE.pop(ARCHIVE_PATH, None)
+
+class FileSection(object):
+	"""
+	The location of one section in a supportconfig file. start and end are byte offsets of the section content
+	and lineNumber is the file line number at start. hasContent is True if the section has at least one line
+	getRegExSection would return.
+	"""
+	__slots__ = ('name', 'start', 'end', 'lineNumber', 'hasContent')
+
+	def __init__(self, NAME, START, LINE_NUMBER):
+		self.name = NAME
+		self.start = START
+		self.end = START
+		self.lineNumber = LINE_NUMBER
+		self.hasContent = False
+
+def loadFileSectionIndex(FILE_OPEN):
+	path = getContext().path
+	SECTIONS = []
+	try:
+		FILE = open(path + "/" + FILE_OPEN, "rb")
+	except Exception as error:
+		updateStatus(ERROR, "ERROR: Cannot open " + FILE_OPEN + ": " + str(error))
+		return SECTIONS
+	CommentedLine = re.compile(rb"^#|^\s+#")
+	CURRENT = None
+	EXPECT_NAME = False
+	OFFSET = 0
+	LINE_NUMBER = 0
+	with FILE:
+		for LINE in FILE:
+			LINE_NUMBER += 1
+			OFFSET += len(LINE)
+			if LINE.startswith(b'#==['):
+				if CURRENT is not None:
+					CURRENT.end = OFFSET - len(LINE)
+				CURRENT = None
+				EXPECT_NAME = True
+			elif EXPECT_NAME:
+				NAME = re.sub(r'^#', '', LINE.decode('utf-8', 'ignore').strip("\n")).strip()
+				if NAME:
+					CURRENT = FileSection(NAME, OFFSET, LINE_NUMBER + 1)
+					SECTIONS.append(CURRENT)
+					EXPECT_NAME = False
+			elif CURRENT is not None and not CURRENT.hasContent:
+				if LINE.strip() and not CommentedLine.search(LINE):
+					CURRENT.hasContent = True
+	if CURRENT is not None:
+		CURRENT.end = OFFSET
+	return SECTIONS
+
+def getFileSectionIndex(FILE_OPEN):
+	"""
+	Returns the list of FileSection locations of every section in FILE_OPEN. The file is indexed once per archive
+	so large files like messages.txt can be read one section at a time with readSectionLines.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename
+	Returns:	List of FileSection instances in file order
+	Example:
+
+	for SECTION in Core.getFileSectionIndex("messages.txt"):
+		if( SECTION.end - SECTION.start > 100*1024*1024 ):
+			Core.updateStatus(Core.WARN, "Large log section: " + SECTION.name)
+			break
+	else:
+		Core.updateStatus(Core.IGNORE, "No large log sections")
+	"""
+	return getArchiveCache(('Core.FileSectionIndex', FILE_OPEN), lambda: loadFileSectionIndex(FILE_OPEN))
+
+def getFileSection(FILE_OPEN, SECTION):
+	"""
+	Returns the FileSection of the first section in FILE_OPEN whose name matches the SECTION regex and has
+	content, the same section getRegExSection would return, or None.
+	"""
+	SectionTag = re.compile(SECTION)
+	for FILE_SECTION in getFileSectionIndex(FILE_OPEN):
+		if FILE_SECTION.hasContent and SectionTag.search(FILE_SECTION.name):
+			return FILE_SECTION
+	return None
+
+def readSectionLines(FILE_OPEN, FILE_SECTION, START=None, LINE_NUMBER=None):
+	"""
+	Streams the lines of FILE_SECTION without loading the section into memory. Empty and commented lines are
+	skipped like getRegExSection does.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename
+				FILE_SECTION (FileSection) - The section from getFileSection
+				START (Int) - Byte offset inside the section to start reading at, the section start if None
+				LINE_NUMBER (Int) - The file line number at START
+	Returns:	Generator of (LINE_NUMBER, OFFSET, LINE) tuples
+	Example:
+
+	SECTION = Core.getFileSection("messages.txt", "/var/log/messages")
+	if SECTION is not None:
+		for LINE_NUMBER, OFFSET, LINE in Core.readSectionLines("messages.txt", SECTION):
+			if "Out of memory" in LINE:
+				Core.updateStatus(Core.WARN, "OOM killer invoked at line " + str(LINE_NUMBER))
+				break
+	"""
+	path = getContext().path
+	if START is None:
+		START = FILE_SECTION.start
+		LINE_NUMBER = FILE_SECTION.lineNumber
+	CommentedLine = re.compile(r"^#|^\s+#")
+	with open(path + "/" + FILE_OPEN, "rb") as FILE:
+		FILE.seek(START)
+		OFFSET = START
+		END = FILE_SECTION.end
+		while OFFSET < END:
+			RAW = FILE.readline()
+			if not RAW:
+				break
+			LINE = RAW.decode('utf-8', 'ignore').rstrip("\n")
+			if( len(LINE) > 0 and not CommentedLine.search(LINE) ):
+				yield (LINE_NUMBER, OFFSET, LINE)
+			OFFSET += len(RAW)
+			LINE_NUMBER += 1
+
+MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6, 'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+ISO_TIMESTAMP = re.compile(r"^(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d)(?:[.,](\d{1,6}))?")
+SYSLOG_TIMESTAMP = re.compile(r"^([A-Z][a-z]{2}) {1,2}(\d{1,2}) (\d\d):(\d\d):(\d\d)")
+
+def loadArchiveRunTime():
+	path = getContext().path
+	CONTENT = []
+	if os.path.exists(path + "/basic-environment.txt") and getRegExSection("basic-environment.txt", "/date", CONTENT):
+		PART = CONTENT[0].split()
+		if( len(PART) > 5 ):
+			del PART[4]
+			try:
+				return datetime.datetime.strptime(' '.join(PART), "%c")
+			except ValueError:
+				pass
+	return None
+
+def getArchiveRunTime():
+	"""
+	Returns the supportconfig run time from the /bin/date section of basic-environment.txt as a datetime, or None
+	if it is not available.
+	"""
+	return getArchiveCache('Core.ArchiveRunTime', loadArchiveRunTime)
+
+def getLogReferenceTime():
+	"""
+	Returns the supportconfig run time as a datetime, or the current time if it is not available. It is used
+	to add the year to syslog timestamps that do not have one.
+	"""
+	RUN_TIME = getArchiveRunTime()
+	if RUN_TIME is None:
+		return datetime.datetime.now()
+	return RUN_TIME
+
+def parseLogTimestamp(LINE, REFERENCE=None):
+	"""
+	Parses the ISO 8601 (2024-01-31T13:45:01.123456+01:00) or syslog (Jan 31 13:45:01) timestamp at the start of a
+	log line. Time zone offsets are ignored so both formats compare as local time. Syslog timestamps get the year
+	of REFERENCE, or the year before when that would place them after REFERENCE.
+
+	Args:		LINE (String) - The log line
+				REFERENCE (datetime) - The time the log was collected, getLogReferenceTime() if None
+	Returns:	datetime or None if the line has no timestamp
+	Example:
+
+	SC_TIME = Core.getLogReferenceTime()
+	STAMP = Core.parseLogTimestamp("Jan 31 13:45:01 host kernel: message", SC_TIME)
+	"""
+	MATCH = ISO_TIMESTAMP.match(LINE)
+	if MATCH:
+		MICRO = MATCH.group(7)
+		try:
+			return datetime.datetime(int(MATCH.group(1)), int(MATCH.group(2)), int(MATCH.group(3)), int(MATCH.group(4)), int(MATCH.group(5)), int(MATCH.group(6)), int(MICRO.ljust(6, '0')) if MICRO else 0)
+		except ValueError:
+			return None
+	MATCH = SYSLOG_TIMESTAMP.match(LINE)
+	if MATCH and MATCH.group(1) in MONTHS:
+		if REFERENCE is None:
+			REFERENCE = getLogReferenceTime()
+		try:
+			STAMP = datetime.datetime(REFERENCE.year, MONTHS[MATCH.group(1)], int(MATCH.group(2)), int(MATCH.group(3)), int(MATCH.group(4)), int(MATCH.group(5)))
+			if( STAMP > REFERENCE + datetime.timedelta(days=1) ):
+				STAMP = STAMP.replace(year=REFERENCE.year - 1)
+			return STAMP
+		except ValueError:
+			return None
+	return None
+
+def parseLogTimestamps(LINES, REFERENCE=None):
+	"""
+	Parses the timestamps of a batch of log lines, the same as parseLogTimestamp does for one line. Log lines
+	share their timestamp prefix with many neighbours, so each distinct second is parsed only once per batch.
+
+	Args:		LINES (List) - Log lines
+				REFERENCE (datetime) - The time the log was collected, getLogReferenceTime() if None
+	Returns:	List of datetime or None values, one per line
+	Example:
+
+	CONTENT = []
+	if Core.getRegExSection("boot.txt", "boot.msg", CONTENT):
+		STAMPS = [STAMP for STAMP in Core.parseLogTimestamps(CONTENT) if STAMP is not None]
+	"""
+	if REFERENCE is None:
+		REFERENCE = getLogReferenceTime()
+	SECONDS = {}
+	STAMPS = []
+	for LINE in LINES:
+		if LINE[:1].isdigit():
+			KEY = LINE[:19]
+		else:
+			KEY = LINE[:15]
+		if KEY in SECONDS:
+			STAMP = SECONDS[KEY]
+		else:
+			STAMP = SECONDS[KEY] = parseLogTimestamp(KEY, REFERENCE)
+		if STAMP is not None and len(LINE) > 20 and LINE[19] in '.,' and KEY[:1].isdigit():
+			FRACTION = ''
+			for CHAR in LINE[20:26]:
+				if not CHAR.isdigit():
+					break
+				FRACTION += CHAR
+			if FRACTION:
+				STAMP = STAMP.replace(microsecond=int(FRACTION.ljust(6, '0')))
+		STAMPS.append(STAMP)
+	return STAMPS
+
+class LogTimeIndex(object):
+	"""
+	A sparse timestamp index of one log section. Every interval lines the byte offset, file line number and the
+	timestamps of the block are recorded, so range queries seek to the first block that can hold the range instead
+	of reading the whole section. Lines without a timestamp take the timestamp of the line before them. Blocks
+	are located with running maximum and minimum timestamps, so the index is exact for logs that are not strictly
+	in time order. Use getLogTimeIndex() to get the index for the current archive.
+
+	Variables
+	---------
+	fileName = (String) The supportconfig filename
+	section = (FileSection) The indexed section
+	interval = (Int) Lines per block
+	lines = (Int) Lines in the section
+	offsets, lineNumbers = (List) Byte offset and file line number of the first line of each block
+	carry = (List) The timestamp in effect before the first line of each block
+	prefixMax = (List) The latest timestamp of all blocks up to and including each block
+	suffixMin = (List) The earliest timestamp of all blocks from each block on
+	first, last = (datetime) The earliest and latest timestamps in the section, or None
+	"""
+	def __init__(self, FILE_OPEN, FILE_SECTION, INTERVAL):
+		self.fileName = FILE_OPEN
+		self.section = FILE_SECTION
+		self.interval = INTERVAL
+		self.lines = 0
+		self.offsets = []
+		self.lineNumbers = []
+		self.carry = []
+		self.prefixMax = []
+		self.suffixMin = []
+		self.first = None
+		self.last = None
+
+	def build(self):
+		REFERENCE = getLogReferenceTime()
+		BLOCK = []
+		BLOCK_MIN = []
+		BLOCK_MAX = []
+		CURRENT = datetime.datetime.min
+		for ENTRY in readSectionLines(self.fileName, self.section):
+			BLOCK.append(ENTRY)
+			if( len(BLOCK) == self.interval ):
+				CURRENT = self._addBlock(BLOCK, CURRENT, REFERENCE, BLOCK_MIN, BLOCK_MAX)
+				BLOCK = []
+		if BLOCK:
+			self._addBlock(BLOCK, CURRENT, REFERENCE, BLOCK_MIN, BLOCK_MAX)
+		RUNNING = datetime.datetime.min
+		for STAMP in BLOCK_MAX:
+			RUNNING = max(RUNNING, STAMP)
+			self.prefixMax.append(RUNNING)
+		RUNNING = datetime.datetime.max
+		for STAMP in reversed(BLOCK_MIN):
+			RUNNING = min(RUNNING, STAMP)
+			self.suffixMin.append(RUNNING)
+		self.suffixMin.reverse()
+		return self
+
+	def _addBlock(self, BLOCK, CURRENT, REFERENCE, BLOCK_MIN, BLOCK_MAX):
+		self.offsets.append(BLOCK[0][1])
+		self.lineNumbers.append(BLOCK[0][0])
+		self.carry.append(CURRENT)
+		self.lines += len(BLOCK)
+		LOWEST = datetime.datetime.max
+		HIGHEST = CURRENT
+		for STAMP in parseLogTimestamps([LINE for (LINE_NUMBER, OFFSET, LINE) in BLOCK], REFERENCE):
+			if STAMP is not None:
+				CURRENT = STAMP
+				if( self.first is None or STAMP < self.first ):
+					self.first = STAMP
+				if( self.last is None or STAMP > self.last ):
+					self.last = STAMP
+			LOWEST = min(LOWEST, CURRENT)
+			HIGHEST = max(HIGHEST, CURRENT)
+		BLOCK_MIN.append(LOWEST)
+		BLOCK_MAX.append(HIGHEST)
+		return CURRENT
+
+	def iterRange(self, START=None, END=None):
+		"""
+		Streams the lines with timestamps from START to END inclusive, reading only the blocks that can hold them.
+		None leaves that end of the range open. Yields (TIMESTAMP, LINE_NUMBER, OFFSET, LINE) tuples in file order.
+		"""
+		if not self.offsets:
+			return
+		FIRST = 0 if START is None else bisect.bisect_left(self.prefixMax, START)
+		LAST = len(self.offsets) - 1 if END is None else bisect.bisect_right(self.suffixMin, END) - 1
+		if( FIRST > LAST ):
+			return
+		STOP = self.offsets[LAST + 1] if LAST + 1 < len(self.offsets) else self.section.end
+		REFERENCE = getLogReferenceTime()
+		CURRENT = self.carry[FIRST]
+		BATCH = []
+		for ENTRY in readSectionLines(self.fileName, self.section, self.offsets[FIRST], self.lineNumbers[FIRST]):
+			if( ENTRY[1] >= STOP ):
+				break
+			BATCH.append(ENTRY)
+			if( len(BATCH) == self.interval ):
+				for RESULT in self._filterBatch(BATCH, CURRENT, REFERENCE, START, END):
+					CURRENT = RESULT[0]
+					if RESULT[1] is not None:
+						yield RESULT
+				BATCH = []
+		for RESULT in self._filterBatch(BATCH, CURRENT, REFERENCE, START, END):
+			if RESULT[1] is not None:
+				yield RESULT
+
+	def _filterBatch(self, BATCH, CURRENT, REFERENCE, START, END):
+		# yields (timestamp, None, None, None) for lines out of range so the caller keeps the running timestamp
+		STAMPS = parseLogTimestamps([LINE for (LINE_NUMBER, OFFSET, LINE) in BATCH], REFERENCE)
+		for I in range(len(BATCH)):
+			if STAMPS[I] is not None:
+				CURRENT = STAMPS[I]
+			if( (START is not None and CURRENT < START) or (END is not None and CURRENT > END) ):
+				yield (CURRENT, None, None, None)
+			else:
+				yield (CURRENT, BATCH[I][0], BATCH[I][1], BATCH[I][2])
+
+def getLogTimeIndex(FILE_OPEN, SECTION, INTERVAL=1024):
+	"""
+	Returns the LogTimeIndex of the first FILE_OPEN section matching the SECTION regex, or None if there is no
+	such section. The section is indexed once per archive.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename with the log
+				SECTION (String) - The section regex identifier of the log
+				INTERVAL (Int) - Lines per index block
+	Returns:	LogTimeIndex instance or None
+	Example:
+
+	INDEX = Core.getLogTimeIndex("messages.txt", "/var/log/messages")
+	if INDEX is not None and INDEX.last is not None:
+		Core.updateStatus(Core.IGNORE, "Messages log ends at " + str(INDEX.last))
+	else:
+		Core.updateStatus(Core.ERROR, "ERROR: No timestamps in the messages log")
+	"""
+	def loadLogTimeIndex():
+		FILE_SECTION = getFileSection(FILE_OPEN, SECTION)
+		if FILE_SECTION is None:
+			return None
+		return LogTimeIndex(FILE_OPEN, FILE_SECTION, INTERVAL).build()
+	return getArchiveCache(('Core.LogTimeIndex', FILE_OPEN, SECTION, INTERVAL), loadLogTimeIndex)
+
+def iterLogRange(FILE_OPEN, SECTION, START=None, END=None):
+	"""
+	Streams the log lines of a section with timestamps from START to END inclusive, seeking directly to the
+	range with the section's LogTimeIndex.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename with the log
+				SECTION (String) - The section regex identifier of the log
+				START (datetime) - The earliest timestamp, or None for the start of the log
+				END (datetime) - The latest timestamp, or None for the end of the log
+	Returns:	Generator of (TIMESTAMP, LINE_NUMBER, OFFSET, LINE) tuples
+	Example:
+
+	import datetime
+	SINCE = Core.getLogReferenceTime() - datetime.timedelta(days=7)
+	for TIMESTAMP, LINE_NUMBER, OFFSET, LINE in Core.iterLogRange("messages.txt", "/var/log/messages", SINCE):
+		if "Out of memory" in LINE:
+			Core.updateStatus(Core.WARN, "OOM killer invoked in the last week")
+			break
+	else:
+		Core.updateStatus(Core.IGNORE, "No OOM killer events in the last week")
+	"""
+	INDEX = getLogTimeIndex(FILE_OPEN, SECTION)
+	if INDEX is None:
+		return iter(())
+	return INDEX.iterRange(START, END)
+
+def compileLogFilter(FILTER):
+	if FILTER is None or callable(FILTER):
+		return FILTER
+	if isinstance(FILTER, str):
+		FILTER = re.compile(FILTER)
+	return FILTER.search
+
+def iterLogTimeline(SOURCES, START=None, END=None, FILTER=None):
+	"""
+	Merges log sections into a single time ordered stream. Each source is read lazily with iterLogRange and the
+	streams are merged with a heap, so memory stays bounded by the number of sources, not the log sizes. Lines
+	with the same timestamp keep the order of SOURCES, then file order.
+
+	Args:		SOURCES (List) - (FILE_OPEN, SECTION) tuples of the logs to merge
+				START (datetime) - The earliest timestamp, or None for no lower bound
+				END (datetime) - The latest timestamp, or None for no upper bound
+				FILTER (String, compiled regex or function) - Only lines the regex matches, or the function
+					returns True for, are included. None includes all lines.
+	Returns:	Generator of (TIMESTAMP, SOURCE, LINE_NUMBER, LINE) tuples, SOURCE is the SOURCES tuple
+	Example:
+
+	SOURCES = [("messages.txt", "/var/log/messages"), ("ha.txt", "pacemaker.log")]
+	for TIMESTAMP, SOURCE, LINE_NUMBER, LINE in Core.iterLogTimeline(SOURCES, FILTER=r"fence|sdc"):
+		if "fence" in LINE:
+			Core.updateStatus(Core.CRIT, "Node fenced at " + str(TIMESTAMP) + " after storage errors")
+			break
+	else:
+		Core.updateStatus(Core.IGNORE, "No node fencing found")
+	"""
+	MATCH = compileLogFilter(FILTER)
+	def iterSource(SOURCE_NUMBER, FILE_OPEN, SECTION):
+		for TIMESTAMP, LINE_NUMBER, OFFSET, LINE in iterLogRange(FILE_OPEN, SECTION, START, END):
+			if MATCH is None or MATCH(LINE):
+				yield (TIMESTAMP, SOURCE_NUMBER, LINE_NUMBER, LINE)
+	STREAMS = [iterSource(I, SOURCES[I][0], SOURCES[I][1]) for I in range(len(SOURCES))]
+	for TIMESTAMP, SOURCE_NUMBER, LINE_NUMBER, LINE in heapq.merge(*STREAMS):
+		yield (TIMESTAMP, SOURCES[SOURCE_NUMBER], LINE_NUMBER, LINE)
+
+def getLogWindow(SOURCES, CENTER, BEFORE, AFTER, FILTER=None):
+	"""
+	Gets the merged log lines of SOURCES from BEFORE until AFTER around the CENTER time, like the events leading
+	up to a node fence or a file system going read only.
+
+	Args:		SOURCES (List) - (FILE_OPEN, SECTION) tuples of the logs to merge
+				CENTER (datetime) - The time of the event
+				BEFORE (timedelta) - The time before CENTER to include
+				AFTER (timedelta) - The time after CENTER to include
+				FILTER (String, compiled regex or function) - The same as iterLogTimeline
+	Returns:	List of (TIMESTAMP, SOURCE, LINE_NUMBER, LINE) tuples in time order
+	Example:
+
+	import datetime
+	Core.addLogSignature("read_only", "Remounting filesystem read-only")
+	MATCHES = Core.scanLogSignatures()["read_only"]
+	if( MATCHES ):
+		WINDOW = Core.getLogWindow([("messages.txt", "/var/log/messages"), ("boot.txt", "boot.msg")], MATCHES[0].timestamp, datetime.timedelta(minutes=5), datetime.timedelta(0), r"sd[a-z]+|dm-")
+		Core.updateStatus(Core.WARN, "File system read-only after " + str(len(WINDOW)) + " storage messages")
+	else:
+		Core.updateStatus(Core.IGNORE, "No read-only file systems")
+	"""
+	return list(iterLogTimeline(SOURCES, CENTER - BEFORE, CENTER + AFTER, FILTER))
+
+LOG_VARIABLE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+def getLogTemplate(LINE):
+	"""
+	Returns LINE without its timestamp and with numbers and hex values replaced by #, so repeated messages that
+	differ only in counters, addresses or times share the same template.
+	"""
+	if LINE[:1].isdigit() and ISO_TIMESTAMP.match(LINE):
+		LINE = LINE.split(' ', 1)[-1]
+	elif SYSLOG_TIMESTAMP.match(LINE):
+		LINE = LINE[15:]
+	return LOG_VARIABLE.sub('#', LINE)
+
+class LogRun(object):
+	"""
+	Consecutive log lines sharing one template. sample is the first line of the run, offset is the byte offset of
+	that line in the file and firstLine and lastLine are the file line numbers of the run.
+	"""
+	__slots__ = ('template', 'sample', 'count', 'first', 'last', 'firstLine', 'lastLine', 'offset')
+
+	def __init__(self, TEMPLATE, LINE, LINE_NUMBER, OFFSET, TIMESTAMP):
+		self.template = TEMPLATE
+		self.sample = LINE
+		self.count = 1
+		self.first = TIMESTAMP
+		self.last = TIMESTAMP
+		self.firstLine = LINE_NUMBER
+		self.lastLine = LINE_NUMBER
+		self.offset = OFFSET
+
+	def __repr__(self):
+		return "LogRun(" + str(self.count) + ", " + repr(self.template) + ")"
+
+class LogCompaction(object):
+	"""
+	A compact view of one log section where consecutive lines with the same template are collapsed into one LogRun
+	with their count and first and last timestamps. The original lines of a run are read back from the file on
+	demand with recover(). Use getLogCompaction() to get the view for the current archive.
+
+	Variables
+	---------
+	fileName = (String) The supportconfig filename
+	section = (FileSection) The compacted section
+	lines = (Int) Lines in the section
+	runs = (List) LogRun records in file order
+	"""
+	def __init__(self, FILE_OPEN, FILE_SECTION):
+		self.fileName = FILE_OPEN
+		self.section = FILE_SECTION
+		self.lines = 0
+		self.runs = []
+
+	def build(self, BATCH_SIZE=1024):
+		REFERENCE = getLogReferenceTime()
+		BATCH = []
+		for ENTRY in readSectionLines(self.fileName, self.section):
+			BATCH.append(ENTRY)
+			if( len(BATCH) == BATCH_SIZE ):
+				self._addBatch(BATCH, REFERENCE)
+				BATCH = []
+		self._addBatch(BATCH, REFERENCE)
+		return self
+
+	def _addBatch(self, BATCH, REFERENCE):
+		STAMPS = parseLogTimestamps([LINE for (LINE_NUMBER, OFFSET, LINE) in BATCH], REFERENCE)
+		RUN = self.runs[-1] if self.runs else None
+		for I in range(len(BATCH)):
+			(LINE_NUMBER, OFFSET, LINE) = BATCH[I]
+			STAMP = STAMPS[I]
+			TEMPLATE = getLogTemplate(LINE)
+			if RUN is not None and RUN.template == TEMPLATE:
+				RUN.count += 1
+				RUN.lastLine = LINE_NUMBER
+				if STAMP is not None:
+					if RUN.first is None:
+						RUN.first = STAMP
+					RUN.last = STAMP
+			else:
+				RUN = LogRun(TEMPLATE, LINE, LINE_NUMBER, OFFSET, STAMP)
+				self.runs.append(RUN)
+		self.lines += len(BATCH)
+
+	def recover(self, RUN):
+		"""
+		Returns the original (LINE_NUMBER, LINE) tuples of RUN
+		"""
+		LINES = []
+		for (LINE_NUMBER, OFFSET, LINE) in readSectionLines(self.fileName, self.section, RUN.offset, RUN.firstLine):
+			if( LINE_NUMBER > RUN.lastLine ):
+				break
+			LINES.append((LINE_NUMBER, LINE))
+		return LINES
+
+def getLogCompaction(FILE_OPEN, SECTION):
+	"""
+	Returns the LogCompaction of the first FILE_OPEN section matching the SECTION regex, or None if there is no
+	such section. The section is compacted once per archive.
+
+	Args:		FILE_OPEN (String) - The supportconfig filename with the log
+				SECTION (String) - The section regex identifier of the log
+	Returns:	LogCompaction instance or None
+	Example:
+
+	LOG = Core.getLogCompaction("messages.txt", "/var/log/messages")
+	if LOG is not None:
+		NOISY = [RUN for RUN in LOG.runs if RUN.count > 1000]
+		if( NOISY ):
+			Core.updateStatus(Core.WARN, "Message repeated " + str(NOISY[0].count) + " times: " + NOISY[0].sample)
+		else:
+			Core.updateStatus(Core.IGNORE, "No flooding messages")
+	"""
+	def loadLogCompaction():
+		FILE_SECTION = getFileSection(FILE_OPEN, SECTION)
+		if FILE_SECTION is None:
+			return None
+		return LogCompaction(FILE_OPEN, FILE_SECTION).build()
+	return getArchiveCache(('Core.LogCompaction', FILE_OPEN, SECTION), loadLogCompaction)
+
+def recoverLogLines(FILE_OPEN, SECTION, RUN):
+	"""
+	Returns the original (LINE_NUMBER, LINE) tuples collapsed into RUN, a LogRun of getLogCompaction or
+	scanCompactLogSignatures.
+	"""
+	LOG = getLogCompaction(FILE_OPEN, SECTION)
+	if LOG is None:
+		return []
+	return LOG.recover(RUN)
+
+class LogMatch(object):
+	"""
+	A log line matched by a log signature
+	"""
+	__slots__ = ('lineNumber', 'offset', 'timestamp', 'line')
+
+	def __init__(self, LINE_NUMBER, OFFSET, TIMESTAMP, LINE):
+		self.lineNumber = LINE_NUMBER
+		self.offset = OFFSET
+		self.timestamp = TIMESTAMP
+		self.line = LINE
+
+	def __repr__(self):
+		return "LogMatch(" + str(self.lineNumber) + ", " + repr(self.line) + ")"
+
+class LogSignatureMatcher(object):
+	"""
+	All signatures of one log section combined into a single alternation regex. Lines the combined regex rejects
+	are skipped with one search, and only the remaining lines are checked against each signature.
+	"""
+	def __init__(self, SIGNATURES):
+		self.tests = []
+		ALTERNATION = []
+		for NAME in sorted(SIGNATURES):
+			(PATTERN, REGEX, IGNORECASE) = SIGNATURES[NAME]
+			if REGEX or IGNORECASE:
+				EXPRESSION = PATTERN if REGEX else re.escape(PATTERN)
+				self.tests.append((NAME, None, re.compile(EXPRESSION, re.IGNORECASE if IGNORECASE else 0)))
+				ALTERNATION.append(("(?i:" if IGNORECASE else "(?:") + EXPRESSION + ")")
+			else:
+				self.tests.append((NAME, PATTERN, None))
+				ALTERNATION.append(re.escape(PATTERN))
+		try:
+			self.prefilter = re.compile('|'.join(ALTERNATION))
+		except re.error:
+			# numbered back references do not survive the alternation, check every line instead
+			self.prefilter = None
+
+	def match(self, LINE):
+		"""
+		Returns the list of signature names matching LINE
+		"""
+		if self.prefilter is not None and not self.prefilter.search(LINE):
+			return []
+		NAMES = []
+		for (NAME, LITERAL, EXPRESSION) in self.tests:
+			if LITERAL is not None:
+				if LITERAL in LINE:
+					NAMES.append(NAME)
+			elif EXPRESSION.search(LINE):
+				NAMES.append(NAME)
+		return NAMES
+
+# (FILE_OPEN, SECTION) to the set of (PATTERN, REGEX, IGNORECASE) signatures registered by any pattern of the process
+LOG_SIGNATURE_REGISTRY = {}
+
+def addLogSignature(NAME, PATTERN, FILE_OPEN="messages.txt", SECTION="/var/log/messages", REGEX=False, IGNORECASE=False):
+	"""
+	Registers a log signature for scanLogSignatures. Register every signature a pattern needs before scanning,
+	so each log section is read only once for all of them. Signatures registered by earlier patterns are scanned
+	in the same pass, so patterns run against many archives share one scan per archive.
+
+	Args:		NAME (String) - A unique signature name, used as the scanLogSignatures key
+				PATTERN (String) - The literal string, or regular expression if REGEX is True, to find
+				FILE_OPEN (String) - The supportconfig filename with the log
+				SECTION (String) - The section regex identifier of the log in FILE_OPEN
+				REGEX (Boolean) - PATTERN is a regular expression
+				IGNORECASE (Boolean) - Match PATTERN case insensitive
+	Returns:	None
+	Example:
+
+	Core.addLogSignature("oom", "Out of memory: Kill")
+	Core.addLogSignature("scsi_timeout", r"sd \d+:\d+:\d+:\d+: timing out", REGEX=True)
+	MATCHES = Core.scanLogSignatures()
+	if( MATCHES["oom"] ):
+		Core.updateStatus(Core.WARN, "OOM killer invoked " + str(len(MATCHES["oom"])) + " times")
+	else:
+		Core.updateStatus(Core.IGNORE, "OOM killer not invoked")
+	"""
+	SIGNATURE = (PATTERN, REGEX, IGNORECASE)
+	getContext().logSignatures.setdefault((FILE_OPEN, SECTION), {})[NAME] = SIGNATURE
+	LOG_SIGNATURE_REGISTRY.setdefault((FILE_OPEN, SECTION), set()).add(SIGNATURE)
+
+def clearLogSignatures():
+	"""
+	Removes all log signatures registered in the current AnalysisContext
+	"""
+	getContext().logSignatures.clear()
+
+def scanLogSection(FILE_OPEN, SECTION, SIGNATURES):
+	MATCHES = dict([(NAME, []) for NAME in SIGNATURES])
+	FILE_SECTION = getFileSection(FILE_OPEN, SECTION)
+	if FILE_SECTION is None:
+		return MATCHES
+	MATCHER = LogSignatureMatcher(SIGNATURES)
+	REFERENCE = getLogReferenceTime()
+	for LINE_NUMBER, OFFSET, LINE in readSectionLines(FILE_OPEN, FILE_SECTION):
+		NAMES = MATCHER.match(LINE)
+		if NAMES:
+			FOUND = LogMatch(LINE_NUMBER, OFFSET, parseLogTimestamp(LINE, REFERENCE), LINE)
+			for NAME in NAMES:
+				MATCHES[NAME].append(FOUND)
+	return MATCHES
+
+def isTemplateSignature(PATTERN, REGEX, IGNORECASE=False):
+	"""
+	Returns True if a signature finds the same lines in getLogTemplate output as in the original lines. That is a
+	literal without the digits and # characters the template replaces, that can neither start inside a replaced
+	0x value or at the end of the stripped timestamp nor fit inside the timestamp.
+	"""
+	if REGEX or not PATTERN or '#' in PATTERN or any(CHAR.isdigit() for CHAR in PATTERN):
+		return False
+	# x and the hex letters can continue a replaced 0x value, a space or Z can follow a stripped timestamp
+	if PATTERN[0].isspace() or PATTERN[0].lower() in 'xabcdefz':
+		return False
+	TEXT = PATTERN.lower() if IGNORECASE else PATTERN
+	for STAMP_TEXT in [MONTH + '  ' for MONTH in MONTHS] + list('-T:.,+'):
+		if TEXT in (STAMP_TEXT.lower() if IGNORECASE else STAMP_TEXT):
+			return False
+	return True
+
+def scanCompactLogSection(FILE_OPEN, SECTION, SIGNATURES):
+	MATCHES = dict([(NAME, []) for NAME in SIGNATURES])
+	LOG = getLogCompaction(FILE_OPEN, SECTION)
+	if LOG is None:
+		return MATCHES
+	TEMPLATE_SIGNATURES = {}
+	LINE_SIGNATURES = {}
+	for NAME in SIGNATURES:
+		if isTemplateSignature(*SIGNATURES[NAME]):
+			TEMPLATE_SIGNATURES[NAME] = SIGNATURES[NAME]
+		else:
+			LINE_SIGNATURES[NAME] = SIGNATURES[NAME]
+	if TEMPLATE_SIGNATURES:
+		MATCHER = LogSignatureMatcher(TEMPLATE_SIGNATURES)
+		for RUN in LOG.runs:
+			for NAME in MATCHER.match(RUN.template):
+				MATCHES[NAME].append(RUN)
+	if LINE_SIGNATURES and LOG.runs:
+		# signatures depending on replaced numbers are checked against every original line in one pass
+		MATCHER = LogSignatureMatcher(LINE_SIGNATURES)
+		RUNS = iter(LOG.runs)
+		RUN = next(RUNS)
+		for LINE_NUMBER, OFFSET, LINE in readSectionLines(FILE_OPEN, LOG.section):
+			while LINE_NUMBER > RUN.lastLine:
+				RUN = next(RUNS)
+			for NAME in MATCHER.match(LINE):
+				if not MATCHES[NAME] or MATCHES[NAME][-1] is not RUN:
+					MATCHES[NAME].append(RUN)
+	return MATCHES
+
+def getLogSignatureMatches(CACHE_NAME, SCANNER):
+	"""
+	Returns the SCANNER matches of every signature registered in the current AnalysisContext. Matches are cached
+	per archive and signature, so a section is only scanned again for signatures no earlier pattern scanned it
+	for, and then for all of them together with the other signatures of the process not scanned yet.
+	"""
+	RESULTS = {}
+	for ((FILE_OPEN, SECTION), SIGNATURES) in list(getContext().logSignatures.items()):
+		SCANNED = getArchiveCache((CACHE_NAME, FILE_OPEN, SECTION), dict)
+		WANTED = set(SIGNATURES.values())
+		if not WANTED.issubset(SCANNED):
+			PENDING = WANTED.union(LOG_SIGNATURE_REGISTRY.get((FILE_OPEN, SECTION), ())).difference(SCANNED)
+			MATCHES = SCANNER(FILE_OPEN, SECTION, dict([(SIGNATURE, SIGNATURE) for SIGNATURE in PENDING]))
+			for SIGNATURE in PENDING:
+				SCANNED.setdefault(SIGNATURE, MATCHES[SIGNATURE])
+		for NAME in SIGNATURES:
+			RESULTS[NAME] = list(SCANNED[SIGNATURES[NAME]])
+	return RESULTS
+
+def scanCompactLogSignatures():
+	"""
+	Scans the compacted view of every log section with registered signatures. Literal signatures the template
+	does not change, see isTemplateSignature, are matched once per run of repeated lines against its template.
+	Regular expression signatures and the other literals depend on the numbers and timestamps getLogTemplate
+	replaces, so they are checked against the original lines in one pass over the section. The original lines of a matching run are available with recoverLogLines.
+
+	Args:		None
+	Returns:	Dictionary of signature NAME keys with a list of LogRun values in file order
+	Example:
+
+	Core.addLogSignature("scsi_failed", "FAILED Result: hostbyte=DID_ERROR")
+	RUNS = Core.scanCompactLogSignatures()["scsi_failed"]
+	COUNT = sum([RUN.count for RUN in RUNS])
+	if( COUNT > 0 ):
+		Core.updateStatus(Core.WARN, "SCSI command failures: " + str(COUNT))
+	else:
+		Core.updateStatus(Core.IGNORE, "No SCSI command failures")
+	"""
+	return getLogSignatureMatches('Core.CompactLogSignatures', scanCompactLogSection)
+
+def scanLogSignatures():
+	"""
+	Scans every log section with registered signatures once and returns the matches of each signature. Results
+	are cached per archive and signature, so patterns registering the same signature share its matches.
+
+	Args:		None
+	Returns:	Dictionary of signature NAME keys with a list of LogMatch values in file order. Each LogMatch has
+				lineNumber (Int), offset (Int), timestamp (datetime or None) and line (String) attributes.
+	Example:
+
+	Core.addLogSignature("link_down", "NIC Link is Down")
+	MATCHES = Core.scanLogSignatures()
+	if( MATCHES["link_down"] ):
+		Core.updateStatus(Core.WARN, "Network link down at " + str(MATCHES["link_down"][-1].timestamp))
+	else:
+		Core.updateStatus(Core.IGNORE, "No network link down events")
+	"""
+	return getLogSignatureMatches('Core.LogSignatures', scanLogSection)
+
 def normalizeVersionString(versionString):
 	"""
 	Converts a version string to a list of version elements
@@ -551,6 +1590,26 @@ def normalizeVersionString(versionString):
 #	print "normalizeVersionString  ELEMENTS = " + str(versionString.split("|"))
 	return versionString.split("|")
 
+def getVersionKey(versionString):
+	"""
+	Converts a version string to a tuple usable as a sort key. Numeric elements compare as integers and
+	all other elements compare as strings, like compareVersions does element by element.
+
+	Args:		versionString (String) - The version string
+	Returns:	Tuple of version elements
+	Example:
+
+	VERSIONS = ['1.10', '1.9', '1.9.1']
+	NEWEST = max(VERSIONS, key=Core.getVersionKey)
+	"""
+	KEY = []
+	for ELEMENT in normalizeVersionString(str(versionString)):
+		if ELEMENT.isdigit():
+			KEY.append((0, int(ELEMENT)))
+		else:
+			KEY.append((1, ELEMENT))
+	return tuple(KEY)
+
 def compareLooseVersions(version1, version2):
 #def compareVersions(version1, version2):
 	"""
@@ -622,3 +1681,214 @@ def compareVersions(version1, version2):
 					return -1
 	return 0
 
+
+# readSectionLines, iterLogRange and iterLogTimeline yield once per line and are left out, timing every line would
+# cost more than the reads, the sca_profile read profiler covers them when it is enabled
+SLOW_CALL_READERS = ('loadFullFile', 'listSections', 'isFileActive', 'getSection', 'getRegExSection', 'getRegExSectionRaw',
+	'getExactSection', 'iterSections', 'getRegExSections', 'getFileSectionIndex', 'getFileSection',
+	'getLogTimeIndex', 'getLogCompaction', 'scanLogSection', 'scanCompactLogSection',
+	'scanLogSignatures', 'scanCompactLogSignatures')
+SLOW_CALL_ARGUMENT_LENGTH = 200
+SLOW_CALL_FILE_HISTORY = 64
+
+class SlowCallLog(object):
+	"""
+	Where and when slow reader calls, helper calls and patterns are logged. The log file is a rotating file of
+	JSON lines, opened the first time a call is slow, so fast runs never touch it. If it cannot be written,
+	slow calls are no longer logged and the patterns keep running.
+
+	Variables
+	---------
+	logFile = (String) The log file, empty to turn logging off
+	threshold = (Float) Seconds a reader or helper call takes before it is logged
+	patternThreshold = (Float) Seconds a pattern takes before it is logged
+	maxBytes = (Int) Log file size to rotate at
+	backups = (Int) Rotated log files kept
+	"""
+	__slots__ = ('logFile', 'threshold', 'patternThreshold', 'maxBytes', 'backups', 'logger')
+
+	def __init__(self, LOG_FILE, THRESHOLD, PATTERN_THRESHOLD, MAX_BYTES, BACKUPS):
+		self.logFile = LOG_FILE
+		self.threshold = THRESHOLD if LOG_FILE else float('inf')
+		self.patternThreshold = PATTERN_THRESHOLD if LOG_FILE else float('inf')
+		self.maxBytes = MAX_BYTES
+		self.backups = BACKUPS
+		self.logger = None
+
+	def write(self, ENTRY):
+		if self.logger is None:
+			try:
+				HANDLER = logging.handlers.RotatingFileHandler(self.logFile, maxBytes=self.maxBytes, backupCount=self.backups, delay=False)
+			except OSError:
+				self.threshold = float('inf')
+				self.patternThreshold = float('inf')
+				return
+			HANDLER.setFormatter(logging.Formatter('%(message)s'))
+			self.logger = logging.Logger('Core.SlowCallLog')
+			self.logger.addHandler(HANDLER)
+		self.logger.warning(ENTRY)
+
+	def close(self):
+		if self.logger is not None:
+			for HANDLER in self.logger.handlers:
+				HANDLER.close()
+			self.logger = None
+
+class RecentFiles(threading.local):
+	"""
+	The last files the readers of this thread were called with, so a slow helper can log the files it read
+	"""
+	def __init__(self):
+		self.names = collections.deque(maxlen=SLOW_CALL_FILE_HISTORY)
+		self.count = 0
+
+	def since(self, MARK):
+		NEW = min(self.count - MARK, len(self.names))
+		return list(self.names)[len(self.names) - NEW:] if NEW > 0 else []
+
+RECENT_FILES = RecentFiles()
+
+SLOW_CALLS = SlowCallLog(os.environ.get('SCA_SLOW_CALL_LOG', '/var/tmp/sca-slow-calls.log'),
+	float(os.environ.get('SCA_SLOW_CALL_SECONDS', '2')), float(os.environ.get('SCA_SLOW_PATTERN_SECONDS', '10')),
+	10485760, 5)
+
+def setSlowCallLog(LOG_FILE=None, THRESHOLD=None, PATTERN_THRESHOLD=None, MAX_BYTES=10485760, BACKUPS=5):
+	"""
+	Changes where and when slow calls are logged. The defaults come from the SCA_SLOW_CALL_LOG (/var/tmp/sca-slow-calls.log),
+	SCA_SLOW_CALL_SECONDS (2) and SCA_SLOW_PATTERN_SECONDS (10) environment variables.
+
+	Args:		LOG_FILE (String) - The log file, an empty string turns logging off, None keeps the current file
+				THRESHOLD (Float) - Seconds a reader or helper call takes before it is logged, None keeps the current value
+				PATTERN_THRESHOLD (Float) - Seconds a pattern takes before it is logged, None keeps the current value
+				MAX_BYTES (Int) - Log file size to rotate at
+				BACKUPS (Int) - Rotated log files kept
+	Returns:	None
+	Example:
+
+	Core.setSlowCallLog("/var/log/sca/slow-calls.log", THRESHOLD=0.5)
+	"""
+	global SLOW_CALLS
+	SLOW_CALLS.close()
+	SLOW_CALLS = SlowCallLog(SLOW_CALLS.logFile if LOG_FILE is None else LOG_FILE,
+		SLOW_CALLS.threshold if THRESHOLD is None else THRESHOLD,
+		SLOW_CALLS.patternThreshold if PATTERN_THRESHOLD is None else PATTERN_THRESHOLD,
+		MAX_BYTES, BACKUPS)
+
+def describeArgument(ARGUMENT):
+	if isinstance(ARGUMENT, (str, int, float, bool)) or ARGUMENT is None:
+		TEXT = repr(ARGUMENT)
+	elif isinstance(ARGUMENT, (list, tuple, dict, set)):
+		TEXT = "<" + type(ARGUMENT).__name__ + " of " + str(len(ARGUMENT)) + ">"
+	else:
+		TEXT = "<" + type(ARGUMENT).__name__ + ">"
+	if( len(TEXT) > SLOW_CALL_ARGUMENT_LENGTH ):
+		TEXT = TEXT[:SLOW_CALL_ARGUMENT_LENGTH - 3] + "..."
+	return TEXT
+
+def logSlowCall(KIND, NAME, ELAPSED, ARGS=(), KWARGS=None, FILES_READ=()):
+	"""
+	Writes one slow call entry to the slow call log. The FILES_READ names of files in the archive are logged with
+	the file size, other arguments are never looked up as files.
+
+	Args:		KIND (String) - reader, helper or pattern
+				NAME (String) - The function or pattern name
+				ELAPSED (Float) - Seconds the call took
+				ARGS (Tuple) - The call arguments
+				KWARGS (Dictionary) - The call keyword arguments
+				FILES_READ (List) - Archive file names the call read, the reader FILE_OPEN included, logged with their sizes
+	Returns:	None
+	"""
+	CONTEXT = getContext()
+	FILES = {}
+	if CONTEXT.path:
+		ARCHIVE_PATH = os.path.realpath(CONTEXT.path)
+		for FILE_OPEN in FILES_READ:
+			if not isinstance(FILE_OPEN, str) or not FILE_OPEN or FILE_OPEN in FILES or os.path.isabs(FILE_OPEN):
+				continue
+			FILE_PATH = os.path.realpath(os.path.join(ARCHIVE_PATH, FILE_OPEN))
+			if FILE_PATH.startswith(ARCHIVE_PATH + os.sep) and os.path.isfile(FILE_PATH):
+				FILES[FILE_OPEN] = os.path.getsize(FILE_PATH)
+	ENTRY = {
+		'time': datetime.datetime.now().isoformat(timespec='milliseconds'),
+		'kind': KIND,
+		'call': NAME,
+		'seconds': round(ELAPSED, 6),
+		'threshold': SLOW_CALLS.patternThreshold if KIND == 'pattern' else SLOW_CALLS.threshold,
+		'archive': CONTEXT.path,
+		'pattern': CONTEXT.patternId,
+		'args': [describeArgument(VALUE) for VALUE in ARGS],
+		'kwargs': {KEY: describeArgument(VALUE) for KEY, VALUE in (KWARGS or {}).items()},
+		'files': FILES,
+	}
+	SLOW_CALLS.write(json.dumps(ENTRY))
+
+def timeCalls(FUNCTION, KIND):
+	"""
+	Returns FUNCTION wrapped to log its calls that take longer than the slow call threshold. Generator functions
+	are timed while they produce items, not while the caller works on them. Reader calls remember their file, so
+	a slow helper call logs the files its readers read.
+	"""
+	NAME = FUNCTION.__module__ + "." + FUNCTION.__name__
+	READER = ( KIND == 'reader' )
+	if inspect.isgeneratorfunction(FUNCTION):
+		@functools.wraps(FUNCTION)
+		def timed(*ARGS, **KWARGS):
+			MARK = RECENT_FILES.count
+			if( READER and ARGS and isinstance(ARGS[0], str) ):
+				RECENT_FILES.names.append(ARGS[0])
+				RECENT_FILES.count += 1
+			ITERATOR = FUNCTION(*ARGS, **KWARGS)
+			ELAPSED = 0.0
+			try:
+				while True:
+					START = time.perf_counter()
+					try:
+						ITEM = next(ITERATOR)
+					except StopIteration:
+						break
+					finally:
+						ELAPSED += time.perf_counter() - START
+					yield ITEM
+			finally:
+				ITERATOR.close()
+				if( ELAPSED >= SLOW_CALLS.threshold ):
+					logSlowCall(KIND, NAME, ELAPSED, ARGS, KWARGS, RECENT_FILES.since(MARK))
+	else:
+		@functools.wraps(FUNCTION)
+		def timed(*ARGS, **KWARGS):
+			MARK = RECENT_FILES.count
+			if( READER and ARGS and isinstance(ARGS[0], str) ):
+				RECENT_FILES.names.append(ARGS[0])
+				RECENT_FILES.count += 1
+			START = time.perf_counter()
+			try:
+				return FUNCTION(*ARGS, **KWARGS)
+			finally:
+				ELAPSED = time.perf_counter() - START
+				if( ELAPSED >= SLOW_CALLS.threshold ):
+					logSlowCall(KIND, NAME, ELAPSED, ARGS, KWARGS, RECENT_FILES.since(MARK))
+	return timed
+
+def timeModuleCalls(MODULE_NAME, NAMES=None, KIND='helper'):
+	"""
+	Wraps the public functions of a library module, or only NAMES, with timeCalls. Helper libraries call it
+	once at the end of the module.
+
+	Args:		MODULE_NAME (String) - The module __name__
+				NAMES (List) - The function names to wrap, None for every public function defined in the module
+				KIND (String) - The slow call log kind of the functions
+	Returns:	None
+	Example:
+
+	Core.timeModuleCalls(__name__)
+	"""
+	MODULE = sys.modules[MODULE_NAME]
+	if NAMES is None:
+		NAMES = [NAME for NAME, VALUE in vars(MODULE).items() if not NAME.startswith('_') and inspect.isfunction(VALUE) and VALUE.__module__ == MODULE_NAME]
+	for NAME in NAMES:
+		setattr(MODULE, NAME, timeCalls(getattr(MODULE, NAME), KIND))
+
+timeModuleCalls(__name__, SLOW_CALL_READERS, 'reader')
+
+# the legacy globals are CoreModule properties, not module variables, so from Core import * needs them listed
+__all__ = [NAME for NAME in list(globals()) if not NAME.startswith('_')] + list(LEGACY_GLOBALS)
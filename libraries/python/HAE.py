@@ -23,12 +23,365 @@ High Availability Extension (HAE) clustering
 #  Authors/Contributors:
 #    Jason Record <jason.record@suse.com>
 #
-#  Modified: 2025 May 08
+#  Modified: 2026 Oct 19
 #
 ##############################################################################
 
 import re
+import copy
 import Core
+from xml.etree import ElementTree
+
+class CibModel(object):
+	"""
+	The cluster information base (CIB) from the cibadmin -Q output or the cib.xml file, parsed with an
+	incremental XML parser into indexed objects. Use getCibModel() to get the model for the current archive.
+
+	Variables
+	---------
+	valid = (Boolean) True if a <cib> element was parsed
+	connected = (Boolean) True if the model comes from the live cibadmin -Q output
+	source = (String) The ha.txt section the model was parsed from
+	attributes = (Dictionary) The <cib> tag attributes
+	nodes = (List of Dictionaries) <node> attributes and their nvpair name:value pairs, in CIB order
+	nodesById, nodesByUname = (Dictionary) Node dictionaries indexed by node id and uname
+	nodeStates = (Dictionary) Node id to the <node_state> tag attributes
+	resources = (List of Dictionaries) primitive, group, clone, master and bundle resources with keys
+		id, tag, class, provider, type, parent, attributes (instance_attributes) and meta (meta_attributes)
+	resourcesById = (Dictionary) Resource dictionaries indexed by id
+	constraints = (List of Dictionaries) Constraint tag attributes with the tag name under the tag key
+	propertySets = (Dictionary) cluster_property_set id to its nvpair name:value dictionary
+	"""
+	RESOURCE_TAGS = ('primitive', 'group', 'clone', 'master', 'bundle')
+
+	def __init__(self, SOURCE):
+		self.valid = False
+		self.connected = False
+		self.source = SOURCE
+		self.attributes = {}
+		self.nodes = []
+		self.nodesById = {}
+		self.nodesByUname = {}
+		self.nodeStates = {}
+		self.resources = []
+		self.resourcesById = {}
+		self.constraints = []
+		self.propertySets = {}
+
+	def getProperty(self, NAME, DEFAULT=None):
+		"""
+		Returns the cluster property NAME from the first cluster_property_set that defines it, or DEFAULT
+		"""
+		for PROPERTIES in self.propertySets.values():
+			if NAME in PROPERTIES:
+				return PROPERTIES[NAME]
+		return DEFAULT
+
+	def parse(self, CONTENT):
+		PARSER = ElementTree.XMLPullParser(events=('start', 'end'))
+		STACK = []
+		NODE = None
+		PROPERTY_SET = None
+		RESOURCES = []
+		ATTRIBUTES = None
+		STARTED = False
+		for LINE in CONTENT:
+			if not STARTED:
+				if not LINE.lstrip().startswith('<'):
+					continue
+				STARTED = True
+			try:
+				PARSER.feed(LINE + "\n")
+				EVENTS = list(PARSER.read_events())
+			except ElementTree.ParseError:
+				break
+			for (EVENT, ELEMENT) in EVENTS:
+				TAG = ELEMENT.tag
+				if( EVENT == 'start' ):
+					PARENT = STACK[-1] if STACK else ''
+					STACK.append(TAG)
+					if( TAG == 'cib' and len(STACK) == 1 ):
+						self.valid = True
+						self.attributes = dict(ELEMENT.attrib)
+					elif( TAG == 'node' and PARENT == 'nodes' ):
+						NODE = dict(ELEMENT.attrib)
+					elif( TAG == 'node_state' and PARENT == 'status' ):
+						self.nodeStates[ELEMENT.get('id', '')] = dict(ELEMENT.attrib)
+					elif( TAG == 'cluster_property_set' ):
+						PROPERTY_SET = self.propertySets.setdefault(ELEMENT.get('id', str(len(self.propertySets))), {})
+					elif( TAG in self.RESOURCE_TAGS and 'resources' in STACK ):
+						RESOURCE = {'id': ELEMENT.get('id', ''), 'tag': TAG, 'class': ELEMENT.get('class', ''), 'provider': ELEMENT.get('provider', ''), 'type': ELEMENT.get('type', ''), 'parent': RESOURCES[-1]['id'] if RESOURCES else '', 'attributes': {}, 'meta': {}}
+						self.resources.append(RESOURCE)
+						self.resourcesById[RESOURCE['id']] = RESOURCE
+						RESOURCES.append(RESOURCE)
+					elif( PARENT == 'constraints' ):
+						CONSTRAINT = dict(ELEMENT.attrib)
+						CONSTRAINT['tag'] = TAG
+						self.constraints.append(CONSTRAINT)
+					elif( TAG == 'instance_attributes' and RESOURCES and PARENT == RESOURCES[-1]['tag'] ):
+						ATTRIBUTES = RESOURCES[-1]['attributes']
+					elif( TAG == 'meta_attributes' and RESOURCES and PARENT == RESOURCES[-1]['tag'] ):
+						ATTRIBUTES = RESOURCES[-1]['meta']
+					elif( TAG == 'nvpair' ):
+						if NODE is not None:
+							NODE[ELEMENT.get('name', '')] = ELEMENT.get('value', '')
+						elif PROPERTY_SET is not None:
+							PROPERTY_SET[ELEMENT.get('name', '')] = ELEMENT.get('value', '')
+						elif ATTRIBUTES is not None:
+							ATTRIBUTES[ELEMENT.get('name', '')] = ELEMENT.get('value', '')
+				else:
+					STACK.pop()
+					if( TAG == 'node' and NODE is not None and STACK and STACK[-1] == 'nodes' ):
+						self.nodes.append(NODE)
+						if 'id' in NODE:
+							self.nodesById[NODE['id']] = NODE
+						if 'uname' in NODE:
+							self.nodesByUname[NODE['uname']] = NODE
+						NODE = None
+					elif( TAG == 'cluster_property_set' ):
+						PROPERTY_SET = None
+					elif( TAG in ('instance_attributes', 'meta_attributes') ):
+						ATTRIBUTES = None
+					elif( TAG in self.RESOURCE_TAGS and RESOURCES and RESOURCES[-1]['tag'] == TAG ):
+						RESOURCES.pop()
+					# the model keeps what it needs, release the parsed element
+					ELEMENT.clear()
+			if( self.valid and not STACK ):
+				break
+		return self.valid
+
+def buildCibModel(CIB_CONTENT, FILE_CONTENT):
+	CIB = CibModel('cibadmin -Q')
+	if( CIB.parse(CIB_CONTENT) ):
+		CIB.connected = True
+		return CIB
+	CIB = CibModel('cib.xml')
+	CIB.parse(FILE_CONTENT)
+	return CIB
+
+SBD_DUMP_SECTION = re.compile(r"/usr/sbin/sbd -d .* dump")
+SBD_SYSCONFIG_SECTION = re.compile(r"^/etc/sysconfig/sbd")
+SBD_INVALID = re.compile(r"Syntax", re.IGNORECASE)
+
+def parseSBDDump(SECTION_NAME, CONTENT):
+	IDX_PATH = 2
+	IDX_VALUE = 1
+	SBD_DICTIONARY = {
+		'Device': SECTION_NAME.split()[IDX_PATH].strip(),
+		'SBD_DEVICE': '',
+		'SBD_OPTS': '',
+		'Version': '',
+		'Slots': -1,
+		'Sector_Size': -1,
+		'Watchdog': -1,
+		'Allocate': -1,
+		'Loop': -1,
+		'MsgWait': -1,
+	}
+	for LINE in CONTENT:
+		if SBD_INVALID.search(LINE):
+			return None
+		elif LINE.startswith('Header'):
+			SBD_DICTIONARY['Version'] = LINE.split(':')[IDX_VALUE].strip()
+		elif LINE.startswith('Number'):
+			SBD_DICTIONARY['Slots'] = int(LINE.split(':')[IDX_VALUE].strip())
+		elif LINE.startswith('Sector'):
+			SBD_DICTIONARY['Sector_Size'] = int(LINE.split(':')[IDX_VALUE].strip())
+		elif "watchdog" in LINE:
+			SBD_DICTIONARY['Watchdog'] = int(LINE.split(':')[IDX_VALUE].strip())
+		elif "allocate" in LINE:
+			SBD_DICTIONARY['Allocate'] = int(LINE.split(':')[IDX_VALUE].strip())
+		elif "loop" in LINE:
+			SBD_DICTIONARY['Loop'] = int(LINE.split(':')[IDX_VALUE].strip())
+		elif "msgwait" in LINE:
+			SBD_DICTIONARY['MsgWait'] = int(LINE.split(':')[IDX_VALUE].strip())
+	return SBD_DICTIONARY
+
+def parseSBDSysconfig(CONTENT, CONFIG):
+	IDX_VALUE = 1
+	for LINE in CONTENT:
+		if LINE.startswith('SBD_DEVICE'):
+			CONFIG['SBD_DEVICE'] = re.sub("\n|\"|\'", '', LINE.split('=')[IDX_VALUE])
+		elif LINE.startswith('SBD_OPTS'):
+			CONFIG['SBD_OPTS'] = re.sub("\n|\"|\'", '', LINE.split('=')[IDX_VALUE])
+	return CONFIG
+
+def parseConfigCTDB(CONTENT):
+	IDX_KEY = 0
+	IDX_VALUE = 1
+	CONFIG = {}
+	for LINE in CONTENT:
+		if( len(LINE) > 0 ):
+			KEY = LINE.split('=')[IDX_KEY].strip().upper()
+			VALUE = re.sub(r'"|\'', '', LINE.split('=')[IDX_VALUE]).strip()
+			CONFIG.update({KEY:VALUE})
+	return CONFIG
+
+def parseConfigCorosync(CONTENT):
+	IDX_KEY = 0
+	IDX_VALUE = 1
+	COROSYNC = {}
+	inTag = False
+	inTotem = False
+	inNet = False
+	inMember = False
+	
+	if CONTENT:
+		TAG = re.compile(r"^\S+\s+{")
+		IFACE_ID = 'interface'
+		IFACE = re.compile(IFACE_ID + '\s+{', re.IGNORECASE)
+		MEMBER_ID = 'member'
+		MEMBER = re.compile(MEMBER_ID + '\s+{', re.IGNORECASE)
+		SKIP_LINE = re.compile(r"^#|^\s+$")
+		for LINE in CONTENT:
+			DATA = LINE.strip()
+			if SKIP_LINE.search(DATA):
+				continue
+			if inTotem:
+				if inNet:
+					if inMember:
+						if "}" in DATA:
+							NET_DICT[MEMBER_ID].append(dict(MEMBER_DICT))
+							inMember = False
+						elif ":" in DATA:
+							KEY = DATA.split(':')[IDX_KEY].strip()
+							VALUE = DATA.split(':')[IDX_VALUE].strip()
+							MEMBER_DICT.update({KEY:VALUE})
+					elif "}" in DATA:
+						COROSYNC[TAG_ID][IFACE_ID].append(dict(NET_DICT))
+						inNet = False
+					elif MEMBER.search(DATA):
+						inMember = True
+						MEMBER_DICT = {}
+					elif ":" in DATA:
+						KEY = DATA.split(':')[IDX_KEY].strip()
+						VALUE = DATA.split(':')[IDX_VALUE].strip()
+						NET_DICT.update({KEY:VALUE})
+				elif "}" in DATA:
+					COROSYNC[TAG_ID].update(dict(TAG_DICT))
+					inTotem = False
+				elif IFACE.search(DATA):
+					inNet = True
+					NET_DICT = {}
+					NET_DICT[MEMBER_ID] = []
+				elif ":" in DATA:
+					KEY = DATA.split(':')[IDX_KEY].strip()
+					VALUE = DATA.split(':')[IDX_VALUE].strip()
+					TAG_DICT.update({KEY:VALUE})
+			elif inTag:
+				if "}" in DATA:
+					COROSYNC[TAG_ID].update(dict(TAG_DICT))
+					inTag = False
+				elif ":" in DATA:
+					KEY = DATA.split(':')[IDX_KEY].strip()
+					VALUE = DATA.split(':')[IDX_VALUE].strip()
+					TAG_DICT.update({KEY:VALUE})
+			elif TAG.search(DATA):
+				TAG_ID = DATA.split()[IDX_KEY]
+				COROSYNC[TAG_ID] = {}
+				TAG_DICT = {}
+				if "totem" in DATA:
+					inTotem = True
+					COROSYNC[TAG_ID][IFACE_ID] = []
+				else:
+					inTag = True
+
+	return COROSYNC
+
+class HaeSnapshot(object):
+	"""
+	Everything the HAE helpers read from ha.txt, gathered with a single pass over the file. Each relevant
+	section is handed to its parser as the pass reaches it. Use getHaeSnapshot() to get the snapshot for the
+	current archive.
+
+	Variables
+	---------
+	sections = (List) The ha.txt section names in file order
+	enabled = (Boolean) True if a corosync.conf section exists
+	sbd = (List of Dictionaries) Valid sbd dump partitions, see getSBDInfo
+	sbdConfig = (Dictionary) SBD_DEVICE and SBD_OPTS from /etc/sysconfig/sbd
+	corosync = (Dictionary) The parsed corosync.conf, see getConfigCorosync
+	ctdb = (Dictionary) The parsed /etc/sysconfig/ctdb, see getConfigCTDB
+	cib = (CibModel) The cibadmin -Q or cib.xml model, see getCibModel
+	"""
+	def __init__(self):
+		self.sections = []
+		self.enabled = False
+		self.sbd = []
+		self.sbdConfig = {'SBD_DEVICE': '', 'SBD_OPTS': ''}
+		self.corosync = {}
+		self.ctdb = {}
+		self.cib = None
+
+def loadHaeSnapshot():
+	SNAPSHOT = HaeSnapshot()
+	FIRST = {}
+	SECTIONS = {
+		'corosync': re.compile(r"corosync.conf"),
+		'ctdb': re.compile(r"/etc/sysconfig/ctdb"),
+		'sbdconfig': SBD_SYSCONFIG_SECTION,
+		'cib': re.compile(r"cibadmin -Q"),
+		'cibfile': re.compile(r"cib.xml$"),
+	}
+	for (SECTION_NAME, CONTENT) in Core.iterSections('ha.txt'):
+		SNAPSHOT.sections.append(SECTION_NAME)
+		if "corosync.conf" in SECTION_NAME:
+			SNAPSHOT.enabled = True
+		if SBD_DUMP_SECTION.search(SECTION_NAME):
+			SBD_DICTIONARY = parseSBDDump(SECTION_NAME, CONTENT)
+			if SBD_DICTIONARY is not None:
+				SNAPSHOT.sbd.append(SBD_DICTIONARY)
+		for KEY in SECTIONS:
+			# the first section matching each name wins, the same as Core.getSection
+			if KEY not in FIRST and CONTENT and SECTIONS[KEY].search(SECTION_NAME):
+				FIRST[KEY] = CONTENT
+
+	parseSBDSysconfig(FIRST.get('sbdconfig', []), SNAPSHOT.sbdConfig)
+	for SBD_DICTIONARY in SNAPSHOT.sbd:
+		SBD_DICTIONARY.update(SNAPSHOT.sbdConfig)
+	SNAPSHOT.corosync = parseConfigCorosync(FIRST.get('corosync', []))
+	SNAPSHOT.ctdb = parseConfigCTDB(FIRST.get('ctdb', []))
+	SNAPSHOT.cib = buildCibModel(FIRST.get('cib', []), FIRST.get('cibfile', []))
+	return SNAPSHOT
+
+def getHaeSnapshot():
+	"""
+	Gets the HAE snapshot of ha.txt. The file is read once per archive and every HAE helper is a view of the
+	snapshot, so patterns may call any number of them without rescanning ha.txt.
+
+	Args:		None
+	Returns:	HaeSnapshot instance
+	Example:
+
+	HA = HAE.getHaeSnapshot()
+	if( HA.enabled and not HA.sbd ):
+		Core.updateStatus(Core.WARN, "No valid SBD partitions found")
+	else:
+		Core.updateStatus(Core.IGNORE, "SBD partitions found or cluster disabled")
+	"""
+	return Core.getArchiveCache('HAE.Snapshot', loadHaeSnapshot)
+
+def getCibModel():
+	"""
+	Gets the cluster information base model from the cibadmin -Q output, or from cib.xml if the node is not
+	connected to the cluster. The model is part of the HAE snapshot and is shared by haeConnected,
+	getNodeInfo and getClusterConfig.
+
+	Args:		None
+	Returns:	CibModel instance
+	Example:
+
+	CIB = HAE.getCibModel()
+	STOPPED = []
+	for RESOURCE in CIB.resources:
+		if( RESOURCE['meta'].get('target-role', '').lower() == 'stopped' ):
+			STOPPED.append(RESOURCE['id'])
+	if( STOPPED ):
+		Core.updateStatus(Core.WARN, "Resources configured as stopped: " + " ".join(STOPPED))
+	else:
+		Core.updateStatus(Core.IGNORE, "No resources configured as stopped")
+	"""
+	return getHaeSnapshot().cib
 
 def haeEnabled():
 	"""
@@ -43,15 +396,7 @@ def haeEnabled():
 	else:
 		Core.updateStatus(Core.WARN, "HAE Cluster disabled")
 	"""
-	FILE_OPEN = 'ha.txt'
-	CONTENT = {}
-
-	if Core.listSections(FILE_OPEN, CONTENT):
-		for LINE in CONTENT:
-#			print CONTENT[LINE]
-			if "corosync.conf" in CONTENT[LINE]:
-				return True
-	return False
+	return getHaeSnapshot().enabled
 
 def haeConnected():
 	"""
@@ -66,15 +411,7 @@ def haeConnected():
 	else:
 		Core.updateStatus(Core.WARN, "Node is disconnected, start HAE cluster services")
 	"""
-	FILE_OPEN = 'ha.txt'
-	SECTION = 'cibadmin -Q'
-	CONTENT = {}
-	if Core.getSection(FILE_OPEN, SECTION, CONTENT):
-		CONNECTED = re.compile(r'<cib.*epoch=')
-		for LINE in CONTENT:
-			if CONNECTED.search(CONTENT[LINE]):
-				return True
-	return False
+	return getCibModel().connected
 
 def getSBDInfo():
 	"""
@@ -106,111 +443,11 @@ def getSBDInfo():
 	else:
 		Core.updateStatus(Core.IGNORE, "The msgwait is sufficient")
 	"""
-	SBD_LIST = []
-	SBD_DICTIONARY = { 
-		'Device': '',
-		'SBD_DEVICE': '',
-		'SBD_OPTS': '',
-		'Version': '',
-		'Slots': -1,
-		'Sector_Size': -1,
-		'Watchdog': -1,
-		'Allocate': -1,
-		'Loop': -1,
-		'MsgWait': -1,
-	}
-	FILE_OPEN = "ha.txt"
-	CONTENT = {}
-	IDX_PATH = 3
-	IDX_VALUE = 1
-	SYSCONFIG_FOUND = False
-	DUMP_FOUND = False
-
-	try:
-		FILE = open(Core.path + "/" + FILE_OPEN, "rt", errors="ignore")
-	except Exception as error:
-#		print "Error opening file: %s" % error
-		Core.updateStatus(Core.ERROR, "ERROR: Cannot open " + FILE_OPEN)
-
-	SBD_PATH = ''
-	SBD_DEVICE = ''
-	SBD_OPTS = ''
-	DUMPCMD = re.compile(r"/usr/sbin/sbd -d .* dump")
-	SYSCONFIG = re.compile(r"^# /etc/sysconfig/sbd")
-	INVALID = re.compile(r"Syntax", re.IGNORECASE)
-	for LINE in FILE:
-		if DUMP_FOUND:
-#			print "Dump: " + str(LINE)
-			if "#==[" in LINE:
-				DUMP_FOUND = False
-				#append SBD_DICTIONARY to SBD_LIST
-				SBD_DICTIONARY['Device'] = SBD_PATH
-				SBD_DICTIONARY['SBD_DEVICE'] = SBD_DEVICE
-				SBD_DICTIONARY['SBD_OPTS'] = SBD_OPTS
-				SBD_LIST.append(dict(SBD_DICTIONARY))
-#				print "SBD_DICTIONARY = " + str(SBD_DICTIONARY)
-				SBD_PATH = ''
-				SBD_DICTIONARY = { 
-					'Device': '',
-					'SBD_DEVICE': '',
-					'SBD_OPTS': '',
-					'Version': '',
-					'Slots': -1,
-					'Sector_Size': -1,
-					'Watchdog': -1,
-					'Allocate': -1,
-					'Loop': -1,
-					'MsgWait': -1,
-				}
-			elif INVALID.search(LINE):
-				DUMP_FOUND = False
-				SBD_PATH = ''
-				SBD_DICTIONARY = { 
-					'Device': '',
-					'SBD_DEVICE': '',
-					'SBD_OPTS': '',
-					'Version': '',
-					'Slots': -1,
-					'Sector_Size': -1,
-					'Watchdog': -1,
-					'Allocate': -1,
-					'Loop': -1,
-					'MsgWait': -1,
-				}
-			elif LINE.startswith('Header'):
-				SBD_DICTIONARY['Version'] = LINE.split(':')[IDX_VALUE].strip()
-			elif LINE.startswith('Number'):
-				SBD_DICTIONARY['Slots'] = int(LINE.split(':')[IDX_VALUE].strip())
-			elif LINE.startswith('Sector'):
-				SBD_DICTIONARY['Sector_Size'] = int(LINE.split(':')[IDX_VALUE].strip())
-			elif "watchdog" in LINE:
-				SBD_DICTIONARY['Watchdog'] = int(LINE.split(':')[IDX_VALUE].strip())
-			elif "allocate" in LINE:
-				SBD_DICTIONARY['Allocate'] = int(LINE.split(':')[IDX_VALUE].strip())
-			elif "loop" in LINE:
-				SBD_DICTIONARY['Loop'] = int(LINE.split(':')[IDX_VALUE].strip())
-			elif "msgwait" in LINE:
-				SBD_DICTIONARY['MsgWait'] = int(LINE.split(':')[IDX_VALUE].strip())				
-		elif SYSCONFIG_FOUND:
-			if "#==[" in LINE:
-				SYSCONFIG_FOUND = False
-			elif LINE.startswith('SBD_DEVICE'):
-				SBD_DEVICE = re.sub("\n|\"|\'", '', LINE.split('=')[IDX_VALUE])
-			elif LINE.startswith('SBD_OPTS'):
-				SBD_OPTS = re.sub("\n|\"|\'", '', LINE.split('=')[IDX_VALUE])
-		elif SYSCONFIG.search(LINE):
-			SYSCONFIG_FOUND = True
-		elif DUMPCMD.search(LINE):
-			SBD_PATH = LINE.split()[IDX_PATH].strip()
-			DUMP_FOUND = True
-
-#	print "SBD_LIST Size = " + str(len(SBD_LIST))
-#	print "SBD_LIST = " + str(SBD_LIST) + "\n"
-	return SBD_LIST
+	return [dict(SBD_DICTIONARY) for SBD_DICTIONARY in getHaeSnapshot().sbd]
 
 def getNodeInfo():
 	"""
-	Gets cluster node information from the cibadmin -Q output or cib.xml if the node is not connected to the cluster. It includes information from the <node> and <node_state> tags. Only key/value pairs within the <node_state> tag itself are included, not tags below <node_state>.
+	Gets cluster node information from the cibadmin -Q output or cib.xml if the node is not connected to the cluster. It includes information from the <node> and <node_state> tags. Only key/value pairs within the <node_state> tag itself are included, not tags below <node_state>. This is a view of getCibModel().
 
 	Args:		None
 	Returns:	List of Node Dictionaries with keys
@@ -229,113 +466,18 @@ def getNodeInfo():
 	else:
 		Core.updateStatus(Core.IGNORE, "Node(s) in standby mode: None")
 	"""
-	IDX_KEY = 0
-	IDX_VALUE = 1
+	CIB = getCibModel()
 	NODES = []
-	NODE = {}
-	FILE_OPEN = 'ha.txt'
-	CONTENT = {}
-	inNode = False
-	endNode = re.compile(r'/>$')
-	if Core.getSection(FILE_OPEN, 'cibadmin -Q', CONTENT):
-		for LINE in CONTENT:
-			DATA = CONTENT[LINE].strip()
-			if "</nodes>" in DATA:
-				break
-			elif inNode:
-				if "</node>" in DATA:
-					NODES.append(dict(NODE))
-					NODE = {}
-					inNode = False
-				elif "<nvpair" in CONTENT[LINE]:
-					PARTS = re.sub(r'^<nvpair|/>$|>$|"', '', DATA).strip().split()
-#					print "cibadmin PARTS = " + str(PARTS)
-					KEY = ''
-					VALUE = ''
-					for I in range(0, len(PARTS)):
-						if "name" in PARTS[I].lower():
-							KEY = PARTS[I].split("=")[IDX_VALUE]
-						elif "value" in PARTS[I].lower():
-							VALUE = re.sub(r'/>.*$', '', PARTS[I].split("=")[IDX_VALUE])
-					NODE.update({KEY:VALUE})
-			elif "<node " in DATA:
-				inNode = True
-				if endNode.search(DATA):
-					inNode = False
-				PARTS = re.sub(r'^<node|/>$|>$|"', '', DATA).strip().split()
-#				print "cibadmin PARTS = " + str(PARTS)
-				KEY = ''
-				VALUE = ''
-				for I in range(0, len(PARTS)):
-					KEY = PARTS[I].split("=")[IDX_KEY]
-					VALUE = PARTS[I].split("=")[IDX_VALUE]
-					NODE.update({KEY:VALUE})
-				if not inNode:
-					NODES.append(dict(NODE))
-					NODE = {}
-		# Add node state information on connected nodes
-		for LINE in CONTENT:
-			if "<node_state " in CONTENT[LINE]:
-				NODE_STATE = {}
-				PARTS = re.sub(r'<node_state|/>$|>$|"', '', CONTENT[LINE]).strip().split()
-#				print "cibadmin PARTS = " + str(PARTS)
-				KEY = ''
-				VALUE = ''
-				for I in range(0, len(PARTS)):
-					KEY = PARTS[I].split("=")[IDX_KEY]
-					VALUE = PARTS[I].split("=")[IDX_VALUE]
-					NODE_STATE.update({KEY:VALUE})
-				for I in range(0, len(NODES)):
-					if( NODES[I]['id'] == NODE_STATE['id'] ):
-						NODES[I].update(NODE_STATE)
-						break
-
-	if( len(NODES) == 0 ):
-		if Core.getSection(FILE_OPEN, 'cib.xml$', CONTENT):
-			for LINE in CONTENT:
-				DATA = CONTENT[LINE].strip()
-				if "</nodes>" in DATA:
-					break
-				elif inNode:
-					if "</node>" in DATA:
-						NODES.append(dict(NODE))
-						NODE = {}
-						inNode = False
-					elif "<nvpair" in CONTENT[LINE]:
-						PARTS = re.sub(r'^<nvpair|/>$|>$|"', '', DATA).strip().split()
-#						print "cib.xml PARTS = " + str(PARTS)
-						KEY = ''
-						VALUE = ''
-						for I in range(0, len(PARTS)):
-							if "name" in PARTS[I].lower():
-								KEY = PARTS[I].split("=")[IDX_VALUE]
-							elif "value" in PARTS[I].lower():
-								VALUE = re.sub(r'/>.*$', '', PARTS[I].split("=")[IDX_VALUE])
-						NODE.update({KEY:VALUE})
-				elif "<node " in DATA:
-					inNode = True
-					if endNode.search(DATA):
-						inNode = False
-					PARTS = re.sub(r'^<node|/>$|>$|"', '', DATA).strip().split()
-#					print "cib.xml PARTS = " + str(PARTS)
-					KEY = ''
-					VALUE = ''
-					for I in range(0, len(PARTS)):
-						KEY = PARTS[I].split("=")[IDX_KEY]
-						VALUE = PARTS[I].split("=")[IDX_VALUE]
-						NODE.update({KEY:VALUE})
-					if not inNode:
-						NODES.append(dict(NODE))
-						NODE = {}
-		
-#	print "NODES = " + str(len(NODES))
-#	for I in range(0, len(NODES)):
-#		print "NODE[" + str(I) + "] =  " + str(NODES[I]) + "\n"
+	for NODE in CIB.nodes:
+		NODE = dict(NODE)
+		if NODE.get('id') in CIB.nodeStates:
+			NODE.update(CIB.nodeStates[NODE['id']])
+		NODES.append(NODE)
 	return NODES
 
 def getClusterConfig():
 	"""
-	Gets cluster configuration information from the cibadmin -Q output or cib.xml if the node is not connected to the cluster. It includes information from the <cib> and <cluster_property_set> tags.
+	Gets cluster configuration information from the cibadmin -Q output or cib.xml if the node is not connected to the cluster. It includes information from the <cib> and the first <cluster_property_set> tags. This is a view of getCibModel().
 
 	Args:		None
 	Returns:	Dictionary with keys
@@ -352,79 +494,11 @@ def getClusterConfig():
 	else:
 		Core.updateStatus(Core.WARN, "Stonith is disabled by default for the cluster")
 	"""
-	IDX_VALUE = 1
-	CLUSTER = {}
-	FILE_OPEN = 'ha.txt'
-	CONTENT = {}
-	inBootStrap = False
-	if Core.getSection(FILE_OPEN, 'cibadmin -Q', CONTENT):
-		for LINE in CONTENT:
-			if inBootStrap:
-				if "</cluster_property_set>" in CONTENT[LINE]:
-					inBootStrap = False
-					break
-				elif "<nvpair" in CONTENT[LINE]:
-					PARTS = CONTENT[LINE].replace('"', '').strip().split()
-#					print "cibadmin PARTS = " + str(PARTS)
-					KEY = ''
-					VALUE = ''
-					for I in range(0, len(PARTS)):
-						if "name" in PARTS[I].lower():
-							KEY = PARTS[I].split("=")[IDX_VALUE]
-						elif "value" in PARTS[I].lower():
-							VALUE = re.sub(r'/>.*$', '', PARTS[I].split("=")[IDX_VALUE])
-					CLUSTER.update({KEY:VALUE})
-			elif "<cluster_property_set" in CONTENT[LINE]:
-				inBootStrap = True
-				CLUSTER.update({'connected-to-cluster':True})
-			elif "<cib " in CONTENT[LINE]:
-				PARTS = re.sub(r'<cib|>', '', CONTENT[LINE]).strip().split('"')
-				if( len(PARTS[-1]) == 0 ):
-					del(PARTS[-1])
-#				print "cibadmin PARTS = " + str(PARTS)
-				key = re.compile("=$")
-				for I in range(0, len(PARTS)):
-					if key.search(PARTS[I]):
-						KEY_STR = PARTS[I].strip().strip('=')
-					else:
-						CLUSTER.update({KEY_STR:PARTS[I].strip()})
-
-	if( len(CLUSTER) == 0 ):
-		#The node is not connected to the cluster, so get the information from the cib.xml file
-		if Core.getSection(FILE_OPEN, 'cib.xml$', CONTENT):
-			for LINE in CONTENT:
-				if inBootStrap:
-					if "</cluster_property_set>" in CONTENT[LINE]:
-						inBootStrap = False
-						break
-					elif "<nvpair" in CONTENT[LINE]:
-						PARTS = CONTENT[LINE].replace('"', '').strip().split()
-#						print "cib.xml PARTS = " + str(PARTS)
-						KEY = ''
-						VALUE = ''
-						for I in range(0, len(PARTS)):
-							if "name" in PARTS[I].lower():
-								KEY = PARTS[I].split("=")[IDX_VALUE]
-							elif "value" in PARTS[I].lower():
-								VALUE = re.sub(r'/>.*$', '', PARTS[I].split("=")[IDX_VALUE])
-						CLUSTER.update({KEY:VALUE})
-				elif "<cluster_property_set" in CONTENT[LINE]:
-					inBootStrap = True
-					CLUSTER.update({'connected-to-cluster':False})
-				elif "<cib " in CONTENT[LINE]:
-					PARTS = re.sub(r'<cib|>', '', CONTENT[LINE]).strip().split('"')
-					if( len(PARTS[-1]) == 0 ):
-						del(PARTS[-1])
-#					print "cib.xml PARTS = " + str(PARTS)
-					key = re.compile(r"=$")
-					for I in range(0, len(PARTS)):
-						if key.search(PARTS[I]):
-							KEY_STR = PARTS[I].strip().strip('=')
-						else:
-							CLUSTER.update({KEY_STR:PARTS[I].strip()})
-
-#	print "CLUSTER Size = " + str(len(CLUSTER))
-#	print "CLUSTER =      " + str(CLUSTER)
+	CIB = getCibModel()
+	CLUSTER = dict(CIB.attributes)
+	if( CIB.propertySets ):
+		CLUSTER.update({'connected-to-cluster':CIB.connected})
+		CLUSTER.update(list(CIB.propertySets.values())[0])
 	return CLUSTER
 
 def getConfigCTDB():
@@ -445,22 +519,7 @@ def getConfigCTDB():
 	else:
 		Core.updateStatus(Core.ERROR, "Missing CTDB_START_AS_DISABLED, ignoring test")
 	"""
-	IDX_KEY = 0
-	IDX_VALUE = 1
-	CONFIG = {}
-	FILE_OPEN = 'ha.txt'
-	SECTION = "/etc/sysconfig/ctdb"
-	CONTENT = {}
-	if Core.getSection(FILE_OPEN, SECTION, CONTENT):
-		for LINE in CONTENT:
-			if( len(CONTENT[LINE]) > 0 ):
-				KEY = CONTENT[LINE].split('=')[IDX_KEY].strip().upper()
-				VALUE = re.sub(r'"|\'', '', CONTENT[LINE].split('=')[IDX_VALUE]).strip()
-				CONFIG.update({KEY:VALUE})
-
-#	print "CONFIG Size = " + str(len(CONFIG))
-#	print "CONFIG =      " + str(CONFIG)
-	return CONFIG
+	return dict(getHaeSnapshot().ctdb)
 
 def getConfigCorosync():
 	"""
@@ -487,93 +546,6 @@ def getConfigCorosync():
 	else:
 		Core.updateStatus(Core.IGNORE, "All Corosync Bind Addresses are Unique")
 	"""
-	IDX_KEY = 0
-	IDX_VALUE = 1
-	COROSYNC = {}
-	FILE_OPEN = 'ha.txt'
-	SECTION = 'corosync.conf'
-	CONTENT = {}
-	inTag = False
-	inTotem = False
-	inNet = False
-	inMember = False
-	
-	if Core.getSection(FILE_OPEN, SECTION, CONTENT):
-		TAG = re.compile(r"^\S+\s+{")
-		IFACE_ID = 'interface'
-		IFACE = re.compile(IFACE_ID + '\s+{', re.IGNORECASE)
-		MEMBER_ID = 'member'
-		MEMBER = re.compile(MEMBER_ID + '\s+{', re.IGNORECASE)
-		SKIP_LINE = re.compile(r"^#|^\s+$")
-		for LINE in CONTENT:
-			DATA = CONTENT[LINE].strip()
-			if SKIP_LINE.search(DATA):
-				continue
-			if inTotem:
-				if inNet:
-					if inMember:
-						if "}" in DATA:
-							NET_DICT[MEMBER_ID].append(dict(MEMBER_DICT))
-							inMember = False
-						elif ":" in DATA:
-							KEY = DATA.split(':')[IDX_KEY].strip()
-							VALUE = DATA.split(':')[IDX_VALUE].strip()
-							MEMBER_DICT.update({KEY:VALUE})
-					elif "}" in DATA:
-						COROSYNC[TAG_ID][IFACE_ID].append(dict(NET_DICT))
-						inNet = False
-					elif MEMBER.search(DATA):
-						inMember = True
-						MEMBER_DICT = {}
-					elif ":" in DATA:
-						KEY = DATA.split(':')[IDX_KEY].strip()
-						VALUE = DATA.split(':')[IDX_VALUE].strip()
-						NET_DICT.update({KEY:VALUE})
-				elif "}" in DATA:
-					COROSYNC[TAG_ID].update(dict(TAG_DICT))
-					inTotem = False
-				elif IFACE.search(DATA):
-					inNet = True
-					NET_DICT = {}
-					NET_DICT[MEMBER_ID] = []
-				elif ":" in DATA:
-					KEY = DATA.split(':')[IDX_KEY].strip()
-					VALUE = DATA.split(':')[IDX_VALUE].strip()
-					TAG_DICT.update({KEY:VALUE})
-			elif inTag:
-				if "}" in DATA:
-					COROSYNC[TAG_ID].update(dict(TAG_DICT))
-					inTag = False
-				elif ":" in DATA:
-					KEY = DATA.split(':')[IDX_KEY].strip()
-					VALUE = DATA.split(':')[IDX_VALUE].strip()
-					TAG_DICT.update({KEY:VALUE})
-			elif TAG.search(DATA):
-				TAG_ID = DATA.split()[IDX_KEY]
-				COROSYNC[TAG_ID] = {}
-				TAG_DICT = {}
-				if "totem" in DATA:
-					inTotem = True
-					COROSYNC[TAG_ID][IFACE_ID] = []
-				else:
-					inTag = True
-
-	# print the data structure for debugging purposes
-#	for X in COROSYNC:
-#		for Y in COROSYNC[X]:
-#			if 'interface' in Y:
-#				for I in range(0, len(COROSYNC[X][Y])):
-#					for Z in COROSYNC[X][Y][I]:
-#						print ("COROSYNC[" + X + "][" + Y + "][" + str(I) + "][" + Z + "] : " + str(COROSYNC[X][Y][I][Z]))
-#			else:
-#				print ("COROSYNC[" + X + "][" + Y + "] : " + str(COROSYNC[X][Y]))
-
-	return COROSYNC
-
-
-
-
-
-
-
+	return copy.deepcopy(getHaeSnapshot().corosync)
 
+Core.timeModuleCalls(__name__)
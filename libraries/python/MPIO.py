@@ -22,7 +22,7 @@ Library of python functions used when dealing with issues incident to MPIO
 #  Authors/Contributors:
 #     Jason Record (jrecord@suse.com)
 #
-#  Modified: 2025 May 08
+#  Modified: 2026 Oct 19
 #
 ##############################################################################
 
@@ -45,14 +45,7 @@ def devicesManaged():
 		Core.updateStatus(Core.WARNG, "No MPIO Disks are being managed")
 
 	"""
-	FILE_OPEN = "mpio.txt"
-	SECTION = "multipath -ll"
-	CONTENT = []
-	if Core.getRegExSection(FILE_OPEN, SECTION, CONTENT):
-		for LINE in CONTENT:
-			if '-+-' in LINE:
-				return True
-	return False
+	return getMultipathTopology().managed
 
 def convertKeyValue(STR_TO_CONVERT):
 	CONVERTED = {}
@@ -101,52 +94,122 @@ def convertKeyValue(STR_TO_CONVERT):
 	return CONVERTED
 
 
-def getManagedDevices():
+def readOnly(*ARGS, **KWARGS):
+	raise TypeError("The multipath topology is shared by all patterns of the archive and cannot be changed, use copy.deepcopy for a changeable copy")
+
+class ReadOnlyDict(dict):
 	"""
-	Normalizes the multipath -ll output into a list of dictionaries. The multipath -ll output looks similar to:
-	#==[ Command ]======================================#
-	# /sbin/multipath -ll
-	mpathe (3600601609e003700bd875493d3ade411) dm-2 DGC,VRAID
-	size=1.0T features='1 queue_if_no_path' hwhandler='1 emc' wp=rw
-	|-+- policy='round-robin 0' prio=4 status=active
-	| |- 2:0:1:4 sdai 66:32  active ready running
-	| `- 1:0:1:4 sdo  8:224  active ready running
-	`-+- policy='round-robin 0' prio=1 status=enabled
-		|- 1:0:0:4 sde  8:64   active ready running
-		`- 2:0:0:4 sdy  65:128 active ready running
+	A multipath map or path dictionary of the shared topology. Copies and pickles are plain dictionaries.
+	"""
+	__setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = readOnly
 
-	Args: None
-	Returns: List of Dictionaries
+	def __reduce__(self):
+		return (dict, (dict(self),))
 
-	Example:
-	Though the order of the elements will be different that shown. These are ordered to demonstrate the key value pairs. 
-	getManagedDevices would return a list of dictionaries for the example above as follows:
+class ReadOnlyList(list):
+	"""
+	The devicepath list of a shared multipath map. Copies and pickles are plain lists.
+	"""
+	__setitem__ = __delitem__ = append = extend = insert = remove = pop = clear = sort = reverse = __iadd__ = __imul__ = readOnly
 
-	[	{'alias': 'mpathe', 'wwid': '3600601609e003700bd875493d3ade411', 'dmdev': 'dm-2', 'description': 'DGC,VRAID', 
-		'size': '1.0T', 'features': '1 queue_if_no_path', 'hwhandler': '1 emc', 'wp': 'rw', 
-		'devicepath': 
-		[	{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'active', 'path_devnode': 'sdai', 'path_group_prio': '4', 'dm_status': 'ready', 'path_major_minor': '66:32', 'path_scsi_addr': '2:0:1:4', 'path_status': 'active'}, 
-			{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'active', 'path_devnode': 'sdo', 'path_group_prio': '4', 'dm_status': 'ready', 'path_major_minor': '8:224', 'path_scsi_addr': '1:0:1:4', 'path_status': 'active'}, 
-			{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'enabled', 'path_devnode': 'sde', 'path_group_prio': '1', 'dm_status': 'ready', 'path_major_minor': '8:64', 'path_scsi_addr': '1:0:0:4', 'path_status': 'active'}, 
-			{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'enabled', 'path_devnode': 'sdy', 'path_group_prio': '1', 'dm_status': 'ready', 'path_major_minor': '65:128', 'path_scsi_addr': '2:0:0:4', 'path_status': 'active'}
-		]
-	}]
+	def __reduce__(self):
+		return (list, (list(self),))
 
+class ManagedDeviceList(list):
 	"""
-	FILE_OPEN = "mpio.txt"
-	SECTION = "multipath -ll"
-	CONTENT = []
-	DEVICES = []
-	IN_DEVICE = False
-	MPATH = {}
-	ENTRIES = []
-	DeviceStart = re.compile(r" dm-\d+ ")
-	DeviceEntry = re.compile(r"\d+:\d+:\d+:\d+\s+\D+\s+\d+:\d+", re.IGNORECASE)
-	if Core.getRegExSection(FILE_OPEN, SECTION, CONTENT):
+	The getManagedDevices list, a copy of the topology map list. It remembers its topology so
+	partitionManagedDevice can use the indexes until the list is changed.
+	"""
+	def __init__(self, TOPOLOGY):
+		list.__init__(self, TOPOLOGY.devices)
+		self.topology = TOPOLOGY
+		self.modified = False
+
+	def __reduce__(self):
+		return (list, (list(self),))
+
+def modifies(METHOD):
+	def modifying(self, *ARGS, **KWARGS):
+		self.modified = True
+		return METHOD(self, *ARGS, **KWARGS)
+	return modifying
+
+for METHOD_NAME in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert', 'remove', 'pop', 'clear'):
+	setattr(ManagedDeviceList, METHOD_NAME, modifies(getattr(list, METHOD_NAME)))
+del METHOD_NAME
+
+class MultipathTopology(object):
+	"""
+	The multipath -ll output of mpio.txt parsed once into multipath maps with hash indexes. Use
+	getMultipathTopology() to get the topology for the current archive.
+
+	Variables
+	---------
+	managed = (Boolean) True if any multipath -ll line has a -+- path group, see devicesManaged
+	devices = (List of Dictionaries) The multipath maps in getManagedDevices format
+	byWwid, byAlias, byDm = (Dictionary) wwid, alias and dm-N to the map dictionary
+	byDevnode = (Dictionary) Path device node (sdX) to the map dictionary
+	byScsiAddr = (Dictionary) SCSI address (H:C:T:L) to the path dictionary
+	noPartitions = (Dictionary) wwid to True if the map has the no_partitions feature, False otherwise
+
+	The topology is shared by every pattern of the archive, so its map and path dictionaries are ReadOnlyDict and
+	the devicepath lists ReadOnlyList instances. Changing them raises TypeError, copy.deepcopy returns plain
+	dictionaries and lists.
+	"""
+	def __init__(self):
+		self.managed = False
+		self.devices = []
+		self.byWwid = {}
+		self.byAlias = {}
+		self.byDm = {}
+		self.byDevnode = {}
+		self.byScsiAddr = {}
+		self.noPartitions = {}
+		self._partitionable = set()
+
+	def add(self, MPATH):
+		MPATH['devicepath'] = ReadOnlyList([ReadOnlyDict(LUN_PATH) for LUN_PATH in MPATH['devicepath']])
+		MPATH = ReadOnlyDict(MPATH)
+		self.devices.append(MPATH)
+		self.byWwid[MPATH['wwid']] = MPATH
+		if MPATH['alias']:
+			self.byAlias[MPATH['alias']] = MPATH
+		self.byDm[MPATH['dmdev']] = MPATH
+		NO_PARTITIONS = "no_partitions" in MPATH.get('features', '')
+		self.noPartitions[MPATH['wwid']] = NO_PARTITIONS
+		if not NO_PARTITIONS:
+			self._partitionable.add(MPATH['wwid'])
+		for LUN_PATH in MPATH['devicepath']:
+			self.byDevnode[LUN_PATH['path_devnode']] = MPATH
+			self.byScsiAddr[LUN_PATH['path_scsi_addr']] = LUN_PATH
+			if not NO_PARTITIONS:
+				self._partitionable.add(LUN_PATH['path_devnode'])
+
+	def getMap(self, ID):
+		"""
+		Returns the read only multipath map dictionary for a wwid, alias, dm-N or path device node, or None
+		"""
+		for INDEX in (self.byWwid, self.byAlias, self.byDm, self.byDevnode):
+			if ID in INDEX:
+				return INDEX[ID]
+		return None
+
+	def partitionManaged(self, DISK_ID):
+		"""
+		Returns True if DISK_ID is the wwid or a path device node of a map without no_partitions
+		"""
+		return DISK_ID in self._partitionable
+
+	def parse(self, CONTENT):
+		MPATH = {}
+		PATH_GROUP_VALUES = {}
+		DeviceStart = re.compile(r" dm-\d+ ")
+		DeviceEntry = re.compile(r"\d+:\d+:\d+:\d+\s+\D+\s+\d+:\d+", re.IGNORECASE)
+		PATH_KEYS = ("path_scsi_addr", "path_devnode", "path_major_minor", "path_status", "dm_status", "path_state")
 		for LINE in CONTENT:
 			if DeviceStart.search(LINE):
 				if( len(MPATH) > 1 ):
-					DEVICES.append(dict(MPATH))
+					self.add(MPATH)
 				MPATH = {'devicepath': []}
 				PARTS = LINE.split()
 				PATH_GROUP_VALUES = {}
@@ -163,55 +226,203 @@ def getManagedDevices():
 					del PARTS[0:2]
 					MPATH['description'] = ' '.join(PARTS)
 			elif "size=" in LINE:
-				KEY_VALUES = convertKeyValue(LINE)
-				MPATH.update(KEY_VALUES)
+				MPATH.update(convertKeyValue(LINE))
 			elif '-+-' in LINE:
-				D = convertKeyValue(LINE)
-				#print "==Insert path_group_", D
-				PATH_GROUP_VALUES = {}
+				self.managed = True
 				# prepend "path_group_" before each PATH_GROUP_VALUES key
-				for KEY in list(D.keys()):
-					NEW_KEY = "path_group_" + str(KEY)
-					PATH_GROUP_VALUES[NEW_KEY] = D[KEY]
-					#print "KEY", KEY
-					#print "NEW_KEY", NEW_KEY
-					#print "RESULT:", PATH_GROUP_VALUES, "\n"
-				del D
-			elif DeviceEntry.search(LINE):
+				PATH_GROUP_VALUES = {}
+				for KEY, VALUE in convertKeyValue(LINE).items():
+					PATH_GROUP_VALUES["path_group_" + str(KEY)] = VALUE
+			elif DeviceEntry.search(LINE) and 'devicepath' in MPATH:
 				TMP = LINE.split()
-				ENTRIES = {}
 				while TMP[0].startswith(('|','`')):
 					del TMP[0]
-				COUNT = len(TMP)
-				if( TMP > 5 ):
-					ENTRIES = {"path_scsi_addr": TMP[0], "path_devnode": TMP[1], "path_major_minor": TMP[2], "path_status": TMP[3], "dm_status": TMP[4], "path_state": TMP[5]}
-				elif( TMP > 4 ):
-					ENTRIES = {"path_scsi_addr": TMP[0], "path_devnode": TMP[1], "path_major_minor": TMP[2], "path_status": TMP[3], "dm_status": TMP[4]}
-				elif( TMP > 3 ):
-					ENTRIES = {"path_scsi_addr": TMP[0], "path_devnode": TMP[1], "path_major_minor": TMP[2], "path_status": TMP[3]}
-				elif( TMP > 2 ):
-					ENTRIES = {"path_scsi_addr": TMP[0], "path_devnode": TMP[1], "path_major_minor": TMP[2]}
-				else:
-					ENTRIES = {"path_scsi_addr": TMP[0], "path_devnode": TMP[1]}
+				ENTRIES = dict(zip(PATH_KEYS, TMP))
 				if( PATH_GROUP_VALUES ):
 					ENTRIES.update(PATH_GROUP_VALUES)
 				MPATH['devicepath'].append(ENTRIES)
 		if( len(MPATH) > 1 ):
-			DEVICES.append(dict(MPATH))
-
-		#print "\n=============\n"
-		#for I in range(len(DEVICES)):
-			#print "\nDEVICES[" + str(I) + "] ="
-			#for X in DEVICES[I]:
-				#if ( "devicepath" == X ):
-					#print " {0:12} = ".format(X)
-					#for Y in DEVICES[I][X]:
-						#print "  ", Y
-				#else:
-					#print " {0:12} = {1}".format(X, DEVICES[I][X])
-		#print "\n"
-
-	return DEVICES
+			self.add(MPATH)
+
+def loadMultipathTopology():
+	TOPOLOGY = MultipathTopology()
+	CONTENT = []
+	if Core.getRegExSection("mpio.txt", "multipath -ll", CONTENT):
+		TOPOLOGY.parse(CONTENT)
+	return TOPOLOGY
+
+def getMultipathTopology():
+	"""
+	Gets the multipath topology from the multipath -ll output. mpio.txt is parsed once per archive, and
+	getManagedDevices, partitionManagedDevice and devicesManaged are views of the topology.
+
+	Args: None
+	Returns: MultipathTopology instance
+
+	Example:
+	TOPOLOGY = MPIO.getMultipathTopology()
+	MPATH = TOPOLOGY.getMap('mpathe')
+	if MPATH is not None and len(MPATH['devicepath']) < 2:
+		Core.updateStatus(Core.WARN, "Multipath device mpathe has a single path")
+	else:
+		Core.updateStatus(Core.IGNORE, "Multipath device mpathe is missing or redundant")
+
+	"""
+	return Core.getArchiveCache('MPIO.Topology', loadMultipathTopology)
+
+def getManagedDevices():
+	"""
+	Normalizes the multipath -ll output into a list of dictionaries. The multipath -ll output looks similar to:
+	#==[ Command ]======================================#
+	# /sbin/multipath -ll
+	mpathe (3600601609e003700bd875493d3ade411) dm-2 DGC,VRAID
+	size=1.0T features='1 queue_if_no_path' hwhandler='1 emc' wp=rw
+	|-+- policy='round-robin 0' prio=4 status=active
+	| |- 2:0:1:4 sdai 66:32  active ready running
+	| `- 1:0:1:4 sdo  8:224  active ready running
+	`-+- policy='round-robin 0' prio=1 status=enabled
+		|- 1:0:0:4 sde  8:64   active ready running
+		`- 2:0:0:4 sdy  65:128 active ready running
+
+	Args: None
+	Returns: List of Dictionaries, a ManagedDeviceList of the read only getMultipathTopology() maps
+
+	Example:
+	Though the order of the elements will be different that shown. These are ordered to demonstrate the key value pairs. 
+	getManagedDevices would return a list of dictionaries for the example above as follows:
+
+	[	{'alias': 'mpathe', 'wwid': '3600601609e003700bd875493d3ade411', 'dmdev': 'dm-2', 'description': 'DGC,VRAID', 
+		'size': '1.0T', 'features': '1 queue_if_no_path', 'hwhandler': '1 emc', 'wp': 'rw', 
+		'devicepath': 
+		[	{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'active', 'path_devnode': 'sdai', 'path_group_prio': '4', 'dm_status': 'ready', 'path_major_minor': '66:32', 'path_scsi_addr': '2:0:1:4', 'path_status': 'active'}, 
+			{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'active', 'path_devnode': 'sdo', 'path_group_prio': '4', 'dm_status': 'ready', 'path_major_minor': '8:224', 'path_scsi_addr': '1:0:1:4', 'path_status': 'active'}, 
+			{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'enabled', 'path_devnode': 'sde', 'path_group_prio': '1', 'dm_status': 'ready', 'path_major_minor': '8:64', 'path_scsi_addr': '1:0:0:4', 'path_status': 'active'}, 
+			{'path_group_policy': 'round-robin 0', 'path_state': 'running', 'path_group_status': 'enabled', 'path_devnode': 'sdy', 'path_group_prio': '1', 'dm_status': 'ready', 'path_major_minor': '65:128', 'path_scsi_addr': '2:0:0:4', 'path_status': 'active'}
+		]
+	}]
+
+	"""
+	return ManagedDeviceList(getMultipathTopology())
+
+class UdevDevice(object):
+	"""
+	One udevadm info -e record
+	"""
+	__slots__ = ('path', 'name', 'symlinks', 'properties')
+
+	def __init__(self, PATH):
+		self.path = PATH
+		self.name = PATH.split('/')[-1]
+		self.symlinks = []
+		self.properties = {}
+
+class DiskIndex(object):
+	"""
+	The /dev/disk symlinks and the udev database of mpio.txt, parsed once into dictionaries. Use getDiskIndex()
+	to get the index for the current archive.
+
+	Variables
+	---------
+	links = (Dictionary) /dev/disk symlink path to the target device name, like /dev/disk/by-id/dm-name-mpathe:dm-2
+	linksByName = (Dictionary) Symlink file name to the target device name, like dm-name-mpathe:dm-2
+	linksBySuffix = (Dictionary) Every ending of every symlink file name to the target device name, the last
+		symlink in the listing wins like the line scan of getDiskID did
+	udev = (Dictionary) Kernel device name to its UdevDevice, like dm-2
+	udevByPath = (Dictionary) udev device path to its UdevDevice, like /devices/virtual/block/dm-2
+	"""
+	def __init__(self):
+		self.links = {}
+		self.linksByName = {}
+		self.linksBySuffix = {}
+		self.udev = {}
+		self.udevByPath = {}
+
+	def parseLinks(self, CONTENT):
+		DIRECTORY = ''
+		for LINE in CONTENT:
+			if LINE.endswith(':') and LINE.startswith('/'):
+				DIRECTORY = LINE[:-1]
+			elif ' -> ' in LINE:
+				(LINK, TARGET) = LINE.rsplit(' -> ', 1)
+				NAME = LINK.split()[-1]
+				TARGET = TARGET.strip().split('/')[-1]
+				self.links[DIRECTORY + '/' + NAME] = TARGET
+				self.linksByName[NAME] = TARGET
+				for START in range(len(NAME)):
+					self.linksBySuffix[NAME[START:]] = TARGET
+
+	def parseUdev(self, CONTENT):
+		DEVICE = None
+		for LINE in CONTENT:
+			if LINE.startswith('P: '):
+				DEVICE = UdevDevice(LINE[3:].strip())
+				self.udevByPath[DEVICE.path] = DEVICE
+				self.udev[DEVICE.name] = DEVICE
+			elif DEVICE is None:
+				continue
+			elif LINE.startswith('E: '):
+				(KEY, _, VALUE) = LINE[3:].partition('=')
+				DEVICE.properties[KEY] = VALUE
+			elif LINE.startswith('S: '):
+				DEVICE.symlinks.append(LINE[3:].strip())
+			elif LINE.startswith('N: '):
+				NAME = LINE[3:].strip()
+				if NAME != DEVICE.name:
+					self.udev[NAME] = DEVICE
+
+	def resolve(self, DEVICE_PATH):
+		"""
+		Returns the device name of the last /dev/disk symlink whose file name ends with the DEVICE_PATH file
+		name, or an empty string
+		"""
+		NAME = DEVICE_PATH.split('/')[-1]
+		if not NAME:
+			return ''
+		return self.linksBySuffix.get(NAME, '')
+
+	def getProperty(self, DEVICE_NAME, KEY, DEFAULT=''):
+		"""
+		Returns the udev property KEY, like DM_NAME or ID_SERIAL, of the kernel device DEVICE_NAME
+		"""
+		DEVICE = self.udev.get(DEVICE_NAME)
+		if DEVICE is None:
+			return DEFAULT
+		return DEVICE.properties.get(KEY, DEFAULT)
+
+def loadDiskIndex():
+	INDEX = DiskIndex()
+	LINKS = re.compile(r"ls -lR.*/dev/disk/")
+	UDEV = re.compile(r"/udevadm info -e")
+	FOUND_LINKS = False
+	FOUND_UDEV = False
+	for (SECTION_NAME, CONTENT) in Core.iterSections('mpio.txt'):
+		if not FOUND_LINKS and CONTENT and LINKS.search(SECTION_NAME):
+			INDEX.parseLinks(CONTENT)
+			FOUND_LINKS = True
+		elif not FOUND_UDEV and CONTENT and UDEV.search(SECTION_NAME):
+			INDEX.parseUdev(CONTENT)
+			FOUND_UDEV = True
+		if FOUND_LINKS and FOUND_UDEV:
+			break
+	return INDEX
+
+def getDiskIndex():
+	"""
+	Gets the /dev/disk symlink and udev database index. mpio.txt is read once per archive, so resolving many
+	disks with getDiskID is a dictionary lookup per disk.
+
+	Args: None
+	Returns: DiskIndex instance
+
+	Example:
+	DISKS = MPIO.getDiskIndex()
+	if DISKS.getProperty('dm-2', 'DM_NAME'):
+		Core.updateStatus(Core.IGNORE, "dm-2 is a device mapper device")
+	else:
+		Core.updateStatus(Core.WARN, "dm-2 has no device mapper name")
+
+	"""
+	return Core.getArchiveCache('MPIO.DiskIndex', loadDiskIndex)
 
 def getDiskID(DEVICE_PATH):
 	"""
@@ -219,50 +430,33 @@ def getDiskID(DEVICE_PATH):
 	Returns and sd disk device without partition numbers or a wwid
 	"""
 	ID = ''
-	DEV = DEVICE_PATH.split("/")[-1] + " "
+	DEV = DEVICE_PATH.split("/")[-1]
 	Digits = re.compile(r"\d+")
-	#print "Evaluate", DEV
 	if DEV.startswith("sd"): #check for system device name in the form sd? because they are easy to find
 		ID = re.sub(Digits, "", DEV)
 	else:
-		CONTENT = []
-		UDEV_CONTENT = []
-		if Core.getRegExSection('mpio.txt', 'ls -lR.*/dev/disk/', CONTENT): #find out how the xen config device is symbolically linked
-			for LINE in CONTENT:
-				if DEV in LINE: #found the symlink for the xen device
-					#print " ", LINE
-					LINKED_DEV = LINE.split()[-1].split("/")[-1] #just get the last part of the linked path after the last /
-					#print " ", LINKED_DEV
-					if LINKED_DEV.startswith("sd"): #the symlink was linked to a system device
-						ID = re.sub(Digits, "", LINKED_DEV)
-					else:
-						Core.getRegExSection('mpio.txt', '/udevadm info -e', UDEV_CONTENT)
-						BlockDev = re.compile(fr"^P:\s+/devices/virtual/block/{LINKED_DEV})
-						EndBlockDev = re.compile(r'^$')
-						IN_DEV = False
-						for UDEV_LINE in UDEV_CONTENT:
-							if( IN_DEV ):
-								if EndBlockDev.search(UDEV_LINE):
-									IN_DEV = False
-								elif "DM_NAME=" in UDEV_LINE:
-									ID = UDEV_LINE.split("=")[-1]
-									IN_DEV = False
-									break
-							elif BlockDev.search(UDEV_LINE):
-								IN_DEV = True
-	#print " ", ID, "\n"
+		DISKS = getDiskIndex()
+		LINKED_DEV = DISKS.resolve(DEVICE_PATH) #find out how the xen config device is symbolically linked
+		if LINKED_DEV.startswith("sd"): #the symlink was linked to a system device
+			ID = re.sub(Digits, "", LINKED_DEV)
+		elif LINKED_DEV:
+			ID = DISKS.getProperty(LINKED_DEV, 'DM_NAME')
 	return ID.strip()
 
 def partitionManagedDevice(DISK_ID, MPIO_DEVS):
 	"""
 	Checks if the DISK_ID is present in the MPIO_DEVS or multipath devices that do not have a no_partitions feature.
 	Returns True if the DISK_ID is managed without no_partitions or False if it is not managed or if no_partitions is found on the wwid.
+	MPIO_DEVS returned by getManagedDevices and not changed since are checked with the topology indexes instead
+	of walking every path.
 	"""
+	if isinstance(MPIO_DEVS, ManagedDeviceList) and not MPIO_DEVS.modified:
+		return MPIO_DEVS.topology.partitionManaged(DISK_ID)
 	#print "\nChecking '" + str(DISK_ID) + "' in:"
 	for MPIO in MPIO_DEVS:
 		#print MPIO['wwid'], "or", MPIO['device']
 		#print MPIO['features']
-		if "no_partitions" in MPIO['features']:
+		if "no_partitions" in MPIO.get('features', ''):
 			#print " IGNORED: no_partitions found"
 			continue
 		elif( DISK_ID == MPIO['wwid'] ):
@@ -276,4 +470,4 @@ def partitionManagedDevice(DISK_ID, MPIO_DEVS):
 					return True
 	return False
 
-
+Core.timeModuleCalls(__name__)
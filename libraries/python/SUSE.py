@@ -23,13 +23,16 @@ Library of functions for creating python patterns specific to SUSE
 #    Jason Record (jason.record@suse.com)
 #    David Hamner (ke7oxh@gmail.com)
 #
-#  Modified: 2025 May 08
+#  Modified: 2026 Oct 19
 #  Version:  1.0.3
 #
 ##############################################################################
 
 import re
+import sys
+import copy
 import Core
+import sca_model
 from Core import path
 import datetime
 import ast
@@ -144,9 +147,153 @@ def getRpmInfo(PackageName):
 #	print "getRpmInfo: rpmInfo    = " + str(rpmInfo)
 	return rpmInfo
 
+PATCH_SECTIONS = ['zypper --non-interactive --no-gpg-checks patches', '/rug pch']
+
+class PatchRecord(object):
+	"""
+	One row of the 'zypper patches' or 'rug pch' table in updates.txt. Repeated column values are interned, so
+	a patch table with thousands of rows stays small in memory.
+
+	Variables
+	---------
+	Catalog, Name, Version, Category, Status = (String) The patch table columns
+	Installed = (Boolean) True if the patch is installed or applied, otherwise False
+	versionKey = (Tuple) The Version converted with Core.getVersionKey for ordering
+	line = (String) The original updates.txt line used for search_name matching
+	"""
+	__slots__ = ('Catalog', 'Name', 'Version', 'Category', 'Status', 'Installed', 'versionKey', 'line')
+
+	def __init__(self, LINE, FIELDS):
+		self.Catalog = sys.intern(FIELDS[0])
+		self.Name = sys.intern(FIELDS[1])
+		self.Version = FIELDS[2]
+		self.Category = sys.intern(FIELDS[3])
+		self.Status = sys.intern(FIELDS[4])
+		self.Installed = ( self.Status == "Installed" or self.Status == "Applied" )
+		self.versionKey = Core.getVersionKey(self.Version)
+		self.line = LINE
+
+	def asDict(self):
+		"""
+		Returns the record as a PatchInfo.patchlist dictionary
+		"""
+		return {'Catalog': self.Catalog, 'Name': self.Name, 'Version': self.Version, 'Category': self.Category, 'Status': self.Status, 'Installed': self.Installed}
+
+class PatchStore(object):
+	"""
+	The patch table from updates.txt parsed once per archive and indexed by patch name and category. Use
+	getPatchStore() to get the store for the current archive.
+
+	Variables
+	---------
+	valid = (Boolean) True if a patch table section was found in updates.txt, otherwise False
+	records = (List of PatchRecords) Every patch row in file order
+	byName = (Dictionary) Patch name to the list of its PatchRecords
+	byCategory = (Dictionary) Patch category to the list of its PatchRecords
+	statusCount = (Dictionary) Patch status to the number of rows with that status
+	nameStatusCount = (Dictionary) Patch name to a dictionary of status counts for that name
+
+	Example:
+
+	PATCHES = SUSE.getPatchStore()
+	NEEDED = PATCHES.statusCount.get('Needed', 0)
+	if( NEEDED > 0 ):
+		Core.updateStatus(Core.WARN, "Patches needed: " + str(NEEDED))
+	else:
+		Core.updateStatus(Core.IGNORE, "No patches needed")
+	"""
+	def __init__(self):
+		self.valid = False
+		self.records = []
+		self.byName = {}
+		self.byCategory = {}
+		self.statusCount = {}
+		self.nameStatusCount = {}
+		self.searches = {}
+
+	def add(self, LINE):
+		FIELDS = re.sub(r"\s+", "", LINE).split("|")
+		if( len(FIELDS) < 5 ):
+			return
+		elif( FIELDS[1] == "Name" and FIELDS[4] == "Status" ): # table header
+			return
+		RECORD = PatchRecord(LINE, FIELDS)
+		self.records.append(RECORD)
+		self.byName.setdefault(RECORD.Name, []).append(RECORD)
+		self.byCategory.setdefault(RECORD.Category, []).append(RECORD)
+		self.statusCount[RECORD.Status] = self.statusCount.get(RECORD.Status, 0) + 1
+		NAME_COUNT = self.nameStatusCount.setdefault(RECORD.Name, {})
+		NAME_COUNT[RECORD.Status] = NAME_COUNT.get(RECORD.Status, 0) + 1
+
+	def find(self, search_name):
+		"""
+		Returns the name of the first patch whose table row matches the search_name regular expression, ignoring
+		case, or '' if none match. Results are remembered per search_name.
+		"""
+		if search_name not in self.searches:
+			PATCH_NAME = ''
+			PATCH = re.compile(search_name, re.IGNORECASE)
+			for RECORD in self.records:
+				if PATCH.search(RECORD.line):
+					PATCH_NAME = RECORD.Name
+					break
+			self.searches[search_name] = PATCH_NAME
+		return self.searches[search_name]
+
+	def getLast(self, PATCH_NAME, STATUSES):
+		"""
+		Returns the PatchRecord with the highest version among the PATCH_NAME rows in one of the STATUSES, or None
+		"""
+		LAST = None
+		for RECORD in self.byName.get(PATCH_NAME, []):
+			if RECORD.Status in STATUSES:
+				if( LAST is None or RECORD.versionKey > LAST.versionKey ):
+					LAST = RECORD
+		return LAST
+
+def loadPatchStore():
+	STORE = PatchStore()
+	SECTION_TAGS = [re.compile(SECTION) for SECTION in PATCH_SECTIONS]
+	FOUND = [None] * len(PATCH_SECTIONS)
+	for SECTION_NAME, CONTENT in Core.iterSections("updates.txt"):
+		if not CONTENT:
+			continue
+		for I in range(len(SECTION_TAGS)):
+			if( FOUND[I] is None and SECTION_TAGS[I].search(SECTION_NAME) ):
+				FOUND[I] = CONTENT
+		if FOUND[0] is not None:
+			break
+	for CONTENT in FOUND:
+		if CONTENT is not None:
+			STORE.valid = True
+			for LINE in CONTENT:
+				STORE.add(LINE)
+			break
+	return STORE
+
+def getPatchStore():
+	"""
+	Returns the PatchStore for the current archive. The updates.txt patch table is parsed the first time it is
+	requested and the store is shared by all PatchInfo instances.
+
+	Args:		None
+	Returns:	PatchStore instance
+	Example:
+
+	PATCHES = SUSE.getPatchStore()
+	SECURITY = PATCHES.byCategory.get('security', [])
+	MISSING = [RECORD.Name for RECORD in SECURITY if RECORD.Status == 'Needed']
+	if( MISSING ):
+		Core.updateStatus(Core.WARN, "Missing security patches: " + " ".join(sorted(set(MISSING))))
+	else:
+		Core.updateStatus(Core.IGNORE, "Security patches applied")
+	"""
+	return Core.getArchiveCache('SUSE.PatchStore', loadPatchStore)
+
 class PatchInfo:
 	"""
 	A class to retrieve patch information by patch name. The first patch name that matches the search string will be used for the patch information.
+	PatchInfo is a view over the archive PatchStore, so creating many instances does not rescan updates.txt.
 
 	Variables
 	---------
@@ -191,78 +338,41 @@ class PatchInfo:
 		self.patch_name = ''
 		self.patch_count = 0
 		self.installed = False
-		self.all_installed = True
+		self.all_installed = False
 		self.needed = False
 		self.valid = False
 		self.patchlist = []
-		# populate the patchlist
-		PATCH_DICTIONARY = {}
-		FILE_OPEN = "updates.txt"
-		SECTIONS = ['zypper --non-interactive --no-gpg-checks patches', '/rug pch']
-		CONTENT = {}
-		PATCH = re.compile(self.search_name, re.IGNORECASE)
-		for SECTION in SECTIONS:
-#			print "Check section: " + str(SECTION)
-			if Core.getSection(FILE_OPEN, SECTION, CONTENT):
-				for LINE in CONTENT:
-					if PATCH.search(CONTENT[LINE]):
-#						print CONTENT[LINE]
-						PATCH_ARRAY = re.sub(r"\s+", "", CONTENT[LINE]).split("|")
-						PATCH_DICTIONARY['Catalog'] = PATCH_ARRAY[0]
-						PATCH_DICTIONARY['Name'] = PATCH_ARRAY[1]
-						PATCH_DICTIONARY['Version'] = PATCH_ARRAY[2]
-						PATCH_DICTIONARY['Category'] = PATCH_ARRAY[3]
-						PATCH_DICTIONARY['Status'] = PATCH_ARRAY[4]
-						if( PATCH_DICTIONARY['Status'] == "Installed" or PATCH_DICTIONARY['Status'] == "Applied" ):
-							PATCH_DICTIONARY['Installed'] = True
-							self.installed = True
-						elif( PATCH_DICTIONARY['Status'] == "Needed" ):
-							PATCH_DICTIONARY['Installed'] = False
-							self.needed = True
-							self.all_installed = False
-						else:
-							PATCH_DICTIONARY['Installed'] = False
-							self.all_installed = False
-#						print "  " + str(PATCH_DICTIONARY)
-						self.patchlist.append(dict(PATCH_DICTIONARY))
-						if( len(self.patch_name) == 0 ):
-							self.patch_name = PATCH_DICTIONARY['Name']
-							PATCH = re.compile(fr"\|\s+{self.patch_name}\s+\|")
-				self.valid = True
-				self.patch_count = len(self.patchlist)
-#				print "Total Patches: " + str(self.patch_count) + "\n"
-				break
-
-		if( self.patch_count == 0 ):
-			self.installed = False
-			self.all_installed = False
-			self.needed = False
+		self.store = getPatchStore()
+		self.valid = self.store.valid
+		if( self.valid ):
+			self.patch_name = self.store.find(self.search_name)
+		if( self.patch_name ):
+			RECORDS = self.store.byName[self.patch_name]
+			STATUS_COUNT = self.store.nameStatusCount[self.patch_name]
+			INSTALLED_COUNT = STATUS_COUNT.get("Installed", 0) + STATUS_COUNT.get("Applied", 0)
+			self.patchlist = [RECORD.asDict() for RECORD in RECORDS]
+			self.patch_count = len(RECORDS)
+			self.installed = ( INSTALLED_COUNT > 0 )
+			self.all_installed = ( INSTALLED_COUNT == self.patch_count )
+			self.needed = ( STATUS_COUNT.get("Needed", 0) > 0 )
 
 	def getLastInstalled(self):
 		"""
 		Returns a dictionary of the last installed patch in the patch_name set based on the version string
 		"""
-		VER = 0
-		PATCH_FOUND = {}
-		for PATCH in self.patchlist:
-			if( PATCH['Status'] == "Installed" or PATCH['Status'] == "Applied" ):
-				if( PATCH['Version'] > VER ):
-					VER = PATCH['Version']
-					PATCH_FOUND = PATCH
-		return PATCH_FOUND
+		RECORD = self.store.getLast(self.patch_name, ("Installed", "Applied"))
+		if RECORD is None:
+			return {}
+		return RECORD.asDict()
 
 	def getLastNeeded(self):
 		"""
 		Returns a dictionary of the last needed patch in the patch_name set based on the version string
 		"""
-		VER = 0
-		PATCH_FOUND = {}
-		for PATCH in self.patchlist:
-			if( PATCH['Status'] == "Needed" ):
-				if( PATCH['Version'] > VER ):
-					VER = PATCH['Version']
-					PATCH_FOUND = PATCH
-		return PATCH_FOUND
+		RECORD = self.store.getLast(self.patch_name, ("Needed",))
+		if RECORD is None:
+			return {}
+		return RECORD.asDict()
 
 	def debugPatchDisplay(self):
 		"""
@@ -280,6 +390,181 @@ class PatchInfo:
 		print("PatchInfo.all_installed " + str(self.all_installed))
 		print("PatchInfo.needed        " + str(self.needed))
 
+DRIVER_KEYS = [ 'filename', 'version', 'license', 'description', 'srcversion', 'supported', 'vermagic' ]
+# the module licenses the kernel treats as GPL compatible, see license_is_gpl_compatible() in include/linux/license.h
+GPL_COMPATIBLE_LICENSES = [ 'GPL', 'GPL v2', 'GPL and additional rights', 'Dual BSD/GPL', 'Dual MIT/GPL', 'Dual MPL/GPL' ]
+
+class ModuleInfo(object):
+	"""
+	A kernel module record built from the lsmod and modinfo sections of modules.txt.
+
+	Variables
+	---------
+	name = (String) The kernel module name
+	loaded = (Boolean) True if the module is listed by lsmod or has a modinfo section
+	size = (Int) Module size from lsmod, -1 if unknown
+	usedBy = (List) Modules using this module according to lsmod
+	useCount = (Int) Use count from lsmod, -1 if unknown
+	filename, version, license, description, srcversion, supported, vermagic = (String) modinfo values
+	intree = (Boolean) True if modinfo reports the module as in-tree
+	signed = (Boolean) True if modinfo reports a module signer
+	supportReported = (Boolean) True if modinfo has a supported field
+	taints = (String) Kernel taint letters the module causes when loaded: P license not GPL compatible,
+		O out-of-tree, E unsigned, X externally supported, N unsupported. E is only set when modinfo reports
+		signers for the archive and X and N only when the module has a supported field.
+	"""
+	__slots__ = ('name', 'loaded', 'size', 'useCount', 'usedBy', 'filename', 'version', 'license', 'description', 'srcversion', 'supported', 'vermagic', 'intree', 'signed', 'supportReported', 'taints', 'hasInfo')
+
+	def __init__(self, NAME):
+		self.name = NAME
+		self.loaded = False
+		self.size = -1
+		self.useCount = -1
+		self.usedBy = []
+		self.filename = ''
+		self.version = ''
+		self.license = ''
+		self.description = ''
+		self.srcversion = ''
+		self.supported = 'no'
+		self.vermagic = ''
+		self.intree = False
+		self.signed = False
+		self.supportReported = False
+		self.taints = ''
+		self.hasInfo = False
+
+	def addInfo(self, CONTENT):
+		SIGNER = False
+		for LINE in CONTENT:
+			(KEY, SEPARATOR, VALUE) = LINE.partition(':')
+			if not SEPARATOR:
+				continue
+			KEY = KEY.strip()
+			if KEY in DRIVER_KEYS:
+				setattr(self, KEY, ' '.join(VALUE.split()))
+				if( KEY == 'supported' ):
+					self.supportReported = True
+			elif( KEY == 'intree' ):
+				self.intree = ( VALUE.strip().upper() == 'Y' )
+			elif( KEY == 'signer' or KEY == 'sig_key' ):
+				SIGNER = True
+		self.hasInfo = True
+		self.loaded = True
+		self.signed = SIGNER
+		self.vermagic = sys.intern(self.vermagic)
+		self.supported = sys.intern(self.supported)
+		self.setTaints(False)
+
+	def setTaints(self, SIGNERS_REPORTED):
+		"""
+		Derives taints from the modinfo values. SIGNERS_REPORTED is True when modinfo reports a signer for any
+		module of the archive, otherwise a missing signer does not tell the module is unsigned.
+		"""
+		TAINTS = ''
+		if( self.license and self.license not in GPL_COMPATIBLE_LICENSES ):
+			TAINTS += 'P'
+		if not self.intree:
+			TAINTS += 'O'
+		if( SIGNERS_REPORTED and not self.signed ):
+			TAINTS += 'E'
+		if self.supportReported:
+			if( self.supported == 'external' ):
+				TAINTS += 'X'
+			elif( self.supported != 'yes' ):
+				TAINTS += 'N'
+		self.taints = TAINTS
+
+	def asDict(self):
+		"""
+		Returns the record as a getDriverInfo dictionary
+		"""
+		DRIVER_DICTIONARY = { 'name': self.name, 'loaded': self.loaded }
+		for KEY in DRIVER_KEYS:
+			DRIVER_DICTIONARY[KEY] = getattr(self, KEY)
+		return DRIVER_DICTIONARY
+
+class ModuleIndex(object):
+	"""
+	All kernel modules from modules.txt indexed by name. Names are matched with dashes and underscores
+	treated the same, like modprobe does. Use getModuleIndex() to get the index for the current archive.
+
+	Variables
+	---------
+	modules = (Dictionary) Normalized module name to ModuleInfo record
+	vermagic = (Dictionary) vermagic string to the list of module names built with it
+	"""
+	def __init__(self):
+		self.modules = {}
+		self.vermagic = {}
+
+	def normalize(self, NAME):
+		return NAME.replace('-', '_')
+
+	def add(self, NAME):
+		KEY = self.normalize(NAME)
+		if KEY not in self.modules:
+			self.modules[KEY] = ModuleInfo(NAME)
+		return self.modules[KEY]
+
+	def get(self, NAME):
+		"""
+		Returns the ModuleInfo record for NAME or None if the module is unknown
+		"""
+		return self.modules.get(self.normalize(NAME))
+
+	def getTainting(self):
+		"""
+		Returns the list of loaded ModuleInfo records that taint the kernel
+		"""
+		return [MODULE for MODULE in self.modules.values() if MODULE.loaded and MODULE.hasInfo and MODULE.taints]
+
+def loadModuleIndex():
+	INDEX = ModuleIndex()
+	MODINFO = re.compile(r"modinfo\s+(\S+)\s*$")
+	for SECTION_NAME, CONTENT in Core.iterSections("modules.txt"):
+		if "lsmod" in SECTION_NAME:
+			for LINE in CONTENT:
+				PARTS = LINE.split()
+				if( len(PARTS) < 3 or not PARTS[1].isdigit() ):
+					continue
+				MODULE = INDEX.add(PARTS[0])
+				MODULE.loaded = True
+				MODULE.size = int(PARTS[1])
+				MODULE.useCount = int(PARTS[2]) if PARTS[2].isdigit() else -1
+				if( len(PARTS) > 3 ):
+					MODULE.usedBy = [USER for USER in PARTS[3].split(',') if USER and USER != '[permanent]']
+		elif "modinfo" in SECTION_NAME and CONTENT:
+			NAME = MODINFO.search(SECTION_NAME)
+			if NAME is None:
+				continue
+			MODULE = INDEX.add(NAME.group(1))
+			if not MODULE.hasInfo:
+				MODULE.addInfo(CONTENT)
+				INDEX.vermagic.setdefault(MODULE.vermagic, []).append(MODULE.name)
+	if any(MODULE.signed for MODULE in INDEX.modules.values()):
+		for MODULE in INDEX.modules.values():
+			if MODULE.hasInfo:
+				MODULE.setTaints(True)
+	return INDEX
+
+def getModuleIndex():
+	"""
+	Returns the ModuleIndex of all kernel modules in modules.txt. The file is parsed once per archive.
+
+	Args:		None
+	Returns:	ModuleIndex instance
+	Example:
+
+	MODULES = SUSE.getModuleIndex()
+	TAINTING = MODULES.getTainting()
+	if( TAINTING ):
+		Core.updateStatus(Core.WARN, "Modules tainting the kernel: " + " ".join([MODULE.name for MODULE in TAINTING]))
+	else:
+		Core.updateStatus(Core.IGNORE, "No modules taint the kernel")
+	"""
+	return Core.getArchiveCache('SUSE.ModuleIndex', loadModuleIndex)
+
 def getDriverInfo( DRIVER_NAME ):
 	"""
 	Gets information about the specified kernel driver
@@ -304,27 +589,37 @@ def getDriverInfo( DRIVER_NAME ):
 	else:
 		Core.updateStatus(STATUS_WARNING, "Package " + RPM_INFO['name'] + str(RPM_INFO['version']) + " is missing, install it")
 	"""
-	FILE_OPEN = "modules.txt"
-	SECTION = "modinfo " + DRIVER_NAME
-	DRIVER_KEYS_MISSING = [ 'filename', 'version', 'license', 'description', 'srcversion', 'supported', 'vermagic' ]
-	DRIVER_DICTIONARY = { 'name': DRIVER_NAME, 'loaded': True, DRIVER_KEYS_MISSING[0]: '', DRIVER_KEYS_MISSING[1]: '', DRIVER_KEYS_MISSING[2]: '', DRIVER_KEYS_MISSING[3]: '', DRIVER_KEYS_MISSING[4]: '', DRIVER_KEYS_MISSING[5]: 'no', DRIVER_KEYS_MISSING[6]: '' }
-	CONTENT = {}
-	# Get the module's information section in modules.txt.
-	if Core.getSection(FILE_OPEN, SECTION, CONTENT):
-		for LINE in CONTENT:
-			for KEY in DRIVER_KEYS_MISSING:
-				# find and extract module key/value pairs
-				if CONTENT[LINE].startswith(KEY + ": "):
-					ELEMENTS = CONTENT[LINE].split()
-					# remove the key from the key/value pair
-					del ELEMENTS[0]
-					# assign the value to the dictionary key
-					DRIVER_DICTIONARY[KEY] = ' '.join(ELEMENTS)
-	else:
+	MODULE = getModuleIndex().get(DRIVER_NAME)
+	if MODULE is None:
 		# supportconfig only get module information for loaded modules
-		DRIVER_DICTIONARY['loaded'] = False
+		MODULE = ModuleInfo(DRIVER_NAME)
+	DRIVER_DICTIONARY = MODULE.asDict()
+	DRIVER_DICTIONARY['name'] = DRIVER_NAME
 	return DRIVER_DICTIONARY
 
+def getDriverInfoList( DRIVER_NAMES ):
+	"""
+	Gets information about each kernel driver in DRIVER_NAMES with one lookup in the module index per driver
+
+	Args:		DRIVER_NAMES (List) - The kernel driver names on which you want details
+	Returns:	Dictionary of DRIVER_NAME to the getDriverInfo dictionary for that driver
+	Example:
+
+	DRIVERS = SUSE.getDriverInfoList(['qla2xxx', 'lpfc', 'bnx2x'])
+	UNSUPPORTED = []
+	for DRIVER in DRIVERS:
+		if( DRIVERS[DRIVER]['loaded'] and DRIVERS[DRIVER]['supported'] != 'yes' ):
+			UNSUPPORTED.append(DRIVER)
+	if( UNSUPPORTED ):
+		Core.updateStatus(Core.WARN, "Unsupported drivers loaded: " + " ".join(UNSUPPORTED))
+	else:
+		Core.updateStatus(Core.IGNORE, "All loaded drivers are supported")
+	"""
+	DRIVERS = {}
+	for DRIVER_NAME in DRIVER_NAMES:
+		DRIVERS[DRIVER_NAME] = getDriverInfo(DRIVER_NAME)
+	return DRIVERS
+
 def getServiceInfo(SERVICE_NAME):
 	"""
 	Returns a dictionary of system service information for SERVICE_NAME
@@ -463,6 +758,30 @@ def getServiceInfo(SERVICE_NAME):
 #	print "getServiceInfo: SERVICE_INFO = " + str(SERVICE_INFO)
 	return SERVICE_INFO
 
+def getSystemdUnitIndex():
+	"""
+	Returns a dictionary of every systemd unit in systemd.txt keyed by unit name. Each value is the dictionary
+	of that unit's systemctl show output, the same as getServiceDInfo returns. systemd.txt is parsed once per
+	archive.
+
+	Args:		None
+	Returns:	Dictionary of Dictionaries
+	Example:
+
+	UNITS = SUSE.getSystemdUnitIndex()
+	FAILED = []
+	for UNIT in UNITS:
+		if( UNITS[UNIT].get('ActiveState') == 'failed' ):
+			FAILED.append(UNIT)
+	if( FAILED ):
+		Core.updateStatus(Core.WARN, "Failed units: " + " ".join(FAILED))
+	else:
+		Core.updateStatus(Core.IGNORE, "No failed units")
+	"""
+	def loadSystemdUnitIndex():
+		return sca_model.build_systemd_unit_index(Core.iterSections("systemd.txt"))
+	return Core.getArchiveCache('SUSE.SystemdUnitIndex', loadSystemdUnitIndex)
+
 def getServiceDInfo(SERVICE_NAME):
 	"""
 	Returns a dictionary of systemd service information for SERVICE_NAME
@@ -479,20 +798,7 @@ def getServiceDInfo(SERVICE_NAME):
 	else:
 		Core.updateStatus(Core.WARN, "Service is down: " + str(SERVICE_NAME));
 	"""
-	FILE_OPEN = "systemd.txt"
-	SECTION = "systemctl show '" + str(SERVICE_NAME) + "'"
-	SERVICED_DICTIONARY = {}
-	CONTENT = {}
-	# Get the service information section in systemd.txt.
-	if Core.getSection(FILE_OPEN, SECTION, CONTENT):
-		for LINE in CONTENT:
-			ELEMENT = CONTENT[LINE].split('=')
-			KEY = ELEMENT[0]
-			# remove the key from the key/value pair
-			del ELEMENT[0]
-			# assign the value to the dictionary key
-			SERVICED_DICTIONARY[KEY] = '='.join(ELEMENT)
-	return SERVICED_DICTIONARY
+	return dict(getSystemdUnitIndex().get(SERVICE_NAME, {}))
 
 def serviceDHealth(SERVICE_NAME):
 	"""
@@ -550,6 +856,22 @@ def serviceDHealth(SERVICE_NAME):
 
 	return RC
 
+def serviceDHealthList(SERVICE_NAMES):
+	"""
+	Reports the health of each systemd service in SERVICE_NAMES like serviceDHealth does. systemd.txt is parsed
+	once for all of them.
+
+	Args:		SERVICE_NAMES (List) - systemd service names
+	Returns:	Dictionary of SERVICE_NAME to its serviceDHealth return code
+	Example:
+
+	SUSE.serviceDHealthList(['cups.service', 'sshd.service', 'cron.service'])
+	"""
+	RC = {}
+	for SERVICE_NAME in SERVICE_NAMES:
+		RC[SERVICE_NAME] = serviceDHealth(SERVICE_NAME)
+	return RC
+
 def compareRPM(package, versionString):
 	"""
 	Compares the versionString to the installed package's version
@@ -1094,9 +1416,47 @@ def getProcCmdLine():
 			LIST = LINE.split()
 	return LIST
 
+def loadFileSystemModel():
+	SECTIONS = {}
+	DFDATA = []
+	FREE = []
+	Core.getRegExSections('fs-diskio.txt', ['/bin/mount', '/etc/fstab'], SECTIONS)
+	Core.getRegExSection('basic-health-check.txt', 'df -h', DFDATA)
+	for LINE in SECTIONS.get('/etc/fstab', []):
+		ENTRY = LINE.split()
+		if( len(ENTRY) == 6 and ENTRY[1].lower() == "swap" ): # swap sizes are in the memory.txt file, not df command
+			Core.getRegExSection('memory.txt', 'free -k', FREE)
+			break
+	return sca_model.build_filesystem_model(SECTIONS.get('/bin/mount', []), SECTIONS.get('/etc/fstab', []), DFDATA, FREE)
+
+def getFileSystemModel():
+	"""
+	Gets the mount, /etc/fstab, df and swap data joined into typed file system records with sizes normalized
+	to bytes. The data is parsed once per archive and shared with getFileSystems.
+
+	Args:			None
+	Returns:	sca_model.FileSystemModel instance
+	Attributes:
+		valid          = True if the mount, fstab and df sections were found
+		filesystems    = List of sca_model.FileSystem records
+		by_mount_point = Dictionary of mount point to FileSystem record
+		by_device      = Dictionary of device path to a list of FileSystem records
+		swap           = Dictionary of free -k swap values in KiB
+
+	Example:
+	FS_MODEL = SUSE.getFileSystemModel()
+	ROOT = FS_MODEL.get_mount_point('/')
+	if( ROOT is not None and ROOT.avail_bytes is not None and ROOT.avail_bytes < 1024**3 ):
+		Core.updateStatus(Core.WARN, "Less than 1GiB free on the root file system")
+	else:
+		Core.updateStatus(Core.IGNORE, "Sufficient space on the root file system")
+	"""
+	return Core.getArchiveCache('SUSE.FileSystemModel', loadFileSystemModel)
+
 def getFileSystems():
 	"""
 	Gets all fields from the mounted and unmountd file systems with their associated fstab file and df command output.
+	This is the dictionary view of getFileSystemModel().
 
 	Args:			None
 	Returns:	List of Dictionaries
@@ -1111,9 +1471,9 @@ def getFileSystems():
 		Dump          = /etc/fstab dump field, '' if unknown
 		fsck          = /etc/fstab fsck field, '' if unknown
 		Mounted       = False = Not mounted, True = Mounted
-		Size          = File system size in bytes, '' if unknown
-		UsedSpace     = File system space used in bytes, '' if unknown
-		AvailSpace    = file system space available in bytes, '' if unknown
+		Size          = File system size as shown by df -h, or in KiB for swap, '' if unknown
+		UsedSpace     = File system space used as shown by df -h, or in KiB for swap, '' if unknown
+		AvailSpace    = file system space available as shown by df -h, or in KiB for swap, '' if unknown
 		PercentUsed   = file system percent used, -1 if unknown
 
 	Example:
@@ -1127,127 +1487,24 @@ def getFileSystems():
 	else:
 		Core.updateStatus(Core.IGNORE, "All filesystems appear to be mounted")
 	"""
-	MOUNTS = []
-	FSTAB = []
-	DFDATA = []
-	DFDATA_NORMALIZED = []
 	FSLIST = []
-	ENTRY = []
-	if( Core.getRegExSection('fs-diskio.txt', '/bin/mount', MOUNTS) and Core.getRegExSection('fs-diskio.txt', '/etc/fstab', FSTAB) and Core.getRegExSection('basic-health-check.txt', 'df -h', DFDATA) ):
-		#normalize df data for later use
-		LINE_WRAPPED = False
-		THIS_ENTRY = []
-		for DFLINE in DFDATA:
-			LINE = DFLINE.strip().split()
-			if "Filesystem" in LINE[0]:
-				continue
-			else:
-				LENLINE = len(LINE)
-				if( LENLINE == 6 ):
-					DFDATA_NORMALIZED.append(LINE)
-				elif( LENLINE == 1 ): # Line wraps because the first field is a very long device name
-					THIS_ENTRY = LINE
-				elif( LENLINE < 6 ): # Adds the rest of the fields to the device from the first line
-					THIS_ENTRY.extend(LINE)
-					if( len(THIS_ENTRY) == 6 ):
-						DFDATA_NORMALIZED.append(THIS_ENTRY)
-					THIS_ENTRY = []
-			for DFLIST in DFDATA_NORMALIZED:
-				TMP = DFLIST[4].replace('%', '')
-				DFLIST[4] = TMP
-
-		#compile mounted filesystem data with merged fstab and df data
-		for MOUNT in MOUNTS: #load each mount line output into the ENTRY list
-			MOUNT = MOUNT.replace("(", '').replace(")", '')
-			ENTRY = MOUNT.split()
-			if( len(ENTRY) != 6 ): #ignore non-standard mount entries. They should only have six fields.
-				ENTRY = []
-				continue
-#			print "ENTRY mount", ENTRY
-
-			#add fstab entries to mounted filesystems
-			MATCHED = False
-			for FSENTRY in FSTAB: #check each FSENTRY to the current MOUNT
-				THIS_ENTRY = FSENTRY.split()
-				if( len(THIS_ENTRY) != 6 ): #consider non-standard entries as not MATCHED
-					break
-				if( THIS_ENTRY[1] == ENTRY[2] ): #mount points match
-					MATCHED = True
-					ENTRY.append(THIS_ENTRY[0]) #fstab device
-					ENTRY.append(THIS_ENTRY[3]) #fstab options
-					ENTRY.append(int(THIS_ENTRY[4])) #dump
-					ENTRY.append(int(THIS_ENTRY[5])) #fsck
-					break
-			if( not MATCHED ): #mounted, but not defined in /etc/fstab
-				ENTRY.append('') #no fstab device
-				ENTRY.append('') #fstab options
-				ENTRY.append(-1) #dump
-				ENTRY.append(-1) #fsck
-#			print "ENTRY mount+fstab", ENTRY
-
-			#add df info to mounted filesystems
-			MATCHED = False
-			for DF in DFDATA_NORMALIZED: #check each DF entry to the current MOUNT
-				if( DF[5] == ENTRY[2] ): #mount points match
-					MATCHED = True
-					ENTRY.append(DF[1]) #size
-					ENTRY.append(DF[2]) #used
-					ENTRY.append(DF[3]) #available
-					ENTRY.append(DF[4]) #percent used
-			if( not MATCHED ): #DF doesn't match MOUNT, so use undefined values
-				ENTRY.append('') #size
-				ENTRY.append('') #used
-				ENTRY.append('') #available
-				ENTRY.append(-1) #percent used
-			MATCHED = False
-#			print "ENTRY mount+fstab+df", len(ENTRY), ":", ENTRY
-			if( len(ENTRY) == 14 ): #add valid filesystems to the returnable list
-				FSLIST.append({'ActiveDevice': ENTRY[0], 'MountedDevice': ENTRY[0], 'FstabDevice': ENTRY[6], 'MountPoint': ENTRY[2], 'Type': ENTRY[4], 'MountOptions': ENTRY[5], 'FstabOptions': ENTRY[7], 'Dump': ENTRY[8], 'fsck': ENTRY[9], 'Mounted': True, 'Size': ENTRY[10], 'UsedSpace': ENTRY[11], 'AvailSpace': ENTRY[12], 'PercentUsed': int(ENTRY[13]) })
-
-		#now add any unmounted filesystems
-		UNMOUNTED = []
-		ENTRY = []
-		SWAP = []
-		for FSENTRY in FSTAB: #check each FSENTRY for unmounted devices
-			ENTRY = FSENTRY.split()
-			if( len(ENTRY) != 6 ): #consider non-standard entries as not MATCHED
-				continue
-			else:
-				MISSING = True
-				for FS in FSLIST: #check FSENTRY in each mounted FSLIST
-					if( ENTRY[1] == FS['MountPoint'] ): #FSENTRY must be mounted
-						MISSING = False
-						break
-				if( MISSING ): #the fstab entry was not found in the list of mounted filesystems
-					if( ENTRY[1].lower() == "swap" ): # If there is more than one swap device, the same free -k swap information is used for each one.
-						if( Core.getRegExSection('memory.txt', 'free -k', SWAP) ):
-							for LINE in SWAP: #swap sizes are in the memory.txt file, not df command
-								if LINE.startswith("Swap:"):
-									TMP = LINE.split()
-									break
-#							print "SWAP", TMP
-							PCTSWAP = (int(TMP[2]) * 100 / int(TMP[1]))
-							if( int(TMP[1]) > 0 ): #if the swap size is greater than 0 assume all swap devices are mounted
-								UNMOUNTED.append({'ActiveDevice': ENTRY[0], 'MountedDevice': '', 'FstabDevice': ENTRY[0], 'MountPoint': ENTRY[1], 'Type': ENTRY[2], 'MountOptions': '', 'FstabOptions': ENTRY[3], 'Dump': ENTRY[4], 'fsck': ENTRY[5], 'Mounted': True, 'Size': TMP[1], 'UsedSpace': TMP[2], 'AvailSpace': TMP[3], 'PercentUsed': PCTSWAP })
-							else: #the swap size is zero, assume all swap devices are not mounted
-								UNMOUNTED.append({'ActiveDevice': ENTRY[0], 'MountedDevice': '', 'FstabDevice': ENTRY[0], 'MountPoint': ENTRY[1], 'Type': ENTRY[2], 'MountOptions': '', 'FstabOptions': ENTRY[3], 'Dump': ENTRY[4], 'fsck': ENTRY[5], 'Mounted': False, 'Size': TMP[1], 'UsedSpace': TMP[2], 'AvailSpace': TMP[3], 'PercentUsed': PCTSWAP })
-						else: #swap size information is not found
-							UNMOUNTED.append({'ActiveDevice': ENTRY[0], 'MountedDevice': '', 'FstabDevice': ENTRY[0], 'MountPoint': ENTRY[1], 'Type': ENTRY[2], 'MountOptions': '', 'FstabOptions': ENTRY[3], 'Dump': ENTRY[4], 'fsck': ENTRY[5], 'Mounted': False, 'Size': '', 'UsedSpace': '', 'AvailSpace': '', 'PercentUsed': -1 })
-					else: #not a swap device
-						UNMOUNTED.append({'ActiveDevice': ENTRY[0], 'MountedDevice': '', 'FstabDevice': ENTRY[0], 'MountPoint': ENTRY[1], 'Type': ENTRY[2], 'MountOptions': '', 'FstabOptions': ENTRY[3], 'Dump': ENTRY[4], 'fsck': ENTRY[5], 'Mounted': False, 'Size': '', 'UsedSpace': '', 'AvailSpace': '', 'PercentUsed': -1 })
-		if( UNMOUNTED ):
-			FSLIST.extend(UNMOUNTED)
-	else:
+	FS_MODEL = getFileSystemModel()
+	if not FS_MODEL.valid:
 		Core.updateStatus(Core.ERROR, "ERROR: getFileSystems: Cannot find /bin/mount(fs-diskio.txt), /etc/fstab(fs-diskio.txt), df -h(basic-health-check.txt) sections")
+		return FSLIST
+
+	for FS in FS_MODEL.filesystems:
+		if( FS.is_mounted and not FS.is_swap ):
+			if( FS.in_fstab ):
+				DUMP = int(FS.fs_dump) if FS.fs_dump.isdigit() else -1
+				FSCK = int(FS.fs_check) if FS.fs_check.isdigit() else -1
+			else: #mounted, but not defined in /etc/fstab
+				DUMP = -1
+				FSCK = -1
+			FSLIST.append({'ActiveDevice': FS.dev_mounted, 'MountedDevice': FS.dev_mounted, 'FstabDevice': FS.dev_fstab, 'MountPoint': FS.mount_point, 'Type': FS.fs_type, 'MountOptions': FS.mount_options, 'FstabOptions': FS.fstab_options, 'Dump': DUMP, 'fsck': FSCK, 'Mounted': True, 'Size': FS.size_text, 'UsedSpace': FS.used_text, 'AvailSpace': FS.avail_text, 'PercentUsed': FS.percent_used })
+		else: #unmounted filesystems and swap devices from /etc/fstab
+			FSLIST.append({'ActiveDevice': FS.dev_fstab, 'MountedDevice': '', 'FstabDevice': FS.dev_fstab, 'MountPoint': FS.mount_point, 'Type': FS.fs_type, 'MountOptions': '', 'FstabOptions': FS.fstab_options, 'Dump': FS.fs_dump, 'fsck': FS.fs_check, 'Mounted': FS.is_mounted, 'Size': FS.size_text, 'UsedSpace': FS.used_text, 'AvailSpace': FS.avail_text, 'PercentUsed': FS.percent_used })
 
-#	for FS in FSLIST:
-#		print "{0:20}: {1}\n".format(FS['MountPoint'], FS)
-#	print "TOTAL", len(FSLIST)
-	del MOUNTS
-	del FSTAB
-	del DFDATA
-	del DFDATA_NORMALIZED
-	del SWAP
 	return FSLIST
 
 def getGrub2Config():
@@ -1356,9 +1613,183 @@ def getBasicFIPSData():
 #	print "FIPS", FIPS
 	return FIPS
 
+LVM_TOKEN = re.compile(r'\s*(?:(#.*)|"((?:[^"\\]|\\.)*)"|([{}\[\],=])|([^\s{}\[\],=#"]+))')
+
+class LvmModel(object):
+	"""
+	The lvm.conf configuration tree and the pvs, vgs and lvs tables from lvm.txt. Use getLvmModel() to get the
+	model for the current archive.
+
+	Variables
+	---------
+	config = (Dictionary) The lvm.conf tree. Sections are nested dictionaries, arrays are lists and all other values
+		are strings, with the case and order of lvm.conf preserved
+	legacy = (Dictionary) The lowercase getConfigFileLVM('all') view of config
+	pvs, vgs, lvs = (List of Dictionaries) Table rows keyed by the column headers, like PV, VG, LV, Attr
+	pvsByName = (Dictionary) PV name to its pvs row
+	vgsByName = (Dictionary) VG name to its vgs row
+	lvsByName = (Dictionary) VG/LV name to its lvs row
+	"""
+	def __init__(self):
+		self.config = {}
+		self.legacy = {}
+		self.pvs = []
+		self.vgs = []
+		self.lvs = []
+		self.pvsByName = {}
+		self.vgsByName = {}
+		self.lvsByName = {}
+		self._multiLine = set()
+
+	def getValue(self, CONFIG_PATH, DEFAULT=None):
+		"""
+		Returns the lvm.conf value of a slash separated CONFIG_PATH, like 'devices/filter', or DEFAULT
+		"""
+		NODE = self.config
+		for NAME in CONFIG_PATH.strip('/').split('/'):
+			if not isinstance(NODE, dict) or NAME not in NODE:
+				return DEFAULT
+			NODE = NODE[NAME]
+		return NODE
+
+	def parseConfig(self, CONTENT):
+		TOKENS = []
+		for LINE_NUMBER, LINE in enumerate(CONTENT):
+			for COMMENT, STRING, SYMBOL, WORD in LVM_TOKEN.findall(LINE):
+				if( COMMENT ):
+					break
+				elif( SYMBOL ):
+					TOKENS.append((SYMBOL, None, LINE_NUMBER))
+				elif( WORD ):
+					TOKENS.append(('word', WORD, LINE_NUMBER))
+				else:
+					TOKENS.append(('word', STRING.replace('\\"', '"'), LINE_NUMBER))
+		STACK = [(self.config, ())]
+		I = 0
+		COUNT = len(TOKENS)
+		while I < COUNT:
+			(KIND, VALUE, LINE_NUMBER) = TOKENS[I]
+			(NODE, NODE_PATH) = STACK[-1]
+			if( KIND == '}' ):
+				if( len(STACK) > 1 ):
+					STACK.pop()
+				I += 1
+			elif( KIND != 'word' or I + 1 >= COUNT ):
+				I += 1
+			elif( TOKENS[I + 1][0] == '{' ):
+				CHILD = NODE.get(VALUE)
+				if not isinstance(CHILD, dict):
+					CHILD = NODE[VALUE] = {}
+				STACK.append((CHILD, NODE_PATH + (VALUE,)))
+				I += 2
+			elif( TOKENS[I + 1][0] == '=' and I + 2 < COUNT ):
+				I += 2
+				if( TOKENS[I][0] == '[' ):
+					ARRAY = []
+					I += 1
+					while I < COUNT and TOKENS[I][0] != ']':
+						if( TOKENS[I][0] == 'word' ):
+							ARRAY.append(TOKENS[I][1])
+						I += 1
+					if( I < COUNT and TOKENS[I][2] != LINE_NUMBER ):
+						self._multiLine.add(NODE_PATH + (VALUE,))
+					NODE[VALUE] = ARRAY
+				elif( TOKENS[I][0] == 'word' ):
+					NODE[VALUE] = TOKENS[I][1]
+				I += 1
+			else:
+				I += 1
+		self.legacy = self._legacy(self.config, ())
+
+	def _legacy(self, NODE, NODE_PATH):
+		LEGACY = {}
+		for KEY, VALUE in NODE.items():
+			if isinstance(VALUE, dict):
+				VALUE = self._legacy(VALUE, NODE_PATH + (KEY,))
+			elif isinstance(VALUE, list):
+				VALUE = [ITEM.lower() for ITEM in VALUE]
+				# multi-line arrays have always been returned sorted without empty values
+				if NODE_PATH + (KEY,) in self._multiLine:
+					VALUE = sorted([ITEM for ITEM in VALUE if ITEM])
+			else:
+				VALUE = VALUE.lower()
+			LEGACY[KEY.lower()] = VALUE
+		return LEGACY
+
+	def parseTable(self, CONTENT):
+		HEADER = CONTENT[0]
+		COLUMNS = [(MATCH.group(0), MATCH.start(), MATCH.end()) for MATCH in re.finditer(r"\S+", HEADER)]
+		ROWS = []
+		for LINE in CONTENT[1:]:
+			FIELDS = [(MATCH.group(0), MATCH.start(), MATCH.end()) for MATCH in re.finditer(r"\S+", LINE)]
+			ROW = dict.fromkeys([COLUMN[0] for COLUMN in COLUMNS], '')
+			if( len(FIELDS) == len(COLUMNS) ):
+				for I in range(len(COLUMNS)):
+					ROW[COLUMNS[I][0]] = FIELDS[I][0]
+			else:
+				# empty cells shift the fields, place each one under the header it overlaps most
+				for (VALUE, START, END) in FIELDS:
+					BEST = 0
+					BEST_OVERLAP = -1
+					for I in range(len(COLUMNS)):
+						LEFT = COLUMNS[I - 1][2] if I > 0 else 0
+						RIGHT = COLUMNS[I + 1][1] if I + 1 < len(COLUMNS) else len(LINE)
+						OVERLAP = min(END, RIGHT) - max(START, LEFT)
+						if( OVERLAP > BEST_OVERLAP ):
+							BEST = I
+							BEST_OVERLAP = OVERLAP
+					ROW[COLUMNS[BEST][0]] = VALUE
+			ROWS.append(ROW)
+		return ROWS
+
+def loadLvmModel():
+	LVM = LvmModel()
+	TABLES = {'PV': re.compile(r"(^|/)pvs(\s|$)"), 'VG': re.compile(r"(^|/)vgs(\s|$)"), 'LV': re.compile(r"(^|/)lvs(\s|$)")}
+	FOUND = set()
+	for SECTION_NAME, CONTENT in Core.iterSections("lvm.txt"):
+		if not CONTENT:
+			continue
+		if 'CONFIG' not in FOUND and "lvm.conf" in SECTION_NAME:
+			LVM.parseConfig(CONTENT)
+			FOUND.add('CONFIG')
+			continue
+		for KEY in TABLES:
+			if KEY not in FOUND and TABLES[KEY].search(SECTION_NAME) and CONTENT[0].split()[0] == KEY:
+				ROWS = LVM.parseTable(CONTENT)
+				FOUND.add(KEY)
+				if( KEY == 'PV' ):
+					LVM.pvs = ROWS
+					LVM.pvsByName = dict([(ROW['PV'], ROW) for ROW in ROWS])
+				elif( KEY == 'VG' ):
+					LVM.vgs = ROWS
+					LVM.vgsByName = dict([(ROW['VG'], ROW) for ROW in ROWS])
+				else:
+					LVM.lvs = ROWS
+					LVM.lvsByName = dict([(ROW.get('VG', '') + '/' + ROW['LV'], ROW) for ROW in ROWS])
+				break
+	return LVM
+
+def getLvmModel():
+	"""
+	Returns the LvmModel of lvm.txt with the parsed lvm.conf tree and the pvs, vgs and lvs tables. The file is
+	parsed once per archive.
+
+	Args:		None
+	Returns:	LvmModel instance
+	Example:
+
+	LVM = SUSE.getLvmModel()
+	if( LVM.getValue('devices/use_lvmetad', '0') == '1' ):
+		Core.updateStatus(Core.WARN, "LVM metadata daemon is in use")
+	else:
+		Core.updateStatus(Core.IGNORE, "LVM metadata daemon is not in use")
+	"""
+	return Core.getArchiveCache('SUSE.LvmModel', loadLvmModel)
+
 def getConfigFileLVM(PART):
 	"""
-	Returns a dictionary of the /etc/lvm/lvm.conf file from the lvm.txt file in supportconfig.
+	Returns a dictionary of the /etc/lvm/lvm.conf file from the lvm.txt file in supportconfig. Section names, keys and
+	values are lowercase. This is a view of getLvmModel().
 
 	Args:			PART
 		If PART is set to '' or 'all', the entire lvm.conf file will be returned in a dictionary of dictionaries.
@@ -1381,94 +1812,192 @@ def getConfigFileLVM(PART):
 	else:		
 		Core.updateStatus(Core.IGNORE, "LMV logging is not verbose")
 	"""
-	FILE_OPEN = "lvm.txt"
-	SECTION = "lvm.conf"
-	CONTENT = []
-	LVM_CONFIG = {}
-	LVM_CONFIG_ALL = {}
-	IN_PART = False
-	IN_ARRAY = False
-	ARRAY_VALUES = []
-	ARRAY_KEY = ''
-	LVM_SECTION_NAME = ''
-	LVM_SECTION = re.compile(r"^\S*\s*{", re.IGNORECASE)
-	SKIP_LINE = re.compile(r"^\s*#|^\s*$", re.IGNORECASE)
-	if Core.getRegExSection(FILE_OPEN, SECTION, CONTENT):
-		for LINE in CONTENT:
-			if SKIP_LINE.search(LINE):
+	LVM_CONFIG_ALL = getLvmModel().legacy
+	if( len(PART) == 0 or PART.lower() == "all" ):
+		return copy.deepcopy(LVM_CONFIG_ALL)
+	elif PART in LVM_CONFIG_ALL:
+		return copy.deepcopy(LVM_CONFIG_ALL[PART])
+	return {}
+
+class NetworkDevice(object):
+	"""
+	A network interface from network.txt combining its ip addr, ethtool -k and ifcfg data. ethtool features are
+	stored as bits of featuresKnown and featuresOn using the bit numbers of the NetworkModel feature table.
+	"""
+	__slots__ = ('name', 'flags', 'mtu', 'state', 'mac', 'addr4', 'addr6', 'featuresKnown', 'featuresOn', 'config', 'inIpAddr')
+
+	def __init__(self, NAME):
+		self.name = NAME
+		self.flags = ()
+		self.mtu = '?'
+		self.state = '?'
+		self.mac = None
+		self.addr4 = []
+		self.addr6 = []
+		self.featuresKnown = 0
+		self.featuresOn = 0
+		self.config = {}
+		self.inIpAddr = False
+
+class NetworkModel(object):
+	"""
+	The network.txt interface data parsed in one pass. Use getNetworkModel() to get the model for the current
+	archive.
+
+	Variables
+	---------
+	devices = (Dictionary) Device name to NetworkDevice, in ip addr order
+	featureNames = (List) ethtool feature names, the list index is the feature bit number
+	featureBits = (Dictionary) ethtool feature name to its bit number
+	"""
+	def __init__(self):
+		self.devices = {}
+		self.featureNames = []
+		self.featureBits = {}
+
+	def getDevice(self, NAME):
+		if NAME not in self.devices:
+			self.devices[NAME] = NetworkDevice(NAME)
+		return self.devices[NAME]
+
+	def setFeature(self, DEVICE, FEATURE, ENABLED):
+		BIT = self.featureBits.get(FEATURE)
+		if BIT is None:
+			BIT = len(self.featureNames)
+			self.featureNames.append(sys.intern(FEATURE))
+			self.featureBits[FEATURE] = BIT
+		DEVICE.featuresKnown |= ( 1 << BIT )
+		if ENABLED:
+			DEVICE.featuresOn |= ( 1 << BIT )
+		else:
+			DEVICE.featuresOn &= ~( 1 << BIT )
+
+	def getFeature(self, NAME, FEATURE):
+		"""
+		Returns True if the ethtool FEATURE is on for device NAME, False if it is off and None if it is unknown
+		"""
+		DEVICE = self.devices.get(NAME)
+		BIT = self.featureBits.get(FEATURE)
+		if( DEVICE is None or BIT is None or not DEVICE.featuresKnown & ( 1 << BIT ) ):
+			return None
+		return bool(DEVICE.featuresOn & ( 1 << BIT ))
+
+	def getFeatures(self, NAME):
+		"""
+		Returns a dictionary of every known ethtool feature of device NAME to True (on) or False (off)
+		"""
+		FEATURES = {}
+		DEVICE = self.devices.get(NAME)
+		if DEVICE is not None:
+			for BIT in range(len(self.featureNames)):
+				if( DEVICE.featuresKnown & ( 1 << BIT ) ):
+					FEATURES[self.featureNames[BIT]] = bool(DEVICE.featuresOn & ( 1 << BIT ))
+		return FEATURES
+
+	def asNicList(self):
+		"""
+		Returns the getNetworkInterfaces NIC_LIST dictionary view of the devices found in ip addr
+		"""
+		NIC_LIST = {}
+		for NAME, DEVICE in self.devices.items():
+			if not DEVICE.inIpAddr:
 				continue
-			THIS = LINE.strip().lower()
-			if( IN_PART ):
-				if "}" in THIS: #end of lvm config file part
-#					print " Leaving: '" + LVM_SECTION_NAME + "'"
-					IN_PART = False
-					LVM_CONFIG_ALL[LVM_SECTION_NAME] = LVM_CONFIG
-					LVM_CONFIG = {}
-					LVM_SECTION_NAME = ''
+			NIC = {'addr4': list(DEVICE.addr4), 'addr6': list(DEVICE.addr6), 'mtu': DEVICE.mtu, 'state': DEVICE.state}
+			for FLAG in DEVICE.flags:
+				NIC[FLAG] = True
+			if DEVICE.mac is not None:
+				NIC['mac'] = DEVICE.mac
+			BASE = self.devices.get(NAME.split('@')[0], DEVICE)
+			NIC.update(self.getFeatures(BASE.name))
+			NIC.update(BASE.config)
+			NIC_LIST[NAME] = NIC
+		return NIC_LIST
+
+def loadNetworkModel():
+	NETWORK_FILE = 'network.txt'
+	MODEL = NetworkModel()
+	if not Core.isFileActive(NETWORK_FILE):
+		return MODEL
+	IPADDR_FOUND = False
+	STARTNIC = re.compile(r"\d:.*: <.*>.* mtu ")
+	ETHTOOL = re.compile(r"ethtool -k\s+(\S+)\s*$")
+	ETHTOOL_FEATURE = re.compile(r"^\s*(\S+):\s+(\S+)")
+	IFCFG = re.compile(r"/etc/sysconfig/network/ifcfg-(\S+)\s*$")
+	for SECTION_NAME, CONTENT in Core.iterSections(NETWORK_FILE):
+		if( not CONTENT ):
+			continue
+		elif( not IPADDR_FOUND and "/ip addr" in SECTION_NAME ):
+			IPADDR_FOUND = True
+			DEVICE = None
+			for LINE in CONTENT:
+				if STARTNIC.search(LINE):
+					# 2: eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc pfifo_fast master br0 state UP group default qlen 1000
+					LINE_PARTS = LINE.split()
+					DEVICE = MODEL.getDevice(LINE_PARTS[1][:-1])
+					DEVICE.inIpAddr = True
+					for I in range(len(LINE_PARTS) - 1):
+						if( LINE_PARTS[I] == "mtu" ):
+							DEVICE.mtu = LINE_PARTS[I+1]
+						elif( LINE_PARTS[I] == "state" ):
+							DEVICE.state = LINE_PARTS[I+1]
+					DEVICE.flags = tuple(sys.intern(FLAG) for FLAG in LINE_PARTS[2][1:][:-1].upper().split(','))
+				elif DEVICE is None:
+					continue
 				else:
-					TMP = THIS.split("=", 1)
-					if( len(TMP) > 1 ):
-						KEY = TMP[0].strip()
-						VALUE = TMP[1].strip()
-					else:
-						KEY = ''
-						VALUE = TMP[0].strip()
-
-					if( IN_ARRAY ):
-						if( "]" in THIS ):
-#							print " End array:", TMP[0], "Length", len(THIS)
-							IN_ARRAY = False
-							TMP2 = VALUE.strip("[ ] ").split(",")
-							for VALUE in TMP2:
-								ARRAY_VALUES.append(VALUE.strip('" \' '))
-							ARRAY_VALUES = [_f for _f in ARRAY_VALUES if _f]
-							LVM_CONFIG[ARRAY_KEY.strip()] = sorted(ARRAY_VALUES)
-						else:
-#							print "  Add to array:", TMP[0], "Length", len(THIS)
-							TMP2 = THIS.strip("[ ] ").split(",")
-							for VALUE in TMP2:
-								ARRAY_VALUES.append(VALUE.strip('" \' '))
-					elif( "[" in THIS and "]" in THIS ):
-#						print " Complete array:", TMP[0], TMP[1]
-						TMP2 = TMP[1].strip("[ ] ").split(",")
-						VALUES = []
-						for VALUE in TMP2:
-							VALUES.append(VALUE.strip('" \' '))
-						LVM_CONFIG[TMP[0].strip()] = VALUES
-					elif( "[" in THIS ):
-#						print " Start array:", TMP[0], TMP[1]
-						IN_ARRAY = True
-						ARRAY_KEY = TMP[0]
-						ARRAY_VALUES = []
-						TMP2 = TMP[1].strip("[ ] ").split(",")
-						for VALUE in TMP2:
-							ARRAY_VALUES.append(VALUE.strip('" \' '))
-					else:
-#						print " Normal:", TMP[0], TMP[1].strip('" \' ')
-						LVM_CONFIG[TMP[0].strip()] = TMP[1].strip('" \' ')
-			elif LVM_SECTION.search(THIS):
-				LVM_SECTION_NAME = THIS.strip().split()[0].strip()
-				IN_PART = True
-#				print "Entering LVM Section: '" + LVM_SECTION_NAME + "'"
-
-#		print
-#		print "KEYS", LVM_CONFIG_ALL.keys()
-#		print
-		if( len(PART) > 0 ):
-			if( PART.lower() == "all" ):
-				LVM_CONFIG = LVM_CONFIG_ALL
-#				print 'ALL:', LVM_CONFIG
-			elif PART in list(LVM_CONFIG_ALL.keys()):
-				LVM_CONFIG = LVM_CONFIG_ALL[PART]
-#				print PART + ":", LVM_CONFIG
-			else:
-				LVM_CONFIG = {}
-#				print "KEY_NOT_FOUND:", PART
-		else:
-			LVM_CONFIG = LVM_CONFIG_ALL
-#			print 'ALL:', LVM_CONFIG
-#		print
-	return LVM_CONFIG
+					LINE = LINE.strip()
+					if LINE.startswith("link"):
+						# link/ether 00:25:b5:05:03:7e brd ff:ff:ff:ff:ff:ff
+						DEVICE.mac = LINE.split()[1] if len(LINE.split()) > 1 else ''
+					elif LINE.startswith("inet "):
+						# inet 192.168.0.236/24 brd 192.168.0.255 scope global eth0
+						DEVICE.addr4.append(LINE.split()[1])
+					elif LINE.startswith("inet6 "):
+						# inet6 fe80::5054:ff:fea4:12da/64 scope link
+						DEVICE.addr6.append(LINE.split()[1])
+		elif "ethtool -k" in SECTION_NAME:
+			NAME = ETHTOOL.search(SECTION_NAME)
+			if NAME is None:
+				continue
+			DEVICE = MODEL.getDevice(NAME.group(1))
+			for LINE in CONTENT[1:]:
+				FEATURE = ETHTOOL_FEATURE.search(LINE)
+				if FEATURE is not None:
+					MODEL.setFeature(DEVICE, FEATURE.group(1), FEATURE.group(2).lower() == "on")
+		elif "/etc/sysconfig/network/ifcfg-" in SECTION_NAME:
+			NAME = IFCFG.search(SECTION_NAME)
+			if NAME is None:
+				continue
+			DEVICE = MODEL.getDevice(NAME.group(1))
+			for LINE in CONTENT:
+				(KEY, SEPARATOR, VALUE) = LINE.partition('=')
+				if not SEPARATOR:
+					continue
+				VALUE = VALUE.strip()
+				if( len(VALUE) > 1 and VALUE[0] == VALUE[-1] and VALUE[0] in "'\"" ):
+					VALUE = VALUE[1:-1]
+				DEVICE.config[KEY.strip()] = VALUE
+	return MODEL
+
+def getNetworkModel():
+	"""
+	Gets the network.txt interface model. The ip addr section and every ethtool -k and ifcfg-* section are
+	dispatched to their device in a single pass over network.txt, once per archive.
+
+	Args:			None
+	Returns:	NetworkModel instance
+	Example:
+
+	NETWORK = SUSE.getNetworkModel()
+	MISSING_SG = []
+	for DEVICE in NETWORK.devices:
+		if( NETWORK.getFeature(DEVICE, 'scatter-gather') is False ):
+			MISSING_SG.append(DEVICE)
+	if( MISSING_SG ):
+		Core.updateStatus(Core.WARN, "Network devices with scatter-gather disabled: " + ' '.join(MISSING_SG))
+	else:
+		Core.updateStatus(Core.IGNORE, "All network devices have scatter-gather enabled")
+	"""
+	return Core.getArchiveCache('SUSE.NetworkModel', loadNetworkModel)
 
 def getNetworkInterfaces():
 	"""
@@ -1533,62 +2062,6 @@ def getNetworkInterfaces():
 		Core.updateStatus(Core.IGNORE, "All network devices have " + str(FEATURE) + " enabled")
 
 	"""
-	NETWORK_FILE = 'network.txt'
-	IPADDR = []
-	IPROUTE = []
-	NIC_LIST = {}
-	DEV = ''
-
-	if( Core.isFileActive(NETWORK_FILE) ):
-		STARTNIC = re.compile(r"\d:.*: <.*>.* mtu ")
-		if( Core.getRegExSection(NETWORK_FILE, '/ip addr', IPADDR) ):
-			for LINE in IPADDR:
-				if STARTNIC.search(LINE):
-#					print("Processing: " + str(LINE))
-					# 2: eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc pfifo_fast master br0 state UP group default qlen 1000
-					LINE_PARTS = LINE.split()
-					DEV = LINE_PARTS[1][:-1]
-					NIC_LIST[DEV] = {}
-					NIC_LIST[DEV]['addr4'] = [] # holds all IPv4 internet addresses
-					NIC_LIST[DEV]['addr6'] = [] # holds all IPv6 internet addresses
-					NIC_LIST[DEV]['mtu'] = '?'
-					NIC_LIST[DEV]['state'] = '?'
-					for i in range(len(LINE_PARTS)):
-						if( LINE_PARTS[i] == "mtu" ):
-							NIC_LIST[DEV]['mtu'] = LINE_PARTS[i+1]
-						elif( LINE_PARTS[i] == "state" ):
-							NIC_LIST[DEV]['state'] = LINE_PARTS[i+1]
-					FLAGS = LINE_PARTS[2][1:][:-1].upper().split(',')
-					for FLAG in FLAGS:
-						NIC_LIST[DEV][FLAG] = True
-				elif( LINE.strip().startswith("link") ):
-					# link/ether 00:25:b5:05:03:7e brd ff:ff:ff:ff:ff:ff
-					NIC_LIST[DEV]['mac'] = LINE.split()[1]
-				elif( LINE.strip().startswith("inet ") ):
-					# inet 192.168.0.236/24 brd 192.168.0.255 scope global eth0
-					NIC_LIST[DEV]['addr4'].append(LINE.split()[1])
-				elif( LINE.strip().startswith("inet6 ") ):
-					# inet6 fe80::5054:ff:fea4:12da/64 scope link
-					NIC_LIST[DEV]['addr6'].append(LINE.split()[1])
-		for DEV in list(NIC_LIST.keys()):
-			ETHTOOL = []
-			NETCONFIG = []
-			if( Core.getRegExSection(NETWORK_FILE, "ethtool -k " + str(DEV), ETHTOOL) ):
-				for LINE in ETHTOOL[1:]:
-					ETHTOOL_PARTS = LINE.split()
-					OPTION = ETHTOOL_PARTS[0][:-1]
-					if( ETHTOOL_PARTS[1].lower() == "on" ):
-						NIC_LIST[DEV][OPTION] = True
-					else:
-						NIC_LIST[DEV][OPTION] = False
-			if( Core.getRegExSection(NETWORK_FILE, "/etc/sysconfig/network/ifcfg-" + str(DEV), NETCONFIG) ):
-				for LINE in NETCONFIG:
-					(KEY, VALUE) = LINE.split('=', 1)
-					NIC_LIST[DEV][KEY] = VALUE[1:][:-1]
-
-#	for NIC in NIC_LIST.keys():
-#		print("\n" + str(NIC) + " : " + str(NIC_LIST[NIC]))
-#	print
-
-	return NIC_LIST
+	return getNetworkModel().asNicList()
 
+Core.timeModuleCalls(__name__)
@@ -23,7 +23,7 @@ vitural machines or their virtual machine servers.
 #  Authors/Contributors:
 #     Jason Record (jrecord@suse.com)
 #
-#  Modified: 2015 Jun 06
+#  Modified: 2026 Oct 19
 #
 ##############################################################################
 
@@ -103,6 +103,113 @@ def isDom0Installed():
 				return True
 	return False
 
+def parseConfigFile(CONTENT):
+	CONFIG_VALUES = {}
+	MultiLine = re.compile(r"=\s*\[") # A line that has an =[ k
+	IN_MULTI_LINE = False
+	VALUES = []
+	for LINE in CONTENT:
+		LINE = LINE.strip()
+		if( IN_MULTI_LINE ):
+			if LINE.endswith("]"):
+				VALUES.append(LINE)
+				VALUE_STRING = ' '.join(VALUES)
+				TMP = VALUE_STRING.split("=", 1)
+				CONFIG_VALUES[TMP[0].strip()] = TMP[1].strip('"').strip()
+				IN_MULTI_LINE = False
+				VALUES = [] #prepare for new multiline value in config file
+			else:
+				VALUES.append(LINE)
+		elif( MultiLine.search(LINE) and not LINE.endswith("]")):
+			IN_MULTI_LINE = True
+			VALUES.append(LINE)
+		else: #assume single line entry
+			TMP = LINE.split("=", 1)
+			if( len(TMP) != 2 ): #Invalid entry, assume the config file is invalid and ignore it.
+				return {}
+			elif( "=" in TMP[1] and "]" not in TMP[1] ):
+				return {}
+			else:
+				CONFIG_VALUES[TMP[0].strip()] = TMP[1].strip('"').strip()
+	return CONFIG_VALUES
+
+class VmConfigStore(object):
+	"""
+	The non-XML /etc/xen/vm configuration files of xen.txt, parsed with a single pass over the file. Use
+	getVmConfigStore() to get the store for the current archive.
+
+	Variables
+	---------
+	configs = (List of Dictionaries) The valid configuration files in xen.txt order, see getConfigFiles
+	files = (List) The xen.txt section name of each entry in configs
+	disks = (List of Lists) The getDiskValueList result of each configs disk value, empty if it has none
+	byName = (Dictionary) VM name and configuration file name to the index in configs
+	"""
+	def __init__(self):
+		self.configs = []
+		self.files = []
+		self.disks = []
+		self.byName = {}
+
+	def add(self, FILE_NAME, CONFIG_VALUES):
+		INDEX = len(self.configs)
+		self.configs.append(CONFIG_VALUES)
+		self.files.append(FILE_NAME)
+		DISKS = []
+		if 'disk' in CONFIG_VALUES:
+			try:
+				DISKS = getDiskValueList(CONFIG_VALUES['disk'])
+			except IndexError:
+				DISKS = []
+		self.disks.append(DISKS)
+		self.byName.setdefault(FILE_NAME.split('/')[-1], INDEX)
+		if 'name' in CONFIG_VALUES:
+			self.byName[CONFIG_VALUES['name'].strip("'\"")] = INDEX
+
+	def getConfig(self, NAME):
+		"""
+		Returns the configuration dictionary of the VM NAME, or None
+		"""
+		if NAME in self.byName:
+			return self.configs[self.byName[NAME]]
+		return None
+
+	def getDisks(self, NAME):
+		"""
+		Returns the getDiskValueList disk dictionaries of the VM NAME, empty if the VM or its disk value is not found
+		"""
+		if NAME in self.byName:
+			return self.disks[self.byName[NAME]]
+		return []
+
+def loadVmConfigStore():
+	STORE = VmConfigStore()
+	for (SECTION_NAME, CONTENT) in Core.iterSections("xen.txt"):
+		if SECTION_NAME.startswith("/etc/xen/vm/") and '.xml' not in SECTION_NAME:
+			CONFIG_VALUES = parseConfigFile(CONTENT)
+			if( CONFIG_VALUES ):
+				STORE.add(SECTION_NAME, CONFIG_VALUES)
+	return STORE
+
+def getVmConfigStore():
+	"""
+	Gets the non-XML Xen VM configuration files. xen.txt is read once per archive and the disk lists of each VM
+	are parsed with it.
+
+	Args: None
+	Returns: VmConfigStore instance
+
+	Example:
+	STORE = Xen.getVmConfigStore()
+	for I in range(len(STORE.configs)):
+		if not STORE.disks[I]:
+			Core.updateStatus(Core.WARN, "No disks configured for " + STORE.files[I])
+			break
+	else:
+		Core.updateStatus(Core.IGNORE, "All VMs have disks configured")
+	"""
+	return Core.getArchiveCache('Xen.VmConfigStore', loadVmConfigStore)
+
 def getConfigFiles():
 	"""
 	Stores the non-XML Xen configuration files in list of dictionaries
@@ -113,64 +220,43 @@ def getConfigFiles():
 	Example:
 	Pending
 	"""
-	CONFIG_FILES = []
-	CONFIG_FILE_LIST = []
-	SECTION_LIST = {}
-	MultiLine = re.compile("=\s*\[") # A line that has an =[ k
-	IN_MULTI_LINE = False
-	VALUES = []
-	if Core.listSections("xen.txt", SECTION_LIST):
-		for LINE in SECTION_LIST:
-			if SECTION_LIST[LINE].startswith("/etc/xen/vm/"):
-				if '.xml' not in SECTION_LIST[LINE]:
-					CONFIG_FILE_LIST.append(SECTION_LIST[LINE])
-		for CONFIG in CONFIG_FILE_LIST:
-			#print "----------------------\nGetting", CONFIG
-			CONTENT = []
-			if Core.getExactSection("xen.txt", CONFIG, CONTENT):
-				CONFIG_VALUES = {}
-				for LINE in CONTENT:
-					LINE = LINE.strip()
-					if( IN_MULTI_LINE ):
-						if LINE.endswith("]"):
-							VALUES.append(LINE)
-							VALUE_STRING = ' '.join(VALUES)
-							TMP = VALUE_STRING.split("=", 1)
-							#print "TMP", TMP
-							CONFIG_VALUES[TMP[0].strip()] = TMP[1].strip('"').strip()
-							#print "  CONFIG_VALUES", CONFIG_VALUES
-							IN_MULTI_LINE = False
-							VALUES = [] #prepare for new multiline value in config file
-						else:
-							VALUES.append(LINE)
-					elif( MultiLine.search(LINE) and not LINE.endswith("]")):
-						IN_MULTI_LINE = True
-						VALUES.append(LINE)
-					else: #assume single line entry
-						TMP = LINE.split("=", 1)
-						#print "TMP", TMP, "Length", len(TMP)
-						if( len(TMP) != 2 ): #Invalid entry, assume the config file is invalid and ignore it.
-							#print " Invalid config file"
-							CONFIG_VALUES = {}
-							break
-						elif( "=" in TMP[1] and "]" not in TMP[1] ):
-							#print " Invalid config file"
-							CONFIG_VALUES = {}
-							break
-						else:
-							CONFIG_VALUES[TMP[0].strip()] = TMP[1].strip('"').strip()
-				#print "  CONFIG_VALUES", CONFIG_VALUES
-				if( CONFIG_VALUES):
-					CONFIG_FILES.append(CONFIG_VALUES)
-
-		#if( CONFIG_FILES ):
-			#print "======\n"
-			#for I in range(len(CONFIG_FILES)):
-				#print I, "==", CONFIG_FILES[I], "\n"
-		#else:
-			#print "CONFIG_FILES empty"
-
-	return CONFIG_FILES
+	return [dict(CONFIG_VALUES) for CONFIG_VALUES in getVmConfigStore().configs]
+
+def getVmConfig(VM_NAME):
+	"""
+	Gets the non-XML Xen configuration file of a VM by its name value or configuration file name
+
+	Args: VM_NAME (String) - The VM name
+	Returns: Dictionary, empty if the VM is not found
+
+	Example:
+	CONFIG = Xen.getVmConfig('sles15')
+	if( CONFIG.get('on_crash', '') == 'restart' ):
+		Core.updateStatus(Core.WARN, "VM sles15 restarts on crash")
+	else:
+		Core.updateStatus(Core.IGNORE, "VM sles15 does not restart on crash")
+	"""
+	CONFIG_VALUES = getVmConfigStore().getConfig(VM_NAME)
+	if CONFIG_VALUES is None:
+		return {}
+	return dict(CONFIG_VALUES)
+
+def getVmDiskList(VM_NAME):
+	"""
+	Gets the disk dictionaries of a VM, the same as getDiskValueList returns for its disk value
+
+	Args: VM_NAME (String) - The VM name
+	Returns: List of Dictionaries
+
+	Example:
+	for DISK in Xen.getVmDiskList('sles15'):
+		if DISK['type'] == 'file':
+			Core.updateStatus(Core.REC, "Consider a block device for VM sles15 disk " + DISK['vmdevice'])
+			break
+	else:
+		Core.updateStatus(Core.IGNORE, "VM sles15 has no file backed disks")
+	"""
+	return [dict(DISK) for DISK in getVmConfigStore().getDisks(VM_NAME)]
 
 def getDiskValueList(XEN_CONFIG_DISK_VALUE):
 	#print "\n", XEN_CONFIG_DISK_VALUE, "\n"
@@ -200,4 +286,4 @@ def getDiskValueList(XEN_CONFIG_DISK_VALUE):
 
 	return DISK_LIST
 
-
+Core.timeModuleCalls(__name__)
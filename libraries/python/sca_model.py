@@ -0,0 +1,274 @@
+'''
+Supportconfig Analysis archive data models
+
+Parsers that build typed models from supportconfig section lines. They take the section lines as arguments
+and read no files, so the Gen1 and Gen2 libraries share them without importing each other
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import re
+import sys
+
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3, 'T': 1024**4, 'P': 1024**5, 'E': 1024**6}
+
+def convert_size_to_bytes(size_string, unit_bytes=1):
+    '''
+    Converts a size string like df -h output (512M, 1.5G, 4.0K, 0) to an integer number of bytes. Sizes
+    without a unit suffix are multiplied by unit_bytes, use 1024 for values in KiB like free -k output.
+
+    Args:        size_string (String) - The size string to convert
+                unit_bytes (Int) - Bytes per unit for sizes without a suffix
+    Returns:    Integer bytes or None if size_string is not a size
+    '''
+    size_match = re.match(r'^([0-9]+(?:[.,][0-9]+)?)\s*([KMGTPE]?)(?:i?B)?$', str(size_string).strip(), re.IGNORECASE)
+    if size_match is None:
+        return None
+    number = float(size_match.group(1).replace(',', '.'))
+    unit = size_match.group(2).upper()
+    if unit:
+        return int(number * SIZE_UNITS[unit])
+    return int(number * unit_bytes)
+
+class FileSystem():
+    '''
+    A mounted or /etc/fstab defined file system record with sizes normalized to bytes. Size fields are None
+    when unknown. The text fields hold the values as shown by df -h or free -k for the legacy views.
+    '''
+    __slots__ = ('is_mounted', 'is_swap', 'in_fstab', 'dev_mounted', 'dev_fstab', 'mount_point', 'fs_type',
+        'mount_options', 'fstab_options', 'fs_dump', 'fs_check', 'size_text', 'used_text', 'avail_text',
+        'size_bytes', 'used_bytes', 'avail_bytes', 'percent_used')
+
+    def __init__(self, mount_point, fs_type):
+        self.is_mounted = False
+        self.is_swap = False
+        self.in_fstab = False
+        self.dev_mounted = ''
+        self.dev_fstab = ''
+        self.mount_point = mount_point
+        self.fs_type = fs_type
+        self.mount_options = ''
+        self.fstab_options = ''
+        self.fs_dump = ''
+        self.fs_check = ''
+        self.size_text = ''
+        self.used_text = ''
+        self.avail_text = ''
+        self.size_bytes = None
+        self.used_bytes = None
+        self.avail_bytes = None
+        self.percent_used = -1
+
+    @property
+    def dev_active(self):
+        if self.dev_mounted:
+            return self.dev_mounted
+        return self.dev_fstab
+
+    def __repr__(self):
+        return '{0}({1} on {2} type {3}, mounted={4})'.format(self.__class__.__name__, self.dev_active, self.mount_point, self.fs_type, self.is_mounted)
+
+class FileSystemModel():
+    '''
+    The mount, /etc/fstab, df and swap data of an archive joined into FileSystem records.
+
+    Attributes:
+        valid           = True if the mount, fstab and df sections were all found
+        filesystems     = List of FileSystem records, mounted file systems first in mount order
+        by_mount_point  = Dictionary of mount point to its last FileSystem record
+        by_device       = Dictionary of mounted or fstab device path to a list of FileSystem records
+        swap            = Dictionary of free -k swap values in KiB: total, used, free, percent_used, on
+    '''
+    def __init__(self):
+        self.valid = False
+        self.filesystems = []
+        self.by_mount_point = {}
+        self.by_device = {}
+        self.swap = {'total': 0, 'used': 0, 'free': 0, 'percent_used': 0, 'on': False}
+
+    def add(self, filesystem):
+        self.filesystems.append(filesystem)
+        self.by_mount_point[filesystem.mount_point] = filesystem
+        for device in set([filesystem.dev_mounted, filesystem.dev_fstab]):
+            if device:
+                self.by_device.setdefault(device, []).append(filesystem)
+
+    def get_mount_point(self, mount_point):
+        return self.by_mount_point.get(mount_point)
+
+    def get_device(self, device):
+        return self.by_device.get(device, [])
+
+def build_filesystem_model(section_mount, section_fstab, section_df, section_free):
+    '''
+    Joins mount command, /etc/fstab, df -h and free -k section lines into a FileSystemModel. The fstab, df
+    and swap data are indexed by mount point first, so the join is linear in the number of entries.
+    '''
+    FREE_TOTAL = 1
+    FREE_USED = 2
+    FREE_AVAIL = 3
+
+    DF_ELEMENTS_REQUIRED = 6
+    DF_LINE_WRAP = 1
+    DF_SIZE = 1
+    DF_USED = 2
+    DF_AVAIL = 3
+    DF_PERCENT_USED = 4
+    DF_MOUNT_POINT = 5
+
+    FSTAB_ELEMENTS_REQUIRED = 6
+    FSTAB_DEV = 0
+    FSTAB_MOUNT_POINT = 1
+    FSTAB_TYPE = 2
+    FSTAB_OPTIONS = 3
+    FSTAB_DUMP = 4
+    FSTAB_FSCK = 5
+
+    MNT_ELEMENTS_REQUIRED = 6
+    MNT_DEV = 0
+    MNT_MOUNT_POINT = 2
+    MNT_TYPE = 4
+    MNT_OPTIONS = 5
+
+    model = FileSystemModel()
+    if not ( section_mount and section_fstab and section_df ):
+        return model
+    model.valid = True
+
+    # swap sizes come from free -k, not the df command
+    for line_free in section_free:
+        if line_free.startswith("Swap:"):
+            entry_free = line_free.split()
+            if len(entry_free) > FREE_AVAIL:
+                model.swap['total'] = int(entry_free[FREE_TOTAL])
+                if model.swap['total'] > 0:
+                    model.swap['used'] = int(entry_free[FREE_USED])
+                    model.swap['free'] = int(entry_free[FREE_AVAIL])
+                    model.swap['percent_used'] = int(model.swap['used'] * 100 / model.swap['total'])
+                    model.swap['on'] = True
+            break
+
+    # index fstab entries by mount point, the first definition wins
+    fstab_index = {}
+    fstab_entries = []
+    for line_fstab in section_fstab:
+        entry_fstab = line_fstab.split()
+        if( len(entry_fstab) == FSTAB_ELEMENTS_REQUIRED ):
+            fstab_entries.append(entry_fstab)
+            fstab_index.setdefault(entry_fstab[FSTAB_MOUNT_POINT], entry_fstab)
+
+    # index df entries by mount point, joining lines wrapped by long device names
+    df_index = {}
+    this_entry = []
+    for line_df in section_df:
+        if line_df.startswith('Filesystem'):
+            continue
+        entry_df = line_df.replace('%', '').strip().split()
+        line_len = len(entry_df)
+        if( line_len == DF_ELEMENTS_REQUIRED ):
+            df_index[entry_df[DF_MOUNT_POINT]] = entry_df
+        elif( line_len == DF_LINE_WRAP ):
+            this_entry = entry_df
+        elif( line_len < DF_ELEMENTS_REQUIRED ):
+            this_entry.extend(entry_df)
+            if( len(this_entry) == DF_ELEMENTS_REQUIRED ):
+                df_index[this_entry[DF_MOUNT_POINT]] = this_entry
+            this_entry = []
+
+    for line_mount in section_mount:
+        entry_mount = line_mount.replace("(", '').replace(")", '').split()
+        if( len(entry_mount) != MNT_ELEMENTS_REQUIRED ): # non-standard mount entries are ignored
+            continue
+        this_fs = FileSystem(entry_mount[MNT_MOUNT_POINT], entry_mount[MNT_TYPE])
+        this_fs.is_mounted = True
+        this_fs.dev_mounted = entry_mount[MNT_DEV]
+        this_fs.mount_options = entry_mount[MNT_OPTIONS]
+        entry_fstab = fstab_index.get(this_fs.mount_point)
+        if entry_fstab is not None:
+            this_fs.in_fstab = True
+            this_fs.dev_fstab = entry_fstab[FSTAB_DEV]
+            this_fs.fstab_options = entry_fstab[FSTAB_OPTIONS]
+            this_fs.fs_dump = entry_fstab[FSTAB_DUMP]
+            this_fs.fs_check = entry_fstab[FSTAB_FSCK]
+        entry_df = df_index.get(this_fs.mount_point)
+        if entry_df is not None:
+            this_fs.size_text = entry_df[DF_SIZE]
+            this_fs.used_text = entry_df[DF_USED]
+            this_fs.avail_text = entry_df[DF_AVAIL]
+            this_fs.size_bytes = convert_size_to_bytes(entry_df[DF_SIZE])
+            this_fs.used_bytes = convert_size_to_bytes(entry_df[DF_USED])
+            this_fs.avail_bytes = convert_size_to_bytes(entry_df[DF_AVAIL])
+            if entry_df[DF_PERCENT_USED].isdigit():
+                this_fs.percent_used = int(entry_df[DF_PERCENT_USED])
+        model.add(this_fs)
+
+    # add swap and any unmounted file systems found in /etc/fstab, an unmounted mount point defined more than
+    # once gets one record per fstab entry
+    mounted_points = set(model.by_mount_point)
+    for entry_fstab in fstab_entries:
+        mount_point = entry_fstab[FSTAB_MOUNT_POINT]
+        if mount_point in mounted_points:
+            continue
+        this_fs = FileSystem(mount_point, entry_fstab[FSTAB_TYPE])
+        this_fs.in_fstab = True
+        this_fs.dev_fstab = entry_fstab[FSTAB_DEV]
+        this_fs.fstab_options = entry_fstab[FSTAB_OPTIONS]
+        this_fs.fs_dump = entry_fstab[FSTAB_DUMP]
+        this_fs.fs_check = entry_fstab[FSTAB_FSCK]
+        if( mount_point.lower() == "swap" ): # If there is more than one swap device, the same free -k swap data is used for each
+            this_fs.is_swap = True
+            if len(section_free) > 0:
+                this_fs.is_mounted = model.swap['on']
+                this_fs.size_text = str(model.swap['total'])
+                this_fs.used_text = str(model.swap['used'])
+                this_fs.avail_text = str(model.swap['free'])
+                this_fs.size_bytes = model.swap['total'] * 1024
+                this_fs.used_bytes = model.swap['used'] * 1024
+                this_fs.avail_bytes = model.swap['free'] * 1024
+                this_fs.percent_used = model.swap['percent_used']
+            model.filesystems.append(this_fs)
+            model.by_device.setdefault(this_fs.dev_fstab, []).append(this_fs)
+        else:
+            model.add(this_fs)
+
+    return model
+
+SYSTEMCTL_SHOW_SECTION = re.compile(r"systemctl show '([^']+)'")
+
+def build_systemd_unit_index(sections):
+    '''
+    Builds a dictionary of unit name to its systemctl show property dictionary from an iterable of
+    (section_name, section_content) tuples. Property keys are interned because every unit repeats the
+    same few hundred keys. The first non-empty section of a unit wins.
+    '''
+    unit_index = {}
+    for section_name, section_content in sections:
+        if "systemctl show '" not in section_name or len(section_content) == 0:
+            continue
+        unit_match = SYSTEMCTL_SHOW_SECTION.search(section_name)
+        if unit_match is None or unit_match.group(1) in unit_index:
+            continue
+        unit_properties = {}
+        for line in section_content:
+            key, _, value = line.partition('=')
+            unit_properties[sys.intern(key)] = value
+        unit_index[unit_match.group(1)] = unit_properties
+    return unit_index
@@ -0,0 +1,922 @@
+'''
+Supportconfig Analysis read profiler
+
+Opt-in instrumentation of the Core and suse_core2 readers and the helper libraries. It records the file, section,
+bytes read, lines scanned, lines returned and wall time of every call, aggregated per archive and pattern, to
+find the patterns and helpers that scan the same files again and again. The memory profiler measures the
+tracemalloc peaks of patterns and helpers, and the stack sampler writes folded stacks of running patterns for
+flamegraphs.
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import sys
+import json
+import time
+import argparse
+import builtins
+import threading
+import collections
+import gc
+import bisect
+import tracemalloc
+import inspect
+import functools
+import importlib
+import contextlib
+import Core
+
+# reader name: (file parameter, section parameter, content parameter), None when the reader has no such parameter
+READERS = {
+    'Core': {
+        'loadFullFile': ('FILE_OPEN', None, 'CONTENT'),
+        'listSections': ('FILE_OPEN', None, 'CONTENT'),
+        'isFileActive': ('FILE_OPEN', None, None),
+        'getSection': ('FILE_OPEN', 'SECTION', 'CONTENT'),
+        'getRegExSection': ('FILE_OPEN', 'SECTION', 'CONTENT'),
+        'getRegExSectionRaw': ('FILE_OPEN', 'SECTION', 'CONTENT'),
+        'getExactSection': ('FILE_OPEN', 'SECTION', 'CONTENT'),
+        'iterSections': ('FILE_OPEN', None, None),
+        'getRegExSections': ('FILE_OPEN', 'SECTIONS', 'CONTENT'),
+        'getFileSectionIndex': ('FILE_OPEN', None, None),
+        'getFileSection': ('FILE_OPEN', 'SECTION', None),
+        'readSectionLines': ('FILE_OPEN', 'FILE_SECTION', None),
+        'getLogTimeIndex': ('FILE_OPEN', 'SECTION', None),
+        'iterLogRange': ('FILE_OPEN', 'SECTION', None),
+        'iterLogTimeline': (None, None, None),
+        'getLogCompaction': ('FILE_OPEN', 'SECTION', None),
+        'scanLogSection': ('FILE_OPEN', 'SECTION', None),
+        'scanLogSignatures': (None, None, None),
+        'scanCompactLogSignatures': (None, None, None),
+    },
+    'suse_core2': {
+        'is_file_active': ('file_open', None, None),
+        'get_entire_file': ('file_open', None, None),
+        'get_sections_in_file': ('file_open', None, None),
+        'get_content_section': (None, '_section', None),
+        'get_file_section': ('_file', '_section', None),
+        'iter_file_sections': ('_file', None, None),
+        'get_file_sections': ('_file', '_sections', None),
+    },
+}
+
+# every public function of these modules is profiled
+HELPER_MODULES = ('SUSE', 'HAE', 'MPIO', 'Xen', 'suse_base2')
+
+def library_functions(helper_modules=HELPER_MODULES):
+    '''
+    Returns the (module, function name, reader parameters) of every reader and helper function to profile
+    '''
+    functions = []
+    for module_name, readers in READERS.items():
+        module = importlib.import_module(module_name)
+        for function_name, parameters in readers.items():
+            functions.append((module, function_name, parameters))
+    for module_name in helper_modules:
+        module = importlib.import_module(module_name)
+        for function_name, function in list(vars(module).items()):
+            if function_name.startswith('_') or not inspect.isfunction(function) or function.__module__ != module.__name__:
+                continue
+            functions.append((module, function_name, (None, None, None)))
+    return functions
+
+# the memory profiler resets the tracemalloc peak around every measured call, which needs Python 3.9
+MEMORY_SUPPORTED = hasattr(tracemalloc, 'reset_peak')
+
+ACTIVE_FRAMES = Core.ContextVar('sca_profile_frames', default=())
+CURRENT_RUN = Core.ContextVar('sca_profile_run', default=None)
+# thread id to its (archive_id, pattern_id), for the samplers running in other threads
+RUNNING = {}
+
+@contextlib.contextmanager
+def pattern_scope(archive_id, pattern_id):
+    '''
+    Attributes the library calls of the enclosed code to archive_id and pattern_id. Without a scope, calls are
+    attributed to the Core.AnalysisContext archive and pattern id.
+    '''
+    token = CURRENT_RUN.set((archive_id, pattern_id))
+    thread_id = threading.get_ident()
+    previous = RUNNING.get(thread_id)
+    RUNNING[thread_id] = (archive_id, pattern_id)
+    try:
+        yield
+    finally:
+        if previous is None:
+            RUNNING.pop(thread_id, None)
+        else:
+            RUNNING[thread_id] = previous
+        CURRENT_RUN.reset(token)
+
+def current_run():
+    run = CURRENT_RUN.get()
+    if run is None:
+        context = Core.getContext()
+        run = (os.path.basename(context.path.rstrip('/')), context.patternId)
+    return run
+
+class CallFrame():
+    '''
+    The file reads of one profiled call still running, including the reads of the calls it makes
+    '''
+    __slots__ = ('files', 'bytes_read', 'lines_scanned')
+
+    def __init__(self):
+        self.files = set()
+        self.bytes_read = 0
+        self.lines_scanned = 0
+
+class CallStats():
+    '''
+    Totals of one (archive, pattern, function, file, section) call site. Bytes and lines include the reads of
+    nested profiled calls. Text files count characters as bytes.
+    '''
+    __slots__ = ('calls', 'seconds', 'bytes_read', 'lines_scanned', 'lines_returned')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes_read = 0
+        self.lines_scanned = 0
+        self.lines_returned = 0
+
+    def add(self, other):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.bytes_read += other.bytes_read
+        self.lines_scanned += other.lines_scanned
+        self.lines_returned += other.lines_returned
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+class FileReads():
+    '''
+    How often one archive file was opened and read by one pattern
+    '''
+    __slots__ = ('opens', 'bytes_read', 'size')
+
+    def __init__(self, size):
+        self.opens = 0
+        self.bytes_read = 0
+        self.size = size
+
+class CountingFile():
+    '''
+    File object wrapper that counts the lines and bytes read through it and adds them to the profiled calls that
+    were running when it was opened
+    '''
+    def __init__(self, file_object, frames, reads):
+        self._file = file_object
+        self._frames = frames
+        self._reads = reads
+        self._lines = 0
+        self._bytes = 0
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        for line in self._file:
+            self._lines += 1
+            self._bytes += len(line)
+            yield line
+
+    def __next__(self):
+        line = next(self._file)
+        self._lines += 1
+        self._bytes += len(line)
+        return line
+
+    def readline(self, *args):
+        line = self._file.readline(*args)
+        if line:
+            self._lines += 1
+            self._bytes += len(line)
+        return line
+
+    def readlines(self, *args):
+        lines = self._file.readlines(*args)
+        self._lines += len(lines)
+        self._bytes += sum(len(line) for line in lines)
+        return lines
+
+    def read(self, *args):
+        data = self._file.read(*args)
+        self._lines += data.count(b'\n' if isinstance(data, bytes) else '\n')
+        self._bytes += len(data)
+        return data
+
+    def flush_counts(self):
+        if self._lines or self._bytes:
+            for frame in self._frames:
+                frame.bytes_read += self._bytes
+                frame.lines_scanned += self._lines
+            self._reads.bytes_read += self._bytes
+            self._lines = 0
+            self._bytes = 0
+
+    def close(self):
+        self.flush_counts()
+        self._file.close()
+
+    def __del__(self):
+        self.flush_counts()
+
+def count_items(value):
+    if isinstance(value, (list, dict, tuple, set, str)):
+        return len(value)
+    return 0
+
+def label(value, limit=80):
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        value = '|'.join(str(item) for item in value)
+    elif not isinstance(value, str):
+        value = getattr(value, 'name', None) or str(value)
+    return value if len(value) <= limit else value[:limit - 3] + '...'
+
+class ReadProfiler():
+    '''
+    Wraps the library readers and helpers to record every call. Nothing is wrapped until install() is called,
+    so the libraries run at full speed unless profiling was asked for.
+
+    Example:
+    profiler = sca_profile.enable()
+    with sca_profile.pattern_scope('scc_node1_240101_1200', 'pattern.py'):
+        SUSE.getFileSystems()
+    sca_profile.disable()
+    print(profiler.report())
+    '''
+    def __init__(self):
+        self.calls = {}
+        self.file_reads = {}
+        self._originals = []
+
+    def install(self, helper_modules=HELPER_MODULES):
+        if self._originals:
+            return
+        for module, function_name, parameters in library_functions(helper_modules):
+            self._wrap(module, function_name, parameters)
+        for module_name in tuple(READERS) + tuple(helper_modules):
+            module = importlib.import_module(module_name)
+            self._originals.append((module, 'open', vars(module).get('open')))
+            module.open = self._open
+
+    def uninstall(self):
+        for module, name, original in reversed(self._originals):
+            if original is None:
+                delattr(module, name)
+            else:
+                setattr(module, name, original)
+        self._originals = []
+
+    def _open(self, file, *args, **kwargs):
+        file_object = builtins.open(file, *args, **kwargs)
+        frames = ACTIVE_FRAMES.get()
+        if not frames or not isinstance(file, (str, bytes, os.PathLike)):
+            return file_object
+        name = os.path.basename(os.fsdecode(file))
+        for frame in frames:
+            frame.files.add(name)
+        archive_id, pattern_id = current_run()
+        key = (archive_id, pattern_id, name)
+        reads = self.file_reads.get(key)
+        if reads is None:
+            try:
+                size = os.fstat(file_object.fileno()).st_size
+            except (OSError, ValueError):
+                size = 0
+            reads = self.file_reads[key] = FileReads(size)
+        reads.opens += 1
+        return CountingFile(file_object, frames, reads)
+
+    def _wrap(self, module, function_name, parameters):
+        function = getattr(module, function_name, None)
+        if function is None or hasattr(function, '__sca_profiled__'):
+            return
+        qualified_name = '{}.{}'.format(module.__name__, function_name)
+        signature = inspect.signature(function)
+        file_parameter, section_parameter, content_parameter = parameters
+        profiler = self
+
+        def finish(frame, elapsed, args, kwargs, result, returned=None):
+            arguments = {}
+            if file_parameter or section_parameter or content_parameter:
+                try:
+                    arguments = signature.bind_partial(*args, **kwargs).arguments
+                except TypeError:
+                    pass
+            file_label = arguments.get(file_parameter) if file_parameter else None
+            file_label = os.path.basename(str(file_label)) if file_label else ','.join(sorted(frame.files))
+            if returned is None:
+                returned = count_items(result)
+                if not returned and content_parameter:
+                    returned = count_items(arguments.get(content_parameter))
+            archive_id, pattern_id = current_run()
+            key = (archive_id, pattern_id, qualified_name, file_label, label(arguments.get(section_parameter) if section_parameter else None))
+            stats = profiler.calls.get(key)
+            if stats is None:
+                stats = profiler.calls[key] = CallStats()
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.bytes_read += frame.bytes_read
+            stats.lines_scanned += frame.lines_scanned
+            stats.lines_returned += returned
+
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def profiled(*args, **kwargs):
+                frame = CallFrame()
+                iterator = function(*args, **kwargs)
+                elapsed = 0.0
+                returned = 0
+                try:
+                    while True:
+                        token = ACTIVE_FRAMES.set(ACTIVE_FRAMES.get() + (frame,))
+                        start = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            break
+                        finally:
+                            elapsed += time.perf_counter() - start
+                            ACTIVE_FRAMES.reset(token)
+                        returned += 1
+                        yield item
+                finally:
+                    iterator.close()
+                    finish(frame, elapsed, args, kwargs, None, returned)
+        else:
+            @functools.wraps(function)
+            def profiled(*args, **kwargs):
+                frame = CallFrame()
+                token = ACTIVE_FRAMES.set(ACTIVE_FRAMES.get() + (frame,))
+                start = time.perf_counter()
+                result = None
+                try:
+                    result = function(*args, **kwargs)
+                    return result
+                finally:
+                    elapsed = time.perf_counter() - start
+                    ACTIVE_FRAMES.reset(token)
+                    finish(frame, elapsed, args, kwargs, result)
+
+        profiled.__sca_profiled__ = True
+        self._originals.append((module, function_name, function))
+        setattr(module, function_name, profiled)
+
+    def totals(self, group):
+        '''
+        Returns CallStats totals grouped by 'archive', 'pattern' or 'function', most time first. Nested calls are
+        included in their callers, so the totals of different functions overlap.
+        '''
+        index = {'archive': 0, 'pattern': 1, 'function': 2}[group]
+        totals = {}
+        for key, stats in self.calls.items():
+            total = totals.get(key[index])
+            if total is None:
+                total = totals[key[index]] = CallStats()
+            total.add(stats)
+        return sorted(totals.items(), key=lambda item: item[1].seconds, reverse=True)
+
+    def redundant_reads(self, min_ratio=1.5):
+        '''
+        Returns the (archive, pattern, file) reads where a pattern opened a file more than once and read at least
+        min_ratio times its size, most bytes first
+        '''
+        redundant = []
+        for (archive_id, pattern_id, file_name), reads in self.file_reads.items():
+            if reads.opens > 1 and reads.size and reads.bytes_read >= reads.size * min_ratio:
+                redundant.append({'archive_id': archive_id, 'pattern_id': pattern_id, 'file': file_name, 'opens': reads.opens,
+                    'bytes_read': reads.bytes_read, 'size': reads.size, 'ratio': reads.bytes_read / float(reads.size)})
+        return sorted(redundant, key=lambda entry: entry['bytes_read'], reverse=True)
+
+    def as_dict(self):
+        return {
+            'calls': [dict(zip(('archive_id', 'pattern_id', 'function', 'file', 'section'), key), **stats.as_dict()) for key, stats in self.calls.items()],
+            'file_reads': [{'archive_id': key[0], 'pattern_id': key[1], 'file': key[2], 'opens': reads.opens, 'bytes_read': reads.bytes_read, 'size': reads.size} for key, reads in self.file_reads.items()],
+            'redundant_reads': self.redundant_reads(),
+        }
+
+    def dump(self, destination):
+        '''
+        Writes every call site, file read and redundant read as JSON
+        '''
+        with open(destination, 'w') as output:
+            json.dump(self.as_dict(), output, indent=1)
+
+    def report(self, limit=20):
+        '''
+        Returns a text report of the slowest patterns, archives and functions and the redundant file reads
+        '''
+        lines = []
+        header = '{:<48} {:>7} {:>10} {:>12} {:>12} {:>12}'.format('', 'Calls', 'Seconds', 'MiB read', 'Scanned', 'Returned')
+        for group in ('pattern', 'archive', 'function'):
+            lines.append('')
+            lines.append(header.replace(' ' * 48, '{:<48}'.format('By ' + group), 1))
+            for name, stats in self.totals(group)[:limit]:
+                lines.append('{:<48} {:>7} {:>10.4f} {:>12.2f} {:>12} {:>12}'.format(label(name or '-', 48), stats.calls, stats.seconds,
+                    stats.bytes_read / 1048576.0, stats.lines_scanned, stats.lines_returned))
+        redundant = self.redundant_reads()
+        if redundant:
+            lines.append('')
+            lines.append('Redundant file reads')
+            for entry in redundant[:limit]:
+                lines.append('{archive_id} {pattern_id} {file}: opened {opens} times, read {ratio:.1f}x its size'.format(**entry))
+        return '\n'.join(lines).lstrip('\n') + '\n'
+
+PROFILER = None
+
+def enable(helper_modules=HELPER_MODULES):
+    '''
+    Installs a new ReadProfiler, replacing any installed one, and returns it
+    '''
+    global PROFILER
+    disable()
+    PROFILER = ReadProfiler()
+    PROFILER.install(helper_modules)
+    return PROFILER
+
+def disable():
+    '''
+    Removes the installed ReadProfiler and returns it, or None if none was installed
+    '''
+    global PROFILER
+    profiler = PROFILER
+    if profiler is not None:
+        profiler.uninstall()
+    PROFILER = None
+    return profiler
+
+# bytes of peak memory per byte of archive growth before memory counts as scaling with the archive size
+SCALING_SLOPE = 0.05
+SCALING_CORRELATION = 0.9
+
+def archive_size(archive_path):
+    '''
+    Returns the total size of the regular files in an extracted supportconfig archive
+    '''
+    total = 0
+    try:
+        for entry in os.scandir(archive_path):
+            if entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+    return total
+
+def scaling(points):
+    '''
+    Returns the (slope, correlation) of a least squares line through (archive size, bytes) points, or None when
+    there are fewer than two archive sizes
+    '''
+    sizes = [size for size, _ in points]
+    if len(set(sizes)) < 2:
+        return None
+    count = float(len(points))
+    mean_size = sum(sizes) / count
+    mean_value = sum(value for _, value in points) / count
+    covariance = sum((size - mean_size) * (value - mean_value) for size, value in points)
+    size_variance = sum((size - mean_size) ** 2 for size in sizes)
+    value_variance = sum((value - mean_value) ** 2 for _, value in points)
+    slope = covariance / size_variance
+    correlation = covariance / (size_variance * value_variance) ** 0.5 if value_variance else 0.0
+    return slope, correlation
+
+class MemoryFrame():
+    '''
+    One measured call still running: the traced memory when it started and the highest traced memory seen so far
+    '''
+    __slots__ = ('start', 'highest')
+
+    def __init__(self, start):
+        self.start = start
+        self.highest = start
+
+class MemoryProfiler():
+    '''
+    Measures the memory of every pattern and library helper with tracemalloc. For each pattern run it records the
+    peak traced memory above the memory at its start, the retained growth after the run and the allocation sites
+    of that growth, attributed to the innermost library or pattern function. The reader and helper functions are
+    wrapped to record their own peaks, nested calls included. Peaks and retained growth of the first pattern of an
+    archive include the per-archive parse caches it filled. Generator readers are not wrapped, their memory counts
+    toward their callers.
+
+    Example:
+    memory = sca_profile.enable_memory()
+    with sca_profile.measure_pattern('scc_node1_240101_1200', 'pattern.py', archive_path):
+        SUSE.getNetworkInterfaces()
+    sca_profile.disable_memory()
+    print(memory.report())
+    '''
+    def __init__(self, frames=16, top_sites=10):
+        self.frames = frames
+        self.top_sites = top_sites
+        self.patterns = []
+        self.helpers = {}
+        self._stack = []
+        self._originals = []
+        self._function_lines = {}
+        self._started = False
+
+    def install(self, helper_modules=HELPER_MODULES):
+        if self._originals:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        for module, function_name, _ in library_functions(helper_modules):
+            self._wrap(module, function_name)
+        for module_name in tuple(READERS) + tuple(helper_modules):
+            module = importlib.import_module(module_name)
+            self._index_functions(module)
+
+    def uninstall(self):
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def _index_functions(self, module):
+        lines = []
+        for value in list(vars(module).values()):
+            members = [value]
+            if inspect.isclass(value) and value.__module__ == module.__name__:
+                members.extend(vars(value).values())
+            for member in members:
+                code = getattr(inspect.unwrap(member), '__code__', None) if callable(member) else None
+                if code is not None and code.co_filename == getattr(module, '__file__', None):
+                    lines.append((code.co_firstlineno, getattr(code, 'co_qualname', code.co_name)))
+        if lines and getattr(module, '__file__', None):
+            self._function_lines[module.__file__] = (module.__name__, sorted(lines))
+
+    def site_name(self, traceback, pattern_file=None):
+        '''
+        Names the innermost library or pattern function of an allocation traceback
+        '''
+        for frame in reversed(traceback):
+            if pattern_file is not None and frame.filename == pattern_file:
+                return '[{}]:{}'.format(os.path.basename(pattern_file), frame.lineno)
+            index = self._function_lines.get(frame.filename)
+            if index is None:
+                continue
+            module_name, lines = index
+            position = bisect.bisect_right(lines, (frame.lineno, chr(0x10ffff))) - 1
+            if position >= 0:
+                return '{}.{}'.format(module_name, lines[position][1])
+            return '{}:{}'.format(module_name, frame.lineno)
+        frame = traceback[-1] if len(traceback) else None
+        return '{}:{}'.format(os.path.basename(frame.filename), frame.lineno) if frame is not None else '?'
+
+    def _enter(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent.highest = max(parent.highest, peak)
+        frame = MemoryFrame(current)
+        self._stack.append(frame)
+        tracemalloc.reset_peak()
+        return frame
+
+    def _exit(self):
+        current, peak = tracemalloc.get_traced_memory()
+        frame = self._stack.pop()
+        highest = max(frame.highest, peak)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.highest = max(parent.highest, highest)
+        tracemalloc.reset_peak()
+        return highest - frame.start, current - frame.start
+
+    def _wrap(self, module, function_name):
+        function = getattr(module, function_name, None)
+        if function is None or inspect.isgeneratorfunction(function) or hasattr(function, '__sca_memory__'):
+            return
+        qualified_name = '{}.{}'.format(module.__name__, function_name)
+        profiler = self
+
+        @functools.wraps(function)
+        def measured(*args, **kwargs):
+            profiler._enter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                peak, retained = profiler._exit()
+                archive_id, pattern_id = current_run()
+                key = (archive_id, pattern_id, qualified_name)
+                stats = profiler.helpers.get(key)
+                if stats is None:
+                    stats = profiler.helpers[key] = [0, 0, 0]
+                stats[0] += 1
+                stats[1] = max(stats[1], peak)
+                stats[2] += retained
+
+        measured.__sca_memory__ = True
+        self._originals.append((module, function_name, function))
+        setattr(module, function_name, measured)
+
+    @contextlib.contextmanager
+    def measure(self, archive_id, pattern_id, archive_path=None, pattern_file=None):
+        '''
+        Measures the enclosed pattern run and adds its record to patterns
+        '''
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        self._enter()
+        try:
+            yield
+        finally:
+            peak, _ = self._exit()
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+            ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            retained = 0
+            sites = {}
+            for stat in after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'traceback'):
+                retained += stat.size_diff
+                if stat.size_diff <= 0:
+                    continue
+                name = self.site_name(stat.traceback, pattern_file)
+                sites[name] = sites.get(name, 0) + stat.size_diff
+            top = sorted(sites.items(), key=lambda item: item[1], reverse=True)[:self.top_sites]
+            self.patterns.append({
+                'archive_id': archive_id,
+                'pattern_id': pattern_id,
+                'archive_bytes': archive_size(archive_path) if archive_path else 0,
+                'peak': peak,
+                'retained': retained,
+                'sites': [{'site': name, 'bytes': size} for name, size in top],
+            })
+
+    def scaling(self):
+        '''
+        Returns the patterns and helpers whose peak memory grows with the archive size, steepest first. Each needs
+        results from archives of at least two sizes.
+        '''
+        sizes = {}
+        for record in self.patterns:
+            sizes[record['archive_id']] = record['archive_bytes']
+        points = {}
+        for record in self.patterns:
+            points.setdefault(('pattern', record['pattern_id']), []).append((record['archive_bytes'], record['peak']))
+        helper_peaks = {}
+        for (archive_id, _, function_name), stats in self.helpers.items():
+            key = (function_name, archive_id)
+            helper_peaks[key] = max(helper_peaks.get(key, 0), stats[1])
+        for (function_name, archive_id), peak in helper_peaks.items():
+            if archive_id in sizes:
+                points.setdefault(('helper', function_name), []).append((sizes[archive_id], peak))
+        flagged = []
+        for (kind, name), values in points.items():
+            fit = scaling(values)
+            if fit is not None and fit[0] >= SCALING_SLOPE and fit[1] >= SCALING_CORRELATION:
+                flagged.append({'kind': kind, 'name': name, 'slope': fit[0], 'correlation': fit[1], 'archives': len(values),
+                    'largest_peak': max(value for _, value in values)})
+        return sorted(flagged, key=lambda entry: entry['slope'], reverse=True)
+
+    def as_dict(self):
+        return {
+            'patterns': self.patterns,
+            'helpers': [{'archive_id': key[0], 'pattern_id': key[1], 'function': key[2], 'calls': stats[0], 'peak': stats[1], 'retained': stats[2]}
+                for key, stats in self.helpers.items()],
+            'scaling': self.scaling(),
+        }
+
+    def dump(self, destination):
+        with open(destination, 'w') as output:
+            json.dump(self.as_dict(), output, indent=1)
+
+    def report(self, limit=20):
+        '''
+        Returns a text report of the patterns and helpers with the highest peaks and of memory that scales with
+        the archive size
+        '''
+        mib = 1048576.0
+        lines = ['{:<40} {:<30} {:>10} {:>12} {:>12}'.format('Pattern', 'Archive', 'Peak MiB', 'Retained MiB', 'Archive MiB')]
+        for record in sorted(self.patterns, key=lambda record: record['peak'], reverse=True)[:limit]:
+            lines.append('{:<40} {:<30} {:>10.2f} {:>12.2f} {:>12.2f}'.format(label(record['pattern_id'], 40), label(record['archive_id'], 30),
+                record['peak'] / mib, record['retained'] / mib, record['archive_bytes'] / mib))
+            for site in record['sites'][:3]:
+                lines.append('    {:<60} {:>12.2f}'.format(label(site['site'], 60), site['bytes'] / mib))
+        helper_peaks = {}
+        for (_, _, function_name), stats in self.helpers.items():
+            helper_peaks[function_name] = max(helper_peaks.get(function_name, 0), stats[1])
+        lines.append('')
+        lines.append('{:<60} {:>10}'.format('Helper', 'Peak MiB'))
+        for function_name, peak in sorted(helper_peaks.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            lines.append('{:<60} {:>10.2f}'.format(label(function_name, 60), peak / mib))
+        flagged = self.scaling()
+        if flagged:
+            lines.append('')
+            lines.append('Memory scaling with archive size')
+            for entry in flagged[:limit]:
+                lines.append('{kind} {name}: {slope:.3f} bytes per archive byte over {archives} archives (r={correlation:.2f})'.format(**entry))
+        return '\n'.join(lines) + '\n'
+
+MEMORY_PROFILER = None
+
+def enable_memory(helper_modules=HELPER_MODULES, frames=16):
+    '''
+    Installs a new MemoryProfiler, replacing any installed one, and returns it. Raises RuntimeError before
+    Python 3.9.
+    '''
+    global MEMORY_PROFILER
+    if not MEMORY_SUPPORTED:
+        raise RuntimeError('The memory profiler needs tracemalloc.reset_peak from Python 3.9 or later')
+    disable_memory()
+    MEMORY_PROFILER = MemoryProfiler(frames)
+    MEMORY_PROFILER.install(helper_modules)
+    return MEMORY_PROFILER
+
+def disable_memory():
+    '''
+    Removes the installed MemoryProfiler and returns it, or None if none was installed
+    '''
+    global MEMORY_PROFILER
+    profiler = MEMORY_PROFILER
+    if profiler is not None:
+        profiler.uninstall()
+    MEMORY_PROFILER = None
+    return profiler
+
+def measure_pattern(archive_id, pattern_id, archive_path=None, pattern_file=None):
+    '''
+    Returns a context manager measuring the memory of the enclosed pattern run when a MemoryProfiler is installed
+    '''
+    if MEMORY_PROFILER is None:
+        return contextlib.suppress() # a context manager doing nothing, contextlib.nullcontext needs Python 3.7
+    return MEMORY_PROFILER.measure(archive_id, pattern_id, archive_path, pattern_file)
+
+# frames of these source files end a sampled stack, the runner is not part of the pattern
+SAMPLE_STOP_FILES = ('sca_runner.py',)
+# (module, function) of the timing, profiling and tracing wrappers left out of sampled stacks, the counting file
+# methods of the read profiler included
+SAMPLE_SKIP_FRAMES = (('Core', 'timed'), ('sca_profile', 'profiled'), ('sca_profile', 'measured'), ('sca_trace', 'traced'),
+    ('sca_trace', 'trace_generator'), ('sca_profile', '__iter__'), ('sca_profile', '__next__'), ('sca_profile', 'readline'),
+    ('sca_profile', 'readlines'), ('sca_profile', 'read'))
+# samples inside any other function of these modules are the profilers and the tracer at work and are dropped
+SAMPLE_OVERHEAD_MODULES = ('sca_profile', 'sca_trace', 'tracemalloc')
+
+class StackSampler():
+    '''
+    Samples the Python stack of one thread every interval seconds from a background thread, while that thread
+    runs inside pattern_scope. Each sample is counted as a folded stack, the frames from the pattern down to the
+    library function separated by semicolons, ready for flamegraph rendering. Library frames are named
+    module.function, like SUSE.getFileSystems or Core.getRegExSection, and pattern code frames are named by the
+    pattern id in brackets, like [pattern.py] or [pattern.py]:function. The wrappers of the read profiler, the memory
+    profiler and the tracer are left out of the stacks, and samples taken while they do their own bookkeeping are
+    counted as dropped instead.
+
+    Example:
+    sampler = sca_profile.StackSampler(0.005)
+    sampler.start()
+    with sca_profile.pattern_scope('scc_node1_240101_1200', 'pattern.py'):
+        SUSE.getFileSystems()
+    sampler.stop()
+    sampler.write_folded('/var/tmp/sca.folded')
+    '''
+    def __init__(self, interval=0.01, thread_id=None, include_pattern=True):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.include_pattern = include_pattern
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.dropped = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sca-stack-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        '''
+        Takes one sample of the sampled thread, if it is running a pattern
+        '''
+        run = RUNNING.get(self.thread_id)
+        frame = sys._current_frames().get(self.thread_id)
+        if run is None or frame is None:
+            return
+        pattern_id = run[1] or '-'
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            if os.path.basename(code.co_filename) in SAMPLE_STOP_FILES:
+                break
+            module = frame.f_globals.get('__name__', '?')
+            if (module, code.co_name) not in SAMPLE_SKIP_FRAMES:
+                if module in SAMPLE_OVERHEAD_MODULES:
+                    self.dropped += 1
+                    return
+                function = getattr(code, 'co_qualname', code.co_name)
+                if module == '__main__':
+                    if self.include_pattern:
+                        names.append('[' + pattern_id + ']' + ('' if function == '<module>' else ':' + function))
+                else:
+                    names.append(module + '.' + function)
+            frame = frame.f_back
+        del frame
+        if names:
+            names.reverse()
+            self.stacks[';'.join(name.replace(';', ',') for name in names)] += 1
+            self.samples += 1
+
+    def write_folded(self, destination, merge=True):
+        '''
+        Writes the folded stacks to destination, adding the counts already in it when merge is True
+        '''
+        stacks = collections.Counter(self.stacks)
+        if merge and os.path.exists(destination):
+            stacks.update(read_folded(destination))
+        with open(destination, 'w') as output:
+            for stack, count in sorted(stacks.items()):
+                output.write('{} {}\n'.format(stack, count))
+
+def read_folded(source):
+    '''
+    Returns a Counter of the folded stacks in a folded stack file
+    '''
+    stacks = collections.Counter()
+    with open(source) as folded:
+        for line in folded:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+def merge_folded(sources, destination):
+    '''
+    Sums the folded stack files in sources into destination and returns the number of samples
+    '''
+    stacks = collections.Counter()
+    for source in sources:
+        stacks.update(read_folded(source))
+    with open(destination, 'w') as output:
+        for stack, count in sorted(stacks.items()):
+            output.write('{} {}\n'.format(stack, count))
+    return sum(stacks.values())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merges folded stack files written by the sca_runner sampler')
+    parser.add_argument('sources', nargs='+', help='Folded stack files')
+    parser.add_argument('-o', '--output', required=True, help='Merged folded stack file')
+    parser.add_argument('-l', '--library', action='store_true', help='Drop the pattern frames to merge library time across patterns')
+    options = parser.parse_args(argv)
+    if options.library:
+        stacks = collections.Counter()
+        for source in options.sources:
+            for stack, count in read_folded(source).items():
+                frames = [frame for frame in stack.split(';') if not frame.startswith('[')]
+                if frames:
+                    stacks[';'.join(frames)] += count
+        with open(options.output, 'w') as output:
+            for stack, count in sorted(stacks.items()):
+                output.write('{} {}\n'.format(stack, count))
+        samples = sum(stacks.values())
+    else:
+        samples = merge_folded(options.sources, options.output)
+    print('{}: {} samples'.format(options.output, samples))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+'''
+Supportconfig Analysis Library for pattern results
+
+Unified Gen1 and Gen2 pattern result records and streaming result sinks for batch and fleet runs
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import json
+import struct
+
+SCHEMA_VERSION = 1
+BINARY_MAGIC = b'SCARES1\n'
+BINARY_LENGTH = struct.Struct('>I')
+
+RESULT_KEYS = ('schema', 'archive_id', 'pattern_id', 'generation', 'class', 'category', 'component', 'severity', 'description', 'primary_solution', 'solution_links', 'started', 'duration', 'error')
+
+def new_result(archive_id='', pattern_id='', generation=0):
+    '''
+    Returns an empty result record dictionary with every RESULT_KEYS key. Result records are plain
+    dictionaries so they serialize as they are.
+
+    Record keys
+        schema (Int) - The record schema version
+        archive_id (String) - The supportconfig archive name
+        pattern_id (String) - The pattern file name
+        generation (Int) - 1 for Core patterns and 2 for SCAPatternGen2 patterns
+        class, category, component (String) - The pattern metadata
+        severity (Int) - The pattern result status, like Core.WARN or core.WARN
+        description (String) - The pattern result message
+        primary_solution (String) - The solution_links key of the primary link
+        solution_links (Dictionary) - Link tag to URL
+        started (Float) - Epoch seconds when the pattern started
+        duration (Float) - Seconds the pattern ran
+        error (String) - Why the pattern did not return a result, empty if it did
+    '''
+    return {
+        'schema': SCHEMA_VERSION,
+        'archive_id': archive_id,
+        'pattern_id': pattern_id,
+        'generation': generation,
+        'class': '',
+        'category': '',
+        'component': '',
+        'severity': -2,
+        'description': '',
+        'primary_solution': '',
+        'solution_links': {},
+        'started': 0.0,
+        'duration': 0.0,
+        'error': '',
+    }
+
+def parse_gen1_links(other_links):
+    '''
+    Converts the Gen1 OTHER_LINKS string, META_LINK_<TAG>=<URL> pairs separated by |, to a dictionary of tag to URL
+    '''
+    links = {}
+    for link in other_links.split('|'):
+        key, _, value = link.partition('=')
+        if key.startswith('META_LINK_') and value:
+            links[key[len('META_LINK_'):]] = value
+    return links
+
+def result_from_gen1_context(context, archive_id='', pattern_id=''):
+    '''
+    Builds a result record from a Core.AnalysisContext after a Gen1 pattern ran in it
+    '''
+    result = new_result(archive_id, pattern_id, 1)
+    result['class'] = context.metaClass
+    result['category'] = context.metaCategory
+    result['component'] = context.metaComponent
+    result['severity'] = context.overall
+    result['description'] = context.overallInfo
+    result['primary_solution'] = context.primaryLink.replace('META_LINK_', '')
+    result['solution_links'] = parse_gen1_links(context.otherLinks)
+    if context.patternId and not pattern_id:
+        result['pattern_id'] = context.patternId
+    return result
+
+def result_from_gen1_output(line, archive_id='', pattern_id=''):
+    '''
+    Builds a result record from the Core.printPatternResults output line of a Gen1 pattern, or returns None if
+    line is not a Gen1 result
+    '''
+    if not line.startswith('META_CLASS='):
+        return None
+    values = {}
+    links = []
+    for part in line.rstrip('\n').split('|'):
+        key, _, value = part.partition('=')
+        if key.startswith('META_LINK_'):
+            links.append(part)
+        else:
+            values[key] = value
+    result = new_result(archive_id, pattern_id or values.get('PATTERN_ID', ''), 1)
+    result['class'] = values.get('META_CLASS', '')
+    result['category'] = values.get('META_CATEGORY', '')
+    result['component'] = values.get('META_COMPONENT', '')
+    try:
+        result['severity'] = int(values.get('OVERALL', '-2'))
+    except ValueError:
+        result['error'] = 'Invalid OVERALL value: {}'.format(values.get('OVERALL'))
+    result['description'] = values.get('OVERALL_INFO', '')
+    result['primary_solution'] = values.get('PRIMARY_LINK', '').replace('META_LINK_', '')
+    result['solution_links'] = parse_gen1_links('|'.join(links))
+    return result
+
+def result_from_gen2_meta(meta, archive_id='', pattern_id=''):
+    '''
+    Builds a result record from a SCAPatternGen2 meta result, or the dictionary print_results prints for it
+    '''
+    result = new_result(archive_id or meta.get('scname', ''), pattern_id or meta.get('id', ''), 2)
+    for key in ('class', 'category', 'component', 'severity', 'description', 'primary_solution'):
+        if key in meta:
+            result[key] = meta[key]
+    result['solution_links'] = dict(meta.get('solution_links', {}))
+    return result
+
+def result_from_gen2_output(line, archive_id='', pattern_id=''):
+    '''
+    Builds a result record from the SCAPatternGen2.print_results output line, or returns None if line is not
+    a Gen2 result
+    '''
+    line = line.strip()
+    if not line.startswith('{'):
+        return None
+    try:
+        meta = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(meta, dict) or meta.get('generation') != 2:
+        return None
+    return result_from_gen2_meta(meta, archive_id, pattern_id)
+
+def result_from_output(output, archive_id='', pattern_id=''):
+    '''
+    Builds a result record from the captured stdout of a Gen1 or Gen2 pattern. The last result line wins, the
+    same as the collectors have always read it. Returns None if output has no result line.
+    '''
+    for line in reversed(output.splitlines()):
+        result = result_from_gen1_output(line, archive_id, pattern_id)
+        if result is None:
+            result = result_from_gen2_output(line, archive_id, pattern_id)
+        if result is not None:
+            return result
+    return None
+
+class ResultSink():
+    '''
+    Writes result records to a file as newline delimited JSON (ndjson) or as length prefixed binary records
+    (binary). Records are buffered and written in batches, so a fleet run costs one write call per batch_size
+    results instead of one process output capture per pattern. Use read_results to read them back.
+
+    The binary format is BINARY_MAGIC followed by records of a 4 byte big endian length and that many bytes of
+    UTF-8 JSON. It lets readers skip records without scanning for line ends.
+
+    Example:
+    with sca_results.ResultSink('/var/tmp/results.ndjson') as sink:
+        sink.write(sca_results.result_from_output(output, 'scc_node1_240101_1200', 'pattern.py'))
+    '''
+    FORMATS = ('ndjson', 'binary')
+
+    def __init__(self, destination, result_format='ndjson', batch_size=256, append=True):
+        if result_format not in self.FORMATS:
+            raise ValueError('Invalid result format: {}'.format(result_format))
+        self.result_format = result_format
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch = []
+        if hasattr(destination, 'write'):
+            self._file = destination
+            self._owned = False
+        else:
+            is_new = not (append and os.path.exists(destination) and os.path.getsize(destination) > 0)
+            self._file = open(destination, 'ab' if append else 'wb')
+            self._owned = True
+            if is_new and result_format == 'binary':
+                self._file.write(BINARY_MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def encode(self, result):
+        payload = json.dumps(result, separators=(',', ':'), default=str).encode('utf-8')
+        if self.result_format == 'binary':
+            return BINARY_LENGTH.pack(len(payload)) + payload
+        return payload + b'\n'
+
+    def write(self, result):
+        '''
+        Adds a result record to the sink
+        '''
+        self._batch.append(self.encode(result))
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, results):
+        '''
+        Adds every result record of an iterable to the sink
+        '''
+        for result in results:
+            self.write(result)
+
+    def flush(self):
+        '''
+        Writes the buffered records to the destination
+        '''
+        if self._batch:
+            self._file.write(b''.join(self._batch))
+            self._batch = []
+        self._file.flush()
+
+    def close(self):
+        '''
+        Flushes the buffered records and closes the destination if the sink opened it
+        '''
+        if self._file is None:
+            return
+        self.flush()
+        if self._owned:
+            self._file.close()
+        self._file = None
+
+def read_results(source):
+    '''
+    Reads result records written by ResultSink in either format, one record at a time
+
+    Args:        source (String) - The result file
+    Returns:    Generator of result record dictionaries
+    '''
+    with open(source, 'rb') as result_file:
+        magic = result_file.read(len(BINARY_MAGIC))
+        if magic == BINARY_MAGIC:
+            while True:
+                header = result_file.read(BINARY_LENGTH.size)
+                if len(header) < BINARY_LENGTH.size:
+                    break
+                (length,) = BINARY_LENGTH.unpack(header)
+                payload = result_file.read(length)
+                if len(payload) < length:
+                    break
+                yield json.loads(payload.decode('utf-8'))
+        else:
+            result_file.seek(0)
+            for line in result_file:
+                if line.strip():
+                    yield json.loads(line.decode('utf-8'))
@@ -0,0 +1,242 @@
+'''
+Supportconfig Analysis pattern runner
+
+Runs Gen1 and Gen2 python patterns in one process against one or more supportconfig archives and streams
+their results to a result sink
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+import Core
+import suse_core2 as core
+import sca_results
+import sca_warehouse
+import sca_profile
+import sca_trace
+
+compiled_patterns = {}
+
+def load_pattern(pattern_file):
+    '''
+    Returns the (code, generation) of a pattern file, compiled once per process. Patterns using
+    SCAPatternGen2 are generation 2, all others generation 1.
+    '''
+    if pattern_file not in compiled_patterns:
+        with open(pattern_file, 'r', errors='ignore') as source_file:
+            source = source_file.read()
+        generation = 2 if ('SCAPatternGen2' in source or 'suse_base2' in source) else 1
+        compiled_patterns[pattern_file] = (compile(source, pattern_file, 'exec'), generation)
+    return compiled_patterns[pattern_file]
+
+def get_archive_id(archive_path):
+    return os.path.basename(archive_path.rstrip('/'))
+
+def run_pattern(pattern_file, archive_path, archive_id=None):
+    '''
+    Runs one pattern file against one extracted supportconfig archive in this process and returns its result
+    record. Gen1 patterns get -p archive_path and Gen2 patterns get archive_path as their first argument, the
+    same as when they run on their own. Patterns run one at a time because they share sys.argv and stdout,
+    but every Gen1 pattern gets its own Core.AnalysisContext, so no result state leaks between them. Parsed
+    supportconfig files are shared by all patterns of the same archive.
+
+    Args:        pattern_file (String) - The pattern file path
+                archive_path (String) - The extracted supportconfig archive path
+                archive_id (String) - The archive name for the result record, the archive directory name if None
+    Returns:    Result record dictionary, see sca_results.new_result
+    '''
+    if archive_id is None:
+        archive_id = get_archive_id(archive_path)
+    pattern_id = os.path.basename(pattern_file)
+    started = time.time()
+    start_counter = time.perf_counter()
+    error = ''
+    output = io.StringIO()
+    saved_argv = sys.argv
+    try:
+        code, generation = load_pattern(pattern_file)
+    except (OSError, SyntaxError) as load_error:
+        result = sca_results.new_result(archive_id, pattern_id)
+        result['error'] = 'Cannot load pattern: {}'.format(load_error)
+        result['started'] = started
+        return result
+    if generation == 2:
+        sys.argv = [pattern_file, archive_path]
+    else:
+        sys.argv = [pattern_file, '-p', archive_path]
+    with Core.analysisContext(archive_path) as context, sca_profile.pattern_scope(archive_id, pattern_id), \
+            sca_trace.record_pattern(archive_id, pattern_id, archive_path):
+        measure = sca_profile.measure_pattern(archive_id, pattern_id, archive_path, pattern_file)
+        try:
+            # the exit exception is handled inside the measurement so its traceback does not keep the pattern alive
+            with measure:
+                try:
+                    with contextlib.redirect_stdout(output):
+                        exec(code, {'__name__': '__main__', '__file__': pattern_file})
+                except SystemExit:
+                    pass
+        except SystemExit:
+            pass
+        except Exception as run_error:
+            error = '{}: {}'.format(run_error.__class__.__name__, run_error)
+        finally:
+            sys.argv = saved_argv
+        duration = time.perf_counter() - start_counter
+        # Gen1 patterns log themselves when they print their result
+        if context.started is not None or generation == 2:
+            if duration >= Core.SLOW_CALLS.patternThreshold:
+                context.patternId = context.patternId or pattern_id
+                Core.logSlowCall('pattern', pattern_id, duration, (archive_path,))
+
+    result = None
+    if generation == 1 and context.metaClass:
+        result = sca_results.result_from_gen1_context(context, archive_id, pattern_id)
+    else:
+        result = sca_results.result_from_output(output.getvalue(), archive_id, pattern_id)
+    if result is None:
+        result = sca_results.new_result(archive_id, pattern_id, generation)
+        if not error:
+            lines = output.getvalue().strip().splitlines()
+            error = 'No pattern result' + (': ' + lines[-1] if lines else '')
+    if error and not result['error']:
+        result['error'] = error
+    result['started'] = started
+    result['duration'] = duration
+    return result
+
+def clear_archive(archive_path):
+    '''
+    Releases everything the libraries parsed from archive_path
+    '''
+    Core.clearArchiveCache(archive_path)
+    core.clear_archive_cache(archive_path)
+    core.clear_archive_cache(archive_path.rstrip('/') + '/')
+
+def run_patterns(pattern_files, archive_paths, sink=None, warehouse=None):
+    '''
+    Runs every pattern against every archive, one archive at a time so each archive is parsed once and released
+    before the next one. Results are written to sink and warehouse when given and are also yielded.
+
+    Args:        pattern_files (List) - Pattern file paths
+                archive_paths (List) - Extracted supportconfig archive paths
+                sink (sca_results.ResultSink) - Where to write the results, or None
+                warehouse (sca_warehouse.ResultWarehouse) - Where to store the archive facts and results, or None
+    Returns:    Generator of result record dictionaries
+    '''
+    for archive_path in archive_paths:
+        archive_id = get_archive_id(archive_path)
+        if warehouse is not None:
+            warehouse.add_archive(sca_warehouse.get_archive_facts(archive_path, archive_id))
+        try:
+            for pattern_file in pattern_files:
+                result = run_pattern(pattern_file, archive_path, archive_id)
+                if sink is not None:
+                    sink.write(result)
+                if warehouse is not None:
+                    warehouse.write(result)
+                yield result
+        finally:
+            clear_archive(archive_path)
+
+def find_patterns(paths):
+    '''
+    Expands pattern directories to the python pattern files they contain, in sorted order
+    '''
+    pattern_files = []
+    for pattern_path in paths:
+        if os.path.isdir(pattern_path):
+            for directory, _, file_names in sorted(os.walk(pattern_path)):
+                for file_name in sorted(file_names):
+                    if file_name.endswith('.py'):
+                        pattern_files.append(os.path.join(directory, file_name))
+        else:
+            pattern_files.append(pattern_path)
+    return pattern_files
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Runs SCA python patterns against supportconfig archives in one process')
+    parser.add_argument('patterns', nargs='+', help='Pattern files or directories of pattern files')
+    parser.add_argument('-p', '--archive', action='append', required=True, help='Extracted supportconfig archive path, may be repeated')
+    parser.add_argument('-o', '--output', help='Result file, - for stdout, the default without --warehouse')
+    parser.add_argument('-f', '--format', choices=sca_results.ResultSink.FORMATS, default='ndjson', help='Result file format')
+    parser.add_argument('-w', '--warehouse', help='SQLite result warehouse to store the archive facts and results in')
+    parser.add_argument('--profile', metavar='REPORT', help='Profile the library reads and write the JSON report to REPORT, a summary goes to stderr')
+    parser.add_argument('--sample', metavar='FOLDED', help='Sample the pattern stacks and add them to the folded stack file FOLDED')
+    parser.add_argument('--sample-interval', type=float, default=10.0, metavar='MS', help='Milliseconds between stack samples (default: 10)')
+    parser.add_argument('--memory', metavar='REPORT', help='Trace the pattern and helper memory and write the JSON report to REPORT, a summary goes to stderr')
+    parser.add_argument('--trace', metavar='TRACE', help='Record the library calls of every pattern run to TRACE for benchmarks/sca_replay.py')
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if options.sample and (options.profile or options.memory or options.trace):
+        parser.error('--sample cannot be combined with --profile, --memory or --trace, their wrappers would be sampled')
+    if options.memory and not sca_profile.MEMORY_SUPPORTED:
+        parser.error('--memory needs Python 3.9 or later')
+    pattern_files = find_patterns(options.patterns)
+    sink = None
+    warehouse = None
+    if options.output == '-' or (options.output is None and options.warehouse is None):
+        sink = sca_results.ResultSink(sys.stdout.buffer, options.format)
+    elif options.output:
+        sink = sca_results.ResultSink(options.output, options.format)
+    if options.warehouse:
+        warehouse = sca_warehouse.ResultWarehouse(options.warehouse)
+    if options.profile:
+        sca_profile.enable()
+    if options.memory:
+        sca_profile.enable_memory()
+    if options.trace:
+        sca_trace.enable(options.trace)
+    sampler = None
+    if options.sample:
+        sampler = sca_profile.StackSampler(options.sample_interval / 1000.0)
+        sampler.start()
+    try:
+        for result in run_patterns(pattern_files, options.archive, sink, warehouse):
+            pass
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            sampler.write_folded(options.sample)
+        sca_trace.disable()
+        memory = sca_profile.disable_memory()
+        if memory is not None:
+            memory.dump(options.memory)
+            sys.stderr.write(memory.report())
+        profiler = sca_profile.disable()
+        if profiler is not None:
+            profiler.dump(options.profile)
+            sys.stderr.write(profiler.report())
+        if sink is not None:
+            sink.close()
+        if warehouse is not None:
+            warehouse.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,437 @@
+'''
+Supportconfig Analysis call tracer
+
+Records the Core, suse_core2 and helper library calls every pattern makes, with their arguments and a digest of
+their results, and replays recorded calls against an archive. benchmarks/sca_replay.py replays the traces of real
+runs with different reader backends to compare their results and timings.
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import re
+import json
+import time
+import hashlib
+import inspect
+import functools
+import importlib
+import itertools
+import contextlib
+import Core
+import suse_base2
+import sca_profile
+
+TRACE_SCHEMA = 1
+# re.Pattern needs Python 3.7
+PATTERN_TYPE = type(re.compile(''))
+
+CURRENT_TRACE = Core.ContextVar('sca_trace_current', default=None)
+# greater than zero inside a recorded call, the library calls a helper makes are part of the helper call
+TRACE_DEPTH = Core.ContextVar('sca_trace_depth', default=0)
+
+class UnsupportedArgument(Exception):
+    '''
+    A call argument that cannot be stored in a trace and rebuilt for replay
+    '''
+    pass
+
+class SectionReference():
+    '''
+    A Core.FileSection argument of a recorded call, resolved again by name when the call is replayed
+    '''
+    __slots__ = ('name', 'line_number')
+
+    def __init__(self, name, line_number):
+        self.name = name
+        self.line_number = line_number
+
+def encode_value(value, archive_root):
+    '''
+    Returns value as JSON data that decode_value rebuilds. Paths inside the archive are stored relative to it so a
+    trace can be replayed against another archive. Lists and dictionaries are copied when the call is made, the
+    empty ones patterns pass for the readers to fill are replayed as new empty ones.
+
+    Raises:     UnsupportedArgument for values that cannot be rebuilt
+    '''
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if archive_root and (value == archive_root or value.startswith(archive_root + '/')):
+            return {'__archive__': value[len(archive_root):]}
+        return value
+    if type(value) is list:
+        return [encode_value(item, archive_root) for item in value]
+    if type(value) is tuple:
+        return {'__tuple__': [encode_value(item, archive_root) for item in value]}
+    if type(value) is dict:
+        if not value:
+            return {}
+        return {'__dict__': [[encode_value(key, archive_root), encode_value(item, archive_root)] for key, item in value.items()]}
+    if isinstance(value, suse_base2.SCAPatternGen2):
+        return {'__pattern__': True}
+    if isinstance(value, Core.FileSection):
+        return {'__file_section__': value.name, 'line': value.lineNumber}
+    raise UnsupportedArgument(type(value).__name__)
+
+def decode_value(value, archive_path):
+    '''
+    Rebuilds a value stored by encode_value for a replay against archive_path
+    '''
+    if isinstance(value, list):
+        return [decode_value(item, archive_path) for item in value]
+    if isinstance(value, dict):
+        if '__archive__' in value:
+            return archive_path.rstrip('/') + value['__archive__']
+        if '__tuple__' in value:
+            return tuple(decode_value(item, archive_path) for item in value['__tuple__'])
+        if '__dict__' in value:
+            return {decode_value(key, archive_path): decode_value(item, archive_path) for key, item in value['__dict__']}
+        if '__pattern__' in value:
+            pat = suse_base2.SCAPatternGen2('', '', '')
+            pat.set_supportconfig_path(archive_path)
+            return pat
+        if '__file_section__' in value:
+            return SectionReference(value['__file_section__'], value['line'])
+        return {}
+    return value
+
+def resolve_sections(args):
+    '''
+    Replaces the SectionReference arguments with the matching Core.FileSection of the file named by the first
+    argument, the section at the recorded line if the archive has it there or else the first one with the name
+    '''
+    for index, value in enumerate(args):
+        if not isinstance(value, SectionReference):
+            continue
+        found = None
+        for section in Core.getFileSectionIndex(args[0]):
+            if section.name == value.name:
+                if section.lineNumber == value.line_number:
+                    found = section
+                    break
+                if found is None:
+                    found = section
+        args[index] = found
+
+def update_digest(hasher, value, active=None):
+    '''
+    Adds a canonical form of value to a hashlib object. Objects are hashed by type and attributes, so equal
+    results give the same digest in every process. Sets are hashed in sorted order.
+    '''
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        hasher.update(repr(value).encode('utf-8', 'backslashreplace'))
+        hasher.update(b';')
+        return
+    if active is None:
+        active = set()
+    if id(value) in active:
+        hasher.update(b'<cycle>;')
+        return
+    active.add(id(value))
+    try:
+        if isinstance(value, (list, tuple)):
+            hasher.update(b'(' if isinstance(value, tuple) else b'[')
+            for item in value:
+                update_digest(hasher, item, active)
+            hasher.update(b')' if isinstance(value, tuple) else b']')
+        elif isinstance(value, dict):
+            hasher.update(b'{')
+            for key, item in value.items():
+                update_digest(hasher, key, active)
+                update_digest(hasher, item, active)
+            hasher.update(b'}')
+        elif isinstance(value, (set, frozenset)):
+            hasher.update(b'<set>')
+            for item_digest in sorted(digest_value(item) for item in value):
+                hasher.update(item_digest.encode('ascii'))
+            hasher.update(b';')
+        elif isinstance(value, PATTERN_TYPE):
+            update_digest(hasher, value.pattern, active)
+        elif inspect.isroutine(value) or inspect.isclass(value) or inspect.ismodule(value):
+            hasher.update(getattr(value, '__qualname__', value.__name__).encode('utf-8'))
+            hasher.update(b';')
+        else:
+            hasher.update(type(value).__qualname__.encode('utf-8'))
+            hasher.update(b'<')
+            for name in attribute_names(value):
+                if hasattr(value, name):
+                    hasher.update(name.encode('utf-8'))
+                    update_digest(hasher, getattr(value, name), active)
+            hasher.update(b'>')
+    finally:
+        active.discard(id(value))
+
+def attribute_names(value):
+    names = []
+    for klass in type(value).__mro__:
+        slots = vars(klass).get('__slots__', ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    names.extend(sorted(getattr(value, '__dict__', {})))
+    return [name for name in names if name not in ('__dict__', '__weakref__')]
+
+def digest_value(value):
+    hasher = hashlib.sha1()
+    update_digest(hasher, value)
+    return hasher.hexdigest()
+
+def call_digest(result, args, kwargs):
+    '''
+    Returns the digest of a call result together with the lists and dictionaries it was passed, which hold the
+    content of the readers that fill the CONTENT argument
+    '''
+    outputs = [value for value in itertools.chain(args, kwargs.values()) if isinstance(value, (list, dict))]
+    return digest_value((result, outputs))
+
+def new_trace(archive_id, pattern_id, archive_path):
+    return {
+        'schema': TRACE_SCHEMA,
+        'archive_id': archive_id,
+        'pattern_id': pattern_id,
+        'archive_path': os.path.abspath(archive_path) if archive_path else '',
+        'started': time.time(),
+        'calls': [],
+    }
+
+def new_call(trace, archive_root, function_name, args, kwargs):
+    '''
+    Returns the trace entry of one call and adds it to trace
+
+    Entry keys
+        function (String) - Module.function name
+        args (List), kwargs (Dictionary) - The arguments, see encode_value
+        unsupported (String) - The argument type that cannot be replayed, only present if there is one
+        digest (String) - sha1 of the result, see call_digest, None if the call raised
+        items (Int) - Items the caller took from a generator result, only present for generators and None until
+                the generator is closed
+        seconds (Float) - Seconds spent in the call, for generators the time spent producing items
+        error (String) - The exception class the call raised, None if it returned
+    '''
+    call = {'function': function_name, 'args': [], 'kwargs': {}, 'digest': None, 'seconds': 0.0, 'error': None}
+    try:
+        call['args'] = [encode_value(value, archive_root) for value in args]
+        call['kwargs'] = {key: encode_value(value, archive_root) for key, value in kwargs.items()}
+    except UnsupportedArgument as error:
+        call['args'] = []
+        call['kwargs'] = {}
+        call['unsupported'] = str(error)
+    trace['calls'].append(call)
+    return call
+
+def trace_generator(call, iterator):
+    hasher = hashlib.sha1()
+    items = 0
+    try:
+        while True:
+            token = TRACE_DEPTH.set(TRACE_DEPTH.get() + 1)
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            except BaseException as error:
+                call['error'] = error.__class__.__name__
+                raise
+            finally:
+                call['seconds'] += time.perf_counter() - start
+                TRACE_DEPTH.reset(token)
+            update_digest(hasher, item)
+            items += 1
+            yield item
+    finally:
+        iterator.close()
+        call['items'] = items
+        call['digest'] = None if call['error'] else hasher.hexdigest()
+
+class TraceRecorder():
+    '''
+    Wraps the library readers and helpers to record the calls patterns make, one trace per pattern run written as
+    a JSON line to destination. Only the calls made by the pattern itself are recorded, the library calls inside
+    a helper are part of the helper call. Calls are only recorded inside record(), and nothing is wrapped until
+    install() is called.
+
+    Example:
+    recorder = sca_trace.enable('/var/tmp/sca-trace.ndjson')
+    with sca_trace.record_pattern('scc_node1_240101_1200', 'pattern.py', archive_path):
+        SUSE.getFileSystems()
+    sca_trace.disable()
+    for trace in sca_trace.read_traces('/var/tmp/sca-trace.ndjson'):
+        print(trace['pattern_id'], len(trace['calls']))
+    '''
+    def __init__(self, destination):
+        self.destination = destination
+        self.count = 0
+        self._output = None
+        self._originals = []
+
+    def install(self, helper_modules=sca_profile.HELPER_MODULES):
+        if self._originals:
+            return
+        if self._output is None:
+            self._output = open(self.destination, 'w')
+        for module, function_name, _ in sca_profile.library_functions(helper_modules):
+            self._wrap(module, function_name)
+
+    def uninstall(self):
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+        if self._output is not None:
+            self._output.close()
+            self._output = None
+
+    def _wrap(self, module, function_name):
+        function = getattr(module, function_name, None)
+        if function is None or hasattr(function, '__sca_traced__'):
+            return
+        qualified_name = '{}.{}'.format(module.__name__, function_name)
+
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            current = CURRENT_TRACE.get()
+            if current is None or TRACE_DEPTH.get():
+                return function(*args, **kwargs)
+            trace, archive_root = current
+            call = new_call(trace, archive_root, qualified_name, args, kwargs)
+            token = TRACE_DEPTH.set(1)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as error:
+                call['error'] = error.__class__.__name__
+                raise
+            finally:
+                call['seconds'] = time.perf_counter() - start
+                TRACE_DEPTH.reset(token)
+            if inspect.isgenerator(result):
+                call['seconds'] = 0.0
+                call['items'] = None
+                return trace_generator(call, result)
+            call['digest'] = call_digest(result, args, kwargs)
+            return result
+
+        traced.__sca_traced__ = True
+        self._originals.append((module, function_name, function))
+        setattr(module, function_name, traced)
+
+    @contextlib.contextmanager
+    def record(self, archive_id, pattern_id, archive_path):
+        '''
+        Records the library calls of the enclosed pattern run and writes its trace when it ends
+        '''
+        trace = new_trace(archive_id, pattern_id, archive_path)
+        token = CURRENT_TRACE.set((trace, archive_path.rstrip('/')))
+        try:
+            yield trace
+        finally:
+            CURRENT_TRACE.reset(token)
+            if self._output is not None:
+                self._output.write(json.dumps(trace) + '\n')
+                self.count += 1
+
+TRACE_RECORDER = None
+
+def enable(destination, helper_modules=sca_profile.HELPER_MODULES):
+    '''
+    Installs a new TraceRecorder writing to destination, replacing any installed one, and returns it
+    '''
+    global TRACE_RECORDER
+    disable()
+    TRACE_RECORDER = TraceRecorder(destination)
+    TRACE_RECORDER.install(helper_modules)
+    return TRACE_RECORDER
+
+def disable():
+    '''
+    Removes the installed TraceRecorder, closing its trace file, and returns it, or None if none was installed
+    '''
+    global TRACE_RECORDER
+    recorder = TRACE_RECORDER
+    if recorder is not None:
+        recorder.uninstall()
+    TRACE_RECORDER = None
+    return recorder
+
+def record_pattern(archive_id, pattern_id, archive_path):
+    '''
+    Returns a context manager recording the library calls of the enclosed pattern run when a TraceRecorder is
+    installed
+    '''
+    if TRACE_RECORDER is None:
+        return contextlib.suppress() # a context manager doing nothing, contextlib.nullcontext needs Python 3.7
+    return TRACE_RECORDER.record(archive_id, pattern_id, archive_path)
+
+def read_traces(source):
+    '''
+    Reads the traces written by TraceRecorder, one pattern run at a time
+
+    Args:        source (String) - The trace file
+    Returns:    Generator of trace dictionaries with the keys schema, archive_id, pattern_id, archive_path,
+                started and calls, see new_call for the call entries
+    '''
+    with open(source, 'r') as trace_file:
+        for line in trace_file:
+            if line.strip():
+                yield json.loads(line)
+
+def resolve_function(function_name):
+    module_name, name = function_name.split('.', 1)
+    return getattr(importlib.import_module(module_name), name)
+
+def replay_call(call, archive_path):
+    '''
+    Runs one recorded call again against archive_path. The call runs in the current Core.AnalysisContext, which
+    must be for archive_path. Generator results are consumed as far as the pattern consumed them.
+
+    Args:        call (Dictionary) - A trace call entry without an unsupported key
+                archive_path (String) - The extracted supportconfig archive path
+    Returns:    (seconds, digest, error) tuple, digest is None and error is the exception class name if the call
+                raised
+    '''
+    function = resolve_function(call['function'])
+    args = [decode_value(value, archive_path) for value in call['args']]
+    kwargs = {key: decode_value(value, archive_path) for key, value in call['kwargs'].items()}
+    if any(isinstance(value, SectionReference) for value in args):
+        resolve_sections(args)
+    hashing = 0.0
+    digest = None
+    error = None
+    start = time.perf_counter()
+    try:
+        result = function(*args, **kwargs)
+        if inspect.isgenerator(result):
+            hasher = hashlib.sha1()
+            try:
+                for item in itertools.islice(result, call.get('items')):
+                    hash_start = time.perf_counter()
+                    update_digest(hasher, item)
+                    hashing += time.perf_counter() - hash_start
+            finally:
+                result.close()
+            seconds = time.perf_counter() - start - hashing
+            digest = hasher.hexdigest()
+        else:
+            seconds = time.perf_counter() - start
+            digest = call_digest(result, args, kwargs)
+    except (Exception, SystemExit) as raised:
+        seconds = time.perf_counter() - start - hashing
+        error = raised.__class__.__name__
+    return seconds, digest, error
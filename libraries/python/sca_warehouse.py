@@ -0,0 +1,291 @@
+'''
+Supportconfig Analysis result warehouse
+
+Stores pattern result records and archive facts from many runs in a local SQLite database and answers fleet
+questions from it
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+__author__        = 'Jason Record <jason.record@suse.com>'
+__date_modified__ = '2026 Oct 19'
+__version__       = '1.0.0'
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import Core
+import suse_base2 as suse
+import sca_results
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS archives (
+    archive_id TEXT PRIMARY KEY,
+    archive_path TEXT,
+    hostname TEXT,
+    kernel_ver TEXT,
+    arch TEXT,
+    distro_name TEXT,
+    ver_major INTEGER,
+    ver_minor INTEGER,
+    collected REAL,
+    ingested REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    result_id INTEGER PRIMARY KEY,
+    archive_id TEXT NOT NULL,
+    pattern_id TEXT NOT NULL,
+    generation INTEGER,
+    class TEXT,
+    category TEXT,
+    component TEXT,
+    severity INTEGER,
+    description TEXT,
+    primary_solution TEXT,
+    solution_links TEXT,
+    started REAL,
+    duration REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS results_pattern ON results (pattern_id, severity);
+CREATE INDEX IF NOT EXISTS results_severity ON results (severity, started);
+CREATE INDEX IF NOT EXISTS results_archive ON results (archive_id);
+CREATE INDEX IF NOT EXISTS results_started ON results (started);
+CREATE INDEX IF NOT EXISTS archives_hostname ON archives (hostname);
+CREATE INDEX IF NOT EXISTS archives_collected ON archives (collected);
+'''
+
+ARCHIVE_COLUMNS = ('archive_id', 'archive_path', 'hostname', 'kernel_ver', 'arch', 'distro_name', 'ver_major', 'ver_minor', 'collected', 'ingested')
+RESULT_COLUMNS = ('archive_id', 'pattern_id', 'generation', 'class', 'category', 'component', 'severity', 'description', 'primary_solution', 'solution_links', 'started', 'duration', 'error')
+
+INSERT_ARCHIVE = 'INSERT OR REPLACE INTO archives ({}) VALUES ({})'.format(', '.join(ARCHIVE_COLUMNS), ', '.join('?' * len(ARCHIVE_COLUMNS)))
+INSERT_RESULT = 'INSERT INTO results ({}) VALUES ({})'.format(', '.join(RESULT_COLUMNS), ', '.join('?' * len(RESULT_COLUMNS)))
+
+def get_archive_facts(archive_path, archive_id=None):
+    '''
+    Gathers the archive facts the warehouse keeps for an extracted supportconfig archive, using the same
+    get_server_info the patterns use. Missing facts are left empty.
+
+    Args:        archive_path (String) - The extracted supportconfig archive path
+                archive_id (String) - The archive name, the archive directory name if None
+    Returns:    Dictionary with the ARCHIVE_COLUMNS keys
+    '''
+    facts = dict.fromkeys(ARCHIVE_COLUMNS)
+    facts['archive_id'] = archive_id or os.path.basename(archive_path.rstrip('/'))
+    facts['archive_path'] = os.path.abspath(archive_path)
+    facts['ingested'] = time.time()
+    pat = suse.SCAPatternGen2('', '', '')
+    try:
+        pat.set_supportconfig_path(archive_path)
+        server = suse.get_server_info(pat)
+    except SystemExit:
+        server = {}
+    for key in ('hostname', 'kernel_ver', 'arch', 'distro_name', 'ver_major', 'ver_minor'):
+        facts[key] = server.get(key)
+    if os.path.exists(os.path.join(archive_path, 'basic-environment.txt')):
+        with Core.analysisContext(archive_path):
+            run_time = Core.getArchiveRunTime()
+        if run_time is not None:
+            facts['collected'] = run_time.timestamp()
+    return facts
+
+class ResultWarehouse():
+    '''
+    SQLite store of result records and archive facts. The database runs in WAL mode so queries can run while a
+    fleet run is writing, and results are inserted in batches of batch_size records per transaction. It has the
+    same write, flush and close methods as sca_results.ResultSink, and sca_runner.run_patterns adds the archive
+    facts and results of every archive it runs to it.
+
+    Example:
+    with sca_warehouse.ResultWarehouse('/var/tmp/sca.db') as warehouse:
+        for result in sca_runner.run_patterns(pattern_files, archive_paths, warehouse=warehouse):
+            pass
+        for host in warehouse.hosts_with_pattern('pattern.py', core.CRIT, time.time() - 7*86400):
+            print(host['hostname'])
+    '''
+    def __init__(self, database, batch_size=1000):
+        self.database = database
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch = []
+        self.connection = sqlite3.connect(database)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_archive(self, facts):
+        '''
+        Adds or replaces the facts of one archive, see get_archive_facts
+        '''
+        with self.connection:
+            self.connection.execute(INSERT_ARCHIVE, [facts.get(column) for column in ARCHIVE_COLUMNS])
+
+    def write(self, result):
+        '''
+        Adds a result record to the warehouse
+        '''
+        row = [result.get(column) for column in RESULT_COLUMNS]
+        row[RESULT_COLUMNS.index('solution_links')] = json.dumps(result.get('solution_links', {}))
+        self._batch.append(row)
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, results):
+        '''
+        Adds every result record of an iterable to the warehouse
+        '''
+        for result in results:
+            self.write(result)
+
+    def ingest(self, source):
+        '''
+        Adds every result record of a sca_results.ResultSink file and returns how many were added
+        '''
+        start = self.count
+        self.write_all(sca_results.read_results(source))
+        self.flush()
+        return self.count - start
+
+    def flush(self):
+        '''
+        Inserts the buffered result records in one transaction
+        '''
+        if self._batch:
+            with self.connection:
+                self.connection.executemany(INSERT_RESULT, self._batch)
+            self._batch = []
+
+    def close(self):
+        if self.connection is None:
+            return
+        self.flush()
+        self.connection.close()
+        self.connection = None
+
+    def query(self, sql, parameters=()):
+        '''
+        Runs a read query and returns its rows as dictionaries
+        '''
+        self.flush()
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def hosts_with_pattern(self, pattern_id, min_severity=Core.CRIT, since=None):
+        '''
+        Returns the hosts where pattern_id reported at least min_severity, one row per archive with the newest of
+        those results. Only results started at or after the epoch seconds since are included when since is given.
+        '''
+        # SQLite takes the bare columns of a MAX() aggregate from the row holding the maximum
+        sql = '''SELECT a.hostname, r.archive_id, r.severity, r.description, MAX(r.started) AS started
+            FROM results r LEFT JOIN archives a ON a.archive_id = r.archive_id
+            WHERE r.pattern_id = ? AND r.severity >= ? AND r.severity < ?'''
+        parameters = [pattern_id, min_severity, Core.ERROR]
+        if since is not None:
+            sql += ' AND r.started >= ?'
+            parameters.append(since)
+        sql += ' GROUP BY r.archive_id ORDER BY started DESC'
+        return self.query(sql, parameters)
+
+    def severity_counts(self, since=None):
+        '''
+        Returns the number of results per pattern and severity
+        '''
+        sql = 'SELECT pattern_id, severity, COUNT(*) AS results FROM results'
+        parameters = []
+        if since is not None:
+            sql += ' WHERE started >= ?'
+            parameters.append(since)
+        sql += ' GROUP BY pattern_id, severity ORDER BY pattern_id, severity'
+        return self.query(sql, parameters)
+
+    def top_patterns(self, min_severity=Core.WARN, limit=20, since=None):
+        '''
+        Returns the patterns reporting at least min_severity on the most archives
+        '''
+        sql = '''SELECT pattern_id, COUNT(DISTINCT archive_id) AS archives, MAX(severity) AS severity
+            FROM results WHERE severity >= ? AND severity < ?'''
+        parameters = [min_severity, Core.ERROR]
+        if since is not None:
+            sql += ' AND started >= ?'
+            parameters.append(since)
+        sql += ' GROUP BY pattern_id ORDER BY archives DESC, pattern_id LIMIT ?'
+        parameters.append(limit)
+        return self.query(sql, parameters)
+
+    def archive_summary(self, archive_id):
+        '''
+        Returns the archive facts and the results of one archive, most severe first
+        '''
+        archives = self.query('SELECT * FROM archives WHERE archive_id = ?', (archive_id,))
+        results = self.query('''SELECT pattern_id, severity, description, primary_solution, solution_links, error
+            FROM results WHERE archive_id = ? ORDER BY severity DESC, pattern_id''', (archive_id,))
+        for result in results:
+            result['solution_links'] = json.loads(result['solution_links'] or '{}')
+        return {'archive': archives[0] if archives else None, 'results': results}
+
+    def slowest_patterns(self, limit=20):
+        '''
+        Returns the patterns with the highest average run time
+        '''
+        return self.query('''SELECT pattern_id, COUNT(*) AS runs, AVG(duration) AS average, MAX(duration) AS longest
+            FROM results GROUP BY pattern_id ORDER BY average DESC LIMIT ?''', (limit,))
+
+    def failed_patterns(self, since=None):
+        '''
+        Returns the results of patterns that did not report a result
+        '''
+        sql = "SELECT archive_id, pattern_id, error, started FROM results WHERE error != ''"
+        parameters = []
+        if since is not None:
+            sql += ' AND started >= ?'
+            parameters.append(since)
+        return self.query(sql + ' ORDER BY started DESC', parameters)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Loads SCA result files into a result warehouse and queries it')
+    parser.add_argument('database', help='SQLite warehouse file')
+    parser.add_argument('-i', '--ingest', action='append', default=[], help='Result file written by sca_runner, may be repeated')
+    parser.add_argument('-p', '--pattern', help='List the hosts where this pattern reported critical')
+    parser.add_argument('-d', '--days', type=float, help='Only include results from the last number of days')
+    parser.add_argument('-t', '--top', action='store_true', help='List the patterns reporting warning or higher on the most archives')
+    options = parser.parse_args(argv)
+    since = time.time() - options.days * 86400 if options.days else None
+    with ResultWarehouse(options.database) as warehouse:
+        for source in options.ingest:
+            print('{}: {} results'.format(source, warehouse.ingest(source)))
+        rows = []
+        if options.pattern:
+            rows = warehouse.hosts_with_pattern(options.pattern, Core.CRIT, since)
+        elif options.top:
+            rows = warehouse.top_patterns(Core.WARN, 20, since)
+        for row in rows:
+            print(json.dumps(row))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
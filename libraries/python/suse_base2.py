@@ -21,16 +21,18 @@ Library of functions for creating python patterns specific to SUSE
 #
 ##############################################################################
 __author__        = 'Jason Record <jason.record@suse.com>'
-__date_modified__ = '2025 May 08'
+__date_modified__ = '2026 Oct 19'
 __version__       = '2.0.1'
 
 import re
 import os
 import sys
 import suse_core2 as core
+import sca_model
 import datetime
 import ast
 import json
+import threading
 
 # Kernel version constants
 # https://www.suse.com/support/kb/doc/?id=000019587
@@ -151,16 +153,32 @@ def get_rpm_info(package_name, _pat):
     del rpm_file
     return rpm_info
 
+class PatternResult(dict):
+    '''
+    The result record of one SCAPatternGen2 instance, the meta dictionary with the same keys and key order as
+    the former class level one. Every instance owns its record and its solution_links dictionary.
+    '''
+    def __init__(self, meta_class='', meta_category='', meta_component=''):
+        dict.__init__(self, [('generation', 2), ('id', ''), ('primary_solution', ''), ('severity', core.TEMP), ('description', ''),
+            ('solution_links', {}), ('scpath', ''), ('scname', ''), ('class', meta_class), ('category', meta_category), ('component', meta_component)])
+
+    def as_dict(self):
+        '''
+        Returns the result as a new dictionary with its own solution_links dictionary
+        '''
+        result = dict(self)
+        result['solution_links'] = dict(self['solution_links'])
+        return result
+
 class SCAPatternGen2():
     TID_BASE = 'https://www.suse.com/support/kb/doc.php?id='
     BUG_BASE = 'https://bugzilla.suse.com/show_bug.cgi?id='
     CVE_BASE = 'https://www.suse.com/security/cve/'
-    meta = {'generation': 2, 'id': '', 'primary_solution': '', 'severity': core.TEMP, 'description': '', 'solution_links': {}, 'scpath': '', 'scname': ''}
-    
+
     def __init__(self, meta_class, meta_category, meta_component):
-        self.meta['class'] = meta_class
-        self.meta['category'] = meta_category
-        self.meta['component'] = meta_component
+        # every instance owns its result, patterns may run side by side in threads of one process
+        self.meta = PatternResult(meta_class, meta_category, meta_component)
+        self._lock = threading.Lock()
 
     def __str__ (self):
         pattern = '''
@@ -186,7 +204,8 @@ Class instance of {}
 
     def add_solution_link(self, tag, url, set_primary=False):
         link_tag = str(tag)
-        self.meta['solution_links'][link_tag] = url
+        with self._lock:
+            self.meta['solution_links'][link_tag] = url
         if set_primary:
             self.set_primary_link(link_tag)
 
@@ -212,14 +231,16 @@ Class instance of {}
             sys.exit(3)
 
     def set_status(self, severity, description):
-        self.meta['severity'] = severity
-        self.meta['description'] = description
-
-    def update_status(self, severity, description):
-        if severity > self.meta['severity']:
+        with self._lock:
             self.meta['severity'] = severity
             self.meta['description'] = description
 
+    def update_status(self, severity, description):
+        with self._lock:
+            if severity > self.meta['severity']:
+                self.meta['severity'] = severity
+                self.meta['description'] = description
+
     def get_supportconfig_path(self, scfile):
         file_path = self.meta['scpath'] + scfile
         if os.path.exists(file_path):
@@ -244,25 +265,24 @@ Class instance of {}
             print('Error: Missing solution links')
             sys.exit(2)
         else:
-            output = json.dumps(self.meta)
+            output = json.dumps(self.meta.as_dict())
             print(output)
 
+def get_systemd_unit_index(_pat):
+    '''
+    Returns a dictionary of unit name to systemctl show property dictionary for every unit in systemd.txt.
+    The file is parsed once per archive.
+    '''
+    def load_systemd_unit_index():
+        return sca_model.build_systemd_unit_index(core.iter_file_sections(_pat.get_supportconfig_path('systemd.txt')))
+
+    return core.get_archive_cache(_pat.meta['scpath'], 'suse_base2.systemd_unit_index', load_systemd_unit_index)
+
 def get_systemd_service_data(service_name, _pat):
     '''
     Returns a dictionary of systemd service information for service_name
     '''
-
-    serviced_dictionary = {}
-    content = core.get_file_section(_pat.get_supportconfig_path('systemd.txt'), "systemctl show '{0}'".format(service_name))
-    if( len(content) > 0 ):
-        for line in content:
-            element = line.split('=')
-            key = element[0]
-            # remove the key from the key/value pair
-            del element[0]
-            # assign the value to the dictionary key
-            serviced_dictionary[key] = '='.join(element)
-    return serviced_dictionary
+    return dict(get_systemd_unit_index(_pat).get(service_name, {}))
 
 def evaluate_systemd_service(service_name, _pat):
     '''
@@ -306,9 +326,41 @@ def evaluate_systemd_service(service_name, _pat):
 
     return _pat
 
+def evaluate_systemd_services(service_names, _pat):
+    '''
+    Reports the health of each systemd service in the service_names list. systemd.txt is parsed once for
+    all of them.
+    '''
+    for service_name in service_names:
+        evaluate_systemd_service(service_name, _pat)
+
+    return _pat
+
+def get_filesystem_model(_pat):
+    '''
+    Returns the FileSystemModel for the _pat archive. The fs-diskio.txt and basic-health-check.txt sections
+    are parsed once per archive and the model is shared by all callers.
+
+    Args:                    SCAPattern instance
+    Returns:                 FileSystemModel instance
+    Example:
+
+    fs_model = suse_base2.get_filesystem_model(_pat)
+    root_fs = fs_model.get_mount_point('/')
+    if root_fs is not None and root_fs.avail_bytes is not None and root_fs.avail_bytes < 1024**3:
+        _pat.update_status(core.WARN, 'Less than 1GiB free on the root file system')
+    '''
+    def load_filesystem_model():
+        diskio_sections = core.get_file_sections(_pat.get_supportconfig_path('fs-diskio.txt'), ['/mount$', '/etc/fstab'])
+        health_sections = core.get_file_sections(_pat.get_supportconfig_path('basic-health-check.txt'), ['df -h', 'free -k'])
+        return sca_model.build_filesystem_model(diskio_sections.get('/mount$', []), diskio_sections.get('/etc/fstab', []), health_sections.get('df -h', []), health_sections.get('free -k', []))
+
+    return core.get_archive_cache(_pat.meta['scpath'], 'suse_base2.filesystem_model', load_filesystem_model)
+
 def get_filesystem_data(_pat):
     '''
     Gets all fields from the mounted and unmountd file systems with their associated fstab file and df command output.
+    This is the dictionary view of get_filesystem_model().
 
     Args:                    SCAPattern instance
     Returns:                 List of Dictionaries
@@ -323,196 +375,47 @@ def get_filesystem_data(_pat):
         fs_type              = File system type
         fs_dump              = /etc/fstab dump field, '' if missing
         fs_check             = /etc/fstab fsck field, '' if missing
-        space_size           = File system size in bytes, '' if missing
-        space_used           = File system space used in bytes, '' if missing
-        space_avail          = file system space available in bytes, '' if missing
+        space_size           = File system size as shown by df -h, or in KiB for swap, '' if missing
+        space_used           = File system space used as shown by df -h, or in KiB for swap, '' if missing
+        space_avail          = file system space available as shown by df -h, or in KiB for swap, '' if missing
         space_percent_used   = file system percent used, -1 if unknown
     '''
-    FREE_TOTAL = 1
-    FREE_USED = 2
-    FREE_AVAIL = 3
-
-    DF_ELEMENTS_REQUIRED = 6
-    DF_line_WRAP = 1
-    DF_DEV = 0
-    DF_SIZE = 1
-    DF_USED = 2
-    DF_AVAIL = 3
-    DF_PERCENT_USED = 4
-    DF_MOUNT_POINT = 5
-
-    FSTAB_ELEMENTS_REQUIRED = 6
-    FSTAB_DEV = 0
-    FSTAB_MOUNT_POINT = 1
-    FSTAB_TYPE = 2
-    FSTAB_OPTIONS = 3
-    FSTAB_DUMP = 4
-    FSTAB_FSCK = 5
-
-    MNT_ELEMENTS_REQUIRED = 6
-    MNT_MOUNT_POINT = 2
-    MNT_OPTIONS = 5
-    MNT_DEV = 0
-    MNT_TYPE = 4
-
-    normalized_mount = []
-    normalized_fstab = []
-    normalized_df = []
-    swap = {'total': 0, 'used': 0, 'free': 0, 'percent_used': 0, 'on': False}
-
+    fs_model = get_filesystem_model(_pat)
     fs_list = [] # this list of filesysetm dictionaries to be returned
 
-    diskio_file = core.get_entire_file(_pat.get_supportconfig_path('fs-diskio.txt'))
-    health_file = core.get_entire_file(_pat.get_supportconfig_path('basic-health-check.txt'))
-    section_mount = core.get_content_section(diskio_file, '/mount$')
-    section_fstab = core.get_content_section(diskio_file, '/etc/fstab')
-    section_df = core.get_content_section(health_file, 'df -h')
-    section_free = core.get_content_section(health_file, 'free -k')
-    del diskio_file
-    del health_file
-
-    if( len(section_mount) > 0 and len(section_fstab) > 0 and len(section_df) > 0 ):
-        # gather swap information
-        if len(section_free) > 0:
-            for line_free in section_free: #swap sizes come from free -k, not df command
-                if line_free.startswith("Swap:"):
-                    entry_free = line_free.split()
-                    swap['total'] = int(entry_free[FREE_TOTAL])
-                    if  swap['total'] > 0:
-                        swap['used'] = int(entry_free[FREE_USED])
-                        swap['free'] = int(entry_free[FREE_AVAIL])
-                        swap['percent_free'] = int(swap['used'] * 100 / swap['total'])
-                        swap['on'] = True
-                    break
-
-        # normalize mount section
-        for line_mount in section_mount: #load each mount line output into the entry list
-            line_mount = line_mount.replace("(", '').replace(")", '')
-            entry_mount = line_mount.split()
-            if( len(entry_mount) != MNT_ELEMENTS_REQUIRED ): #ignore non-standard mount entries. They should only have six fields.
-                entry_mount = []
-                continue
-            else:
-                normalized_mount.append(entry_mount)
-
-        # normalize fstab section
-        for line_fstab in section_fstab: #check each line_fstab to the current line_mount
-            entry_fstab = line_fstab.split()
-            if( len(entry_fstab) != FSTAB_ELEMENTS_REQUIRED ): #consider non-standard entries as not mount_point_matches
-                entry_fstab = []
-                continue
-            else:
-                normalized_fstab.append(entry_fstab)
-
-        # normalize df data
-        this_entry = []
-        for line_df in section_df:
-            if line_df.startswith('Filesystem'):
-                continue
-            else:
-                line_df = line_df.replace('%', '')
-                entry_df = line_df.strip().split()
-                line_len = len(entry_df)
-                if( line_len == DF_ELEMENTS_REQUIRED ):
-                    normalized_df.append(entry_df)
-                elif( line_len == DF_line_WRAP ): # Line wraps because the first field is a very long device name
-                    this_entry = entry_df
-                elif( line_len < DF_ELEMENTS_REQUIRED ): # Adds the rest of the fields to the device from the first line
-                    this_entry.extend(entry_df)
-                    if( len(this_entry) == DF_ELEMENTS_REQUIRED ):
-                        normalized_df.append(this_entry)
-
-        # combine fstab and df data with matching mounted filesystems
-        for list_mount in normalized_mount:
-            this_fs = {
-                'is_mounted': True, 
-                'dev_active': list_mount[MNT_DEV], 
-                'dev_mounted': list_mount[MNT_DEV], 
-                'mount_point': list_mount[MNT_MOUNT_POINT], 
-                'mount_options': list_mount[MNT_OPTIONS].split(','), 
-                'fs_type': list_mount[MNT_TYPE]
-            }
-            mount_point_matches = False
-            for list_fstab in normalized_fstab:
-                if( list_fstab[FSTAB_MOUNT_POINT] == list_mount[MNT_MOUNT_POINT] ): #mount points match
-                    mount_point_matches = True
-                    this_fs['dev_fstab'] = list_fstab[FSTAB_DEV]
-                    this_fs['fstab_options'] = list_fstab[FSTAB_OPTIONS].split(',')
-                    this_fs['fs_dump'] = list_fstab[FSTAB_DUMP]
-                    this_fs['fs_check'] = list_fstab[FSTAB_FSCK]
-                    break
-            if not mount_point_matches: #mounted, but not defined in /etc/fstab
-                this_fs['dev_fstab'] = ''
-                this_fs['fstab_options'] = []
-                this_fs['fs_dump'] = ''
-                this_fs['fs_check'] = ''
-
-            mount_point_matches = False
-            for list_df in normalized_df:
-                if( list_df[DF_MOUNT_POINT] == list_mount[MNT_MOUNT_POINT] ): #mount points match
-                    mount_point_matches = True
-                    this_fs['space_size'] = list_df[DF_SIZE]
-                    this_fs['space_used'] = list_df[DF_USED]
-                    this_fs['space_avail'] = list_df[DF_AVAIL]
-                    this_fs['space_percent_used'] = int(list_df[DF_PERCENT_USED])
-            if( not mount_point_matches ): #entry_df_normalized doesn't match line_mount, so use undefined values
-                this_fs['space_size'] = ''
-                this_fs['space_used'] = ''
-                this_fs['space_avail'] = ''
-                this_fs['space_percent_used'] = -1
-                
-            fs_list.append(this_fs)
-
-        #now add swap and any unmounted filesystems found in /etc/fstab
-        for list_fstab in normalized_fstab:
-            if( list_fstab[FSTAB_MOUNT_POINT].lower() == "swap" ): # If there is more than one swap device, the same free -k swap data is used for each
-                fs_list.append({
-                    'is_mounted': swap['on'], 
-                    'dev_active': list_fstab[FSTAB_DEV], 
-                    'dev_mounted': '', 
-                    'mount_point': list_fstab[FSTAB_MOUNT_POINT], 
-                    'mount_options': [], 
-                    'fs_type': list_fstab[FSTAB_TYPE], 
-                    'dev_fstab': list_fstab[FSTAB_DEV], 
-                    'fstab_options': list_fstab[FSTAB_OPTIONS].split(','), 
-                    'fs_dump': list_fstab[FSTAB_DUMP], 
-                    'fs_check': list_fstab[FSTAB_FSCK], 
-                    'space_size': swap['total'], 
-                    'space_used': swap['used'], 
-                    'space_avail': swap['free'], 
-                    'space_percent_used': swap['percent_used'] 
-                })
-            # check for unmounted filesystems
-            else:
-                found_fstab_dev = False
-                for this_fs in fs_list:
-                    if this_fs['mount_point'] == list_fstab[FSTAB_MOUNT_POINT]:
-                        found_fstab_dev = True
-                        break
-                if not found_fstab_dev:
-                    fs_list.append({
-                        'is_mounted': False, 
-                        'dev_active': list_fstab[FSTAB_DEV], 
-                        'dev_mounted': '', 
-                        'mount_point': list_fstab[FSTAB_MOUNT_POINT], 
-                        'mount_options': [], 
-                        'fs_type': list_fstab[FSTAB_TYPE], 
-                        'dev_fstab': list_fstab[FSTAB_DEV], 
-                        'fstab_options': list_fstab[FSTAB_OPTIONS].split(','), 
-                        'fs_dump': list_fstab[FSTAB_DUMP], 
-                        'fs_check': list_fstab[FSTAB_FSCK], 
-                        'space_size': '', 
-                        'space_used': '', 
-                        'space_avail': '', 
-                        'space_percent_used': -1
-                    })
-    else:
+    if not fs_model.valid:
         _pat.set_status(core.ERROR, "ERROR: get_filesystem_data: Cannot find /bin/mount(fs-diskio.txt), /etc/fstab(fs-diskio.txt), df -h(basic-health-check.txt) sections")
+        return fs_list
 
-    del section_mount
-    del section_fstab
-    del section_df
-    del section_free
+    for this_fs in fs_model.filesystems:
+        if this_fs.mount_options:
+            mount_options = this_fs.mount_options.split(',')
+        else:
+            mount_options = []
+        if this_fs.fstab_options:
+            fstab_options = this_fs.fstab_options.split(',')
+        else:
+            fstab_options = []
+        if this_fs.is_swap:
+            space = (fs_model.swap['total'], fs_model.swap['used'], fs_model.swap['free'], fs_model.swap['percent_used'])
+        else:
+            space = (this_fs.size_text, this_fs.used_text, this_fs.avail_text, this_fs.percent_used)
+        fs_list.append({
+            'is_mounted': this_fs.is_mounted,
+            'dev_active': this_fs.dev_active,
+            'dev_mounted': this_fs.dev_mounted,
+            'mount_point': this_fs.mount_point,
+            'mount_options': mount_options,
+            'fs_type': this_fs.fs_type,
+            'dev_fstab': this_fs.dev_fstab,
+            'fstab_options': fstab_options,
+            'fs_dump': this_fs.fs_dump,
+            'fs_check': this_fs.fs_check,
+            'space_size': space[0],
+            'space_used': space[1],
+            'space_avail': space[2],
+            'space_percent_used': space[3]
+        })
 
     return fs_list
 
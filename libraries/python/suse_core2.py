@@ -21,7 +21,7 @@ Core library of functions for creating and processing python patterns
 #
 ##############################################################################
 __author__        = 'Jason Record <jason.record@suse.com>'
-__date_modified__ = '2025 May 07'
+__date_modified__ = '2026 Oct 19'
 __version__       = '2.0.1'
 
 import sys
@@ -155,6 +155,84 @@ def get_file_section(_file, _section, include_commented_lines=False):
     del entire_file
     return section_content
 
+def iter_file_sections(_file, include_commented_lines=False):
+    '''
+    Walks a supportconfig file once and yields every section in file order as a (section_name, section_content)
+    tuple, using the same line rules as get_file_section.
+    '''
+    section_name = ''
+    section_content = []
+    commented_line = re.compile(r"^#|^\s+#")
+    try:
+        f = open(_file, "rt", errors='ignore')
+    except Exception as error:
+        print("Error: Cannot open file - {}: {}".format(_file, str(error)))
+        sys.exit(3)
+
+    with f:
+        for line in f:
+            line = line.strip("\n")
+            if line.startswith('#==['):
+                if section_name:
+                    yield (section_name, section_content)
+                section_name = ''
+                section_content = []
+            elif ( section_name == '' ):
+                section_name = re.sub('^#', '', line).strip()
+            elif( len(line) > 0 ):
+                if include_commented_lines or not commented_line.search(line):
+                    section_content.append(line)
+        if section_name:
+            yield (section_name, section_content)
+
+def get_file_sections(_file, _sections, include_commented_lines=False):
+    '''
+    Extracts the first section of a supportconfig file matching each regex in _sections with a single pass
+    over the file. Returns a dictionary of _section to its section content list. Sections not found are
+    not included.
+    '''
+    sections_found = {}
+    section_tags = {}
+    for _section in _sections:
+        section_tags[_section] = re.compile(_section)
+
+    for section_name, section_content in iter_file_sections(_file, include_commented_lines):
+        if len(section_content) > 0:
+            for _section in list(section_tags.keys()):
+                if section_tags[_section].search(section_name):
+                    sections_found[_section] = section_content
+                    del section_tags[_section]
+            if len(section_tags) == 0:
+                break
+
+    return sections_found
+
+archive_cache = {}
+
+def get_archive_cache(archive_path, key, loader):
+    '''
+    Returns the object cached under key for the supportconfig archive at archive_path. The loader function
+    is called without arguments to build the object the first time key is requested for the archive.
+
+    Args:        archive_path (String) - The supportconfig archive path, usually _pat.meta['scpath']
+                key (String) - A unique name for the cached object
+                loader (Function) - Builds the object when it is not cached yet
+    Returns:    The cached object
+    '''
+    cache = archive_cache.setdefault(archive_path, {})
+    if key not in cache:
+        cache[key] = loader()
+    return cache[key]
+
+def clear_archive_cache(archive_path=None):
+    '''
+    Discards the objects cached for archive_path, or for all archives if archive_path is None.
+    '''
+    if archive_path is None:
+        archive_cache.clear()
+    else:
+        archive_cache.pop(archive_path, None)
+
 def normalize_version_string(version_to_normalize):
     '''
     Converts a version string to a list of version elements
@@ -0,0 +1,158 @@
+'''
+Tests of the Core library
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'libraries', 'python'))
+
+import Core
+
+class LegacyGlobalsTest(unittest.TestCase):
+    def test_star_import(self):
+        names = {}
+        exec('from Core import *', names)
+        for legacy_name in Core.LEGACY_GLOBALS:
+            self.assertIn(legacy_name, names)
+        self.assertEqual(names['OVERALL'], Core.STATUS_TEMPORARY)
+        self.assertEqual(names['OVERALL_INFO'], '')
+        self.assertIn('updateStatus', names)
+        self.assertIn('re', names)
+
+    def test_overall_reads_and_writes_the_context(self):
+        with Core.analysisContext('/tmp/archive') as context:
+            self.assertEqual(Core.path, '/tmp/archive')
+            Core.OVERALL = Core.WARN
+            Core.OVERALL_INFO = 'warning'
+            self.assertEqual((context.overall, context.overallInfo), (Core.WARN, 'warning'))
+            context.overall = Core.REC
+            self.assertEqual(Core.OVERALL, Core.REC)
+            Core.updateStatus(Core.CRIT, 'critical')
+            self.assertEqual((Core.OVERALL, Core.OVERALL_INFO), (Core.CRIT, 'critical'))
+        self.assertEqual(Core.OVERALL, Core.getContext().overall)
+        self.assertNotEqual(Core.path, '/tmp/archive')
+
+    def test_contexts_are_private(self):
+        with Core.analysisContext('/tmp/first'):
+            Core.OVERALL = Core.WARN
+            with Core.analysisContext('/tmp/second'):
+                self.assertEqual(Core.OVERALL, Core.STATUS_TEMPORARY)
+                Core.OVERALL = Core.CRIT
+            self.assertEqual((Core.path, Core.OVERALL), ('/tmp/first', Core.WARN))
+
+MESSAGES = '''#==[ Log File ]====================================#
+# /var/log/messages
+Dec  1 00:00:01 node1 kernel: sd 2:0:0:1: error 0xdeadbeef at 0x1f
+Dec  1 00:00:02 node1 kernel: sd 2:0:0:2: error 0xdeadbeef at 0x2f
+Dec  1 00:00:03 node1 kernel: sd 2:0:0:3: error 0xcafe at 0x3f
+Dec  1 00:00:04 node1 multipathd[100]: mpath1: remaining active paths: 4
+Dec  1 00:00:05 node1 multipathd[100]: mpath1: remaining active paths: 3
+Dec  1 00:00:06 node1 multipathd[100]: mpath1: remaining active paths: 4
+2024-12-01T00:00:07.000000Z node1 sshd[200]: Accepted publickey for root
+2024-12-01T00:00:08.000000Z node1 sshd[201]: Accepted publickey for root
+Dec  1 00:00:09 node1 kernel: Out of memory: Killed process 300 (java)
+'''
+
+SIGNATURES = {
+    'hex': ('deadbeef', False, False),
+    'hex_tail': ('beef', False, False),
+    'hex_case': ('DEADBEEF', False, True),
+    'hex_start': ('xdead', False, False),
+    'month': ('Dec', False, False),
+    'colon': (':', False, False),
+    'zulu': ('Z node1', False, False),
+    'space': (' node1 sshd', False, False),
+    'number': ('paths: 4', False, False),
+    'regex': (r'process \d+', True, False),
+    'literal': ('remaining active paths', False, False),
+    'literal_case': ('OUT OF MEMORY', False, True),
+}
+
+class LogSignatureTest(unittest.TestCase):
+    def setUp(self):
+        self.archive = tempfile.mkdtemp()
+        with open(os.path.join(self.archive, 'messages.txt'), 'w') as messages:
+            messages.write(MESSAGES)
+
+    def tearDown(self):
+        Core.clearArchiveCache(self.archive)
+        shutil.rmtree(self.archive)
+
+    def test_compact_scan_agrees_with_full_scan(self):
+        with Core.analysisContext(self.archive):
+            for name in SIGNATURES:
+                pattern, regex, ignorecase = SIGNATURES[name]
+                Core.addLogSignature(name, pattern, REGEX=regex, IGNORECASE=ignorecase)
+            full = Core.scanLogSignatures()
+            compact = Core.scanCompactLogSignatures()
+            runs = Core.getLogCompaction('messages.txt', '/var/log/messages').runs
+        self.assertLess(len(runs), 9)
+        for name in SIGNATURES:
+            lines = [match.lineNumber for match in full[name]]
+            expected = [run for run in runs if any(run.firstLine <= line <= run.lastLine for line in lines)]
+            self.assertTrue(lines, name)
+            self.assertEqual([run.firstLine for run in compact[name]], [run.firstLine for run in expected], name)
+
+    def test_template_signatures(self):
+        self.assertTrue(Core.isTemplateSignature('remaining active paths', False))
+        for pattern in ('deadbeef', 'xdead', 'Dec', ':', 'Z node1', ' node1', 'paths: 4', 'a#b'):
+            self.assertFalse(Core.isTemplateSignature(pattern, False), pattern)
+        self.assertFalse(Core.isTemplateSignature('remaining', True))
+        self.assertFalse(Core.isTemplateSignature('dec', False, True))
+
+class SlowCallLogTest(unittest.TestCase):
+    def setUp(self):
+        self.archive = tempfile.mkdtemp()
+        # a host file named like a section selector must not be sized
+        self.host_file = os.path.join(self.archive, 'host-file')
+        with open(self.host_file, 'w') as host_file:
+            host_file.write('host file')
+        self.archive_path = os.path.join(self.archive, 'scc_node1')
+        os.mkdir(self.archive_path)
+        with open(os.path.join(self.archive_path, 'messages.txt'), 'w') as messages:
+            messages.write('#==[ Log File ]====================================#\n# ' + self.host_file + '\nline\n')
+        self.saved_log = Core.SLOW_CALLS
+        self.log_file = os.path.join(self.archive, 'slow.log')
+        Core.setSlowCallLog(self.log_file, THRESHOLD=0, PATTERN_THRESHOLD=0)
+
+    def tearDown(self):
+        Core.SLOW_CALLS.close()
+        Core.SLOW_CALLS = self.saved_log
+        Core.clearArchiveCache(self.archive_path)
+        shutil.rmtree(self.archive)
+
+    def test_only_archive_files_are_sized(self):
+        with Core.analysisContext(self.archive_path):
+            content = {}
+            self.assertTrue(Core.getSection('messages.txt', self.host_file, content))
+            Core.logSlowCall('helper', 'Test.helper', 1.0, (self.host_file, '../host-file'), None, [self.host_file, '../host-file'])
+        Core.SLOW_CALLS.close()
+        with open(self.log_file) as log_file:
+            entries = dict((entry['call'], entry) for entry in map(json.loads, log_file))
+        self.assertEqual(entries['Core.getSection']['files'], {'messages.txt': os.path.getsize(os.path.join(self.archive_path, 'messages.txt'))})
+        self.assertEqual(entries['Test.helper']['files'], {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+'''
+Tests of the suse_base2 library
+'''
+##############################################################################
+#  Copyright (C) 2025 SUSE LLC
+##############################################################################
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'libraries', 'python'))
+
+import suse_base2
+
+class PatternResultTest(unittest.TestCase):
+    def test_meta_is_a_json_dictionary(self):
+        pat = suse_base2.SCAPatternGen2('Class', 'Category', 'Component')
+        pat.set_id('pattern.py')
+        pat.add_solution_link('TID', pat.TID_BASE + '000019999', set_primary=True)
+        self.assertIsInstance(pat.meta, dict)
+        meta = json.loads(json.dumps(pat.meta))
+        self.assertEqual(list(meta), ['generation', 'id', 'primary_solution', 'severity', 'description', 'solution_links', 'scpath', 'scname', 'class', 'category', 'component'])
+        self.assertEqual((meta['class'], meta['id'], meta['primary_solution']), ('Class', 'pattern.py', 'TID'))
+
+    def test_instances_own_their_state(self):
+        first = suse_base2.SCAPatternGen2('A', 'B', 'C')
+        second = suse_base2.SCAPatternGen2('X', 'Y', 'Z')
+        first.add_solution_link('BUG', first.BUG_BASE + '1')
+        first.checked_packages = ['kernel-default']
+        self.assertEqual(second.meta['solution_links'], {})
+        self.assertEqual(second.meta['class'], 'X')
+        self.assertEqual(first.checked_packages, ['kernel-default'])
+
+if __name__ == '__main__':
+    unittest.main()